@@ -1,3 +1,5 @@
 # coding=utf-8
 
 DEFAULT_PORT = 7474
+
+default_app_config = u'django_neo4j.apps.Neo4jConfig'
@@ -1 +1,124 @@
 # coding=utf-8
+import six
+
+from django_neo4j.exception import QueryError
+from django_neo4j.expression import Alias, Expression, as_expression
+from django_neo4j.type import Identifier
+
+
+def _argument(o):
+    return Identifier(o) if isinstance(o, six.string_types) else as_expression(o)
+
+
+class Aggregate(Expression):
+    """
+    http://neo4j.com/docs/stable/query-aggregation.html
+    """
+
+    __slots__ = ('__function', '__arguments', '__distinct')
+
+    def __init__(self, function, arguments, distinct=False):
+        self.__function = function
+        self.__arguments = tuple(arguments)
+        self.__distinct = bool(distinct)
+
+        stack = list(self.__arguments)
+        while stack:
+            node = stack.pop()
+            if isinstance(node, Aggregate):
+                raise QueryError(u'aggregate {} cannot contain aggregate {}'.format(function, node.function))
+            stack.extend(node.children)
+
+    @property
+    def function(self):
+        return self.__function
+
+    @property
+    def arguments(self):
+        return self.__arguments
+
+    @property
+    def distinct(self):
+        return self.__distinct
+
+    @property
+    def children(self):
+        return self.__arguments
+
+    def _tokens(self, parameters):
+        tokens = [self.__function, u'(DISTINCT ' if self.__distinct else u'(']
+        if not self.__arguments:
+            tokens.append(u'*')
+        for index, argument in enumerate(self.__arguments):
+            if index:
+                tokens.append(u', ')
+            tokens.append(argument)
+        tokens.append(u')')
+        return tokens
+
+    def _key(self):
+        return self.__function, self.__arguments, self.__distinct
+
+    def _shape(self):
+        return u'Aggregate', self.__function, self.__distinct, len(self.__arguments)
+
+
+class Aggregation(object):
+    def count(self, expression=None, distinct=False):
+        if expression is None:
+            if distinct:
+                raise QueryError(u'count(*) cannot be DISTINCT')
+            return Aggregate(u'count', ())
+
+        return Aggregate(u'count', (_argument(expression),), distinct)
+
+    def sum(self, expression, distinct=False):
+        return Aggregate(u'sum', (_argument(expression),), distinct)
+
+    def avg(self, expression, distinct=False):
+        return Aggregate(u'avg', (_argument(expression),), distinct)
+
+    def min(self, expression, distinct=False):
+        return Aggregate(u'min', (_argument(expression),), distinct)
+
+    def max(self, expression, distinct=False):
+        return Aggregate(u'max', (_argument(expression),), distinct)
+
+    def collect(self, expression, distinct=False):
+        return Aggregate(u'collect', (_argument(expression),), distinct)
+
+    def stdev(self, expression, distinct=False):
+        return Aggregate(u'stDev', (_argument(expression),), distinct)
+
+    def __percentile(self, function, expression, percentile, distinct):
+        if not isinstance(percentile, Expression) and not 0 <= percentile <= 1:
+            raise QueryError(u'{} percentile must be between 0.0 and 1.0, got {}'.format(function, percentile))
+
+        return Aggregate(function, (_argument(expression), as_expression(percentile)), distinct)
+
+    def percentile_disc(self, expression, percentile, distinct=False):
+        return self.__percentile(u'percentileDisc', expression, percentile, distinct)
+
+    def percentile_cont(self, expression, percentile, distinct=False):
+        return self.__percentile(u'percentileCont', expression, percentile, distinct)
+
+
+def grouped(keys, aggregates):
+    """
+    RETURN/WITH items grouping ``aggregates`` by ``keys``; both are expressions, identifier strings, aliases or
+    ``(expression, alias)`` pairs, and every aggregate must be aliased.
+    """
+    items = []
+    for key in keys:
+        if isinstance(key, tuple):
+            key = Alias(_argument(key[0]), key[1])
+        items.append(_argument(key))
+
+    for aggregate in aggregates:
+        if isinstance(aggregate, tuple):
+            aggregate = Alias(aggregate[0], aggregate[1])
+        if not isinstance(aggregate, Alias):
+            raise QueryError(u'aggregates must be aliased')
+        items.append(aggregate)
+
+    return items
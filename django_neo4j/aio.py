@@ -0,0 +1,381 @@
+# coding=utf-8
+"""
+asyncio client for the transactional Cypher endpoint; requires Python 3.5+.
+"""
+import asyncio
+import base64
+import json
+import time
+from urllib.parse import urlparse
+
+from django_neo4j import DEFAULT_PORT
+from django_neo4j.connection import TRANSACTION_PATH, encode_statement, encode_statements
+from django_neo4j.exception import CypherError, PoolTimeoutError, TransportError
+from django_neo4j.result import END, NEED_DATA, ResultDecoder
+
+_CHUNK_SIZE = 8192
+_IDEMPOTENT = (u'GET', u'HEAD', u'DELETE')
+
+
+class _Response(object):
+    def __init__(self, status, reason, headers, reader):
+        self.status = status
+        self.reason = reason
+        self.headers = headers
+        self.will_close = headers.get(u'connection', u'').lower() == u'close'
+        self.__reader = reader
+        self.__chunked = headers.get(u'transfer-encoding', u'').lower() == u'chunked'
+        self.__remaining = int(headers[u'content-length']) if u'content-length' in headers else None
+        if not self.__chunked and self.__remaining is None:
+            self.will_close = True
+        self.complete = self.__remaining == 0
+
+    async def __read_chunked(self):
+        if self.__remaining:
+            data = await self.__reader.read(min(self.__remaining, _CHUNK_SIZE))
+            if not data:
+                raise TransportError(u'connection closed mid chunk')
+            self.__remaining -= len(data)
+            if not self.__remaining:
+                await self.__reader.readexactly(2)
+            return data
+
+        size = int((await self.__reader.readline()).split(b';')[0].strip() or b'0', 16)
+        if size:
+            self.__remaining = size
+            return await self.__read_chunked()
+
+        while (await self.__reader.readline()) not in (b'\r\n', b'\n', b''):
+            pass
+        self.complete = True
+        return b''
+
+    async def read_chunk(self):
+        if self.complete:
+            return b''
+
+        if self.__chunked:
+            return await self.__read_chunked()
+
+        if self.__remaining is None:
+            data = await self.__reader.read(_CHUNK_SIZE)
+            self.complete = not data
+            return data
+
+        data = await self.__reader.read(min(self.__remaining, _CHUNK_SIZE))
+        if not data:
+            raise TransportError(u'connection closed before end of response')
+        self.__remaining -= len(data)
+        self.complete = not self.__remaining
+        return data
+
+    async def read(self):
+        chunks = []
+        while True:
+            chunk = await self.read_chunk()
+            if not chunk:
+                return b''.join(chunks)
+            chunks.append(chunk)
+
+
+class AsyncConnectionPool(object):
+    """
+    Pool of keep-alive HTTP connections; ``max_size`` also bounds the number of requests in flight.
+    """
+
+    def __init__(self, host=u'localhost', port=DEFAULT_PORT, max_size=10, idle_timeout=60, block_timeout=None):
+        super(AsyncConnectionPool, self).__init__()
+        self.__host = host
+        self.__port = port
+        self.__max_size = max_size
+        self.__idle_timeout = idle_timeout
+        self.__block_timeout = block_timeout
+        self.__semaphore = None
+        self.__idle = []
+        self.__in_use = 0
+        self.__created = 0
+        self.__reused = 0
+
+    @property
+    def host(self):
+        return self.__host
+
+    @property
+    def port(self):
+        return self.__port
+
+    @property
+    def stats(self):
+        return {
+            u'idle': len(self.__idle),
+            u'in_use': self.__in_use,
+            u'created': self.__created,
+            u'reused': self.__reused,
+        }
+
+    async def acquire(self):
+        if self.__semaphore is None:
+            self.__semaphore = asyncio.Semaphore(self.__max_size)
+
+        try:
+            await asyncio.wait_for(self.__semaphore.acquire(), self.__block_timeout)
+        except asyncio.TimeoutError:
+            raise PoolTimeoutError(u'no connection available within {}s'.format(self.__block_timeout))
+
+        self.__in_use += 1
+        while self.__idle:
+            reader, writer, returned_at = self.__idle.pop()
+            expired = self.__idle_timeout is not None and time.monotonic() - returned_at > self.__idle_timeout
+            if expired or reader.at_eof() or writer.transport.is_closing():
+                writer.close()
+                continue
+            self.__reused += 1
+            return reader, writer, True
+
+        try:
+            reader, writer = await asyncio.open_connection(self.__host, self.__port)
+        except OSError as e:
+            self.__in_use -= 1
+            self.__semaphore.release()
+            raise TransportError(u'connection to {}:{} failed: {}'.format(self.__host, self.__port, e))
+
+        self.__created += 1
+        return reader, writer, False
+
+    def release(self, reader, writer, reusable=True):
+        self.__in_use -= 1
+        if reusable and len(self.__idle) < self.__max_size:
+            self.__idle.append((reader, writer, time.monotonic()))
+        else:
+            writer.close()
+        self.__semaphore.release()
+
+    def close(self):
+        while self.__idle:
+            self.__idle.pop()[1].close()
+
+
+class AsyncConnection(object):
+    def __init__(self, pool, user=None, password=None, path=TRANSACTION_PATH):
+        super(AsyncConnection, self).__init__()
+        self.__pool = pool
+        self.__path = path
+        self.__headers = [
+            (u'Host', u'{}:{}'.format(pool.host, pool.port)),
+            (u'Content-Type', u'application/json'),
+            (u'Accept', u'application/json; charset=UTF-8'),
+            (u'X-Stream', u'true'),
+        ]
+        if user is not None:
+            credentials = u'{}:{}'.format(user, password or u'').encode(u'utf-8')
+            self.__headers.append((u'Authorization', u'Basic {}'.format(base64.b64encode(credentials).decode())))
+
+    @property
+    def pool(self):
+        return self.__pool
+
+    @property
+    def path(self):
+        return self.__path
+
+    async def _open(self, method, path, body=b''):
+        """
+        Sends a request and returns ``(reader, writer, response)``; the caller must ``_close`` it.
+        """
+        head = [u'{} {} HTTP/1.1'.format(method, path)]
+        head.extend(u'{}: {}'.format(name, value) for name, value in self.__headers)
+        head.append(u'Content-Length: {}'.format(len(body)))
+        request = (u'\r\n'.join(head) + u'\r\n\r\n').encode(u'latin-1') + body
+
+        while True:
+            reader, writer, reused = await self.__pool.acquire()
+            try:
+                writer.write(request)
+                await writer.drain()
+                status_line = await reader.readline()
+                if not status_line:
+                    raise ConnectionError(u'connection closed')
+                _, status, reason = status_line.decode(u'latin-1').rstrip(u'\r\n').split(u' ', 2)
+                headers = {}
+                while True:
+                    line = (await reader.readline()).decode(u'latin-1').rstrip(u'\r\n')
+                    if not line:
+                        break
+                    name, _, value = line.partition(u':')
+                    headers[name.strip().lower()] = value.strip()
+            except (OSError, ValueError, asyncio.IncompleteReadError) as e:
+                self.__pool.release(reader, writer, reusable=False)
+                if reused and method in _IDEMPOTENT:
+                    # a POST may already have run on the server, so only safe requests are sent again
+                    continue
+                raise TransportError(u'request to {}:{} failed: {}'.format(self.__pool.host, self.__pool.port, e))
+
+            response = _Response(int(status), reason, headers, reader)
+            if response.status >= 400:
+                await self._close(reader, writer, response, drain=True)
+                raise TransportError(u'HTTP {} {}'.format(response.status, response.reason))
+
+            return reader, writer, response
+
+    async def _close(self, reader, writer, response, drain=False):
+        try:
+            if drain:
+                await response.read()
+        except (OSError, TransportError, asyncio.IncompleteReadError):
+            pass
+        self.__pool.release(reader, writer, reusable=response.complete and not response.will_close)
+
+    async def _request(self, method, path, body=b''):
+        reader, writer, response = await self._open(method, path, body)
+        try:
+            content = await response.read()
+        finally:
+            await self._close(reader, writer, response)
+
+        decoded = json.loads(content.decode(u'utf-8')) if content else {}
+        for error in decoded.get(u'errors') or ():
+            raise CypherError(error.get(u'code'), error.get(u'message'))
+
+        return decoded
+
+    async def post(self, statements):
+        body = encode_statements([encode_statement(*statement) for statement in statements])
+        return (await self._request(u'POST', self.__path, body)).get(u'results') or []
+
+    async def execute(self, statement, parameters=None):
+        return (await self.post([(statement, parameters)]))[0]
+
+    def stream(self, statement, parameters=None, typed=False, converters=None):
+        return AsyncRows(self, statement, parameters, typed=typed, converters=converters)
+
+    def transaction(self):
+        return AsyncTransaction(self)
+
+    def close(self):
+        self.__pool.close()
+
+
+class AsyncRows(object):
+    """
+    Async iterator over result rows, decoded while the response is received.
+
+    Use it with ``async with`` or call ``aclose()`` when stopping early; a stream abandoned without either gives its
+    connection back only when it is garbage collected.
+    """
+
+    def __init__(self, connection, statement, parameters=None, typed=False, converters=None):
+        super(AsyncRows, self).__init__()
+        self.__connection = connection
+        self.__body = encode_statements([encode_statement(statement, parameters)])
+        self.__decoder = ResultDecoder(typed=typed, converters=converters)
+        self.__open = None
+        self.__done = False
+
+    @property
+    def columns(self):
+        return self.__decoder.columns
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self.__done:
+            raise StopAsyncIteration
+
+        if self.__open is None:
+            self.__open = await self.__connection._open(u'POST', self.__connection.path, self.__body)
+
+        reader, writer, response = self.__open
+        decoder = self.__decoder
+        try:
+            while True:
+                item = decoder.read()
+                if item is END:
+                    break
+                if item is NEED_DATA:
+                    chunk = await response.read_chunk()
+                    if chunk:
+                        decoder.feed(chunk)
+                    else:
+                        decoder.close()
+                    continue
+                return item
+        except BaseException:
+            await self.aclose()
+            raise
+
+        self.__done = True
+        await self.__connection._close(reader, writer, response, drain=True)
+        decoder.raise_errors()
+        raise StopAsyncIteration
+
+    def __release(self):
+        if self.__open is not None and not self.__done:
+            self.__done = True
+            reader, writer, _ = self.__open
+            self.__connection.pool.release(reader, writer, reusable=False)
+
+    async def aclose(self):
+        self.__release()
+
+    def __del__(self):
+        self.__release()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.aclose()
+
+
+class AsyncTransaction(object):
+    """
+    Explicit transaction: statements run in an open server-side transaction that is committed when the ``async with``
+    block exits cleanly and rolled back otherwise.
+    """
+
+    def __init__(self, connection):
+        super(AsyncTransaction, self).__init__()
+        self.__connection = connection
+        self.__base = connection.path.rsplit(u'/commit', 1)[0]
+        self.__location = None
+        self.__commit = None
+
+    @property
+    def location(self):
+        return self.__location
+
+    async def post(self, statements):
+        body = encode_statements([encode_statement(*statement) for statement in statements])
+        try:
+            response = await self.__connection._request(u'POST', self.__location or self.__base, body)
+        except CypherError:
+            # the server rolls the transaction back itself when a statement fails
+            self.__location = self.__commit = None
+            raise
+        if self.__location is None:
+            self.__commit = urlparse(response[u'commit']).path
+            self.__location = self.__commit.rsplit(u'/commit', 1)[0]
+        return response.get(u'results') or []
+
+    async def execute(self, statement, parameters=None):
+        return (await self.post([(statement, parameters)]))[0]
+
+    async def commit(self):
+        if self.__commit is not None:
+            await self.__connection._request(u'POST', self.__commit, encode_statements([]))
+        self.__location = self.__commit = None
+
+    async def rollback(self):
+        if self.__location is not None:
+            await self.__connection._request(u'DELETE', self.__location)
+        self.__location = self.__commit = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            await self.commit()
+        else:
+            await self.rollback()
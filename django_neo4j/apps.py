@@ -0,0 +1,18 @@
+# coding=utf-8
+from django.apps import AppConfig
+
+
+class Neo4jConfig(AppConfig):
+    name = u'django_neo4j'
+    verbose_name = u'Neo4j'
+
+    def ready(self):
+        from django.conf import settings
+
+        options = getattr(settings, u'NEO4J_RESULT_CACHE', None)
+        if options is not None:
+            from django_neo4j import cache
+            from django_neo4j.instrumentation import instrumentation
+
+            cache.results = cache.ResultCache.from_settings(options)
+            instrumentation.subscribe(cache.results.observe)
@@ -0,0 +1,171 @@
+# coding=utf-8
+import threading
+
+from django_neo4j.connection import DEFAULT_ALIAS, connections, encode_statement, encode_statements
+from django_neo4j.exception import DjangoNeo4jError
+
+
+class Pending(object):
+    def __init__(self, statement, parameters):
+        super(Pending, self).__init__()
+        self.__statement = statement
+        self.__parameters = parameters
+        self.__done = False
+        self.__result = None
+        self.__error = None
+
+    @property
+    def statement(self):
+        return self.__statement
+
+    @property
+    def parameters(self):
+        return self.__parameters
+
+    @property
+    def done(self):
+        return self.__done
+
+    @property
+    def result(self):
+        if not self.__done:
+            raise DjangoNeo4jError(u'statement has not been flushed')
+        if self.__error is not None:
+            raise self.__error
+
+        return self.__result
+
+    def _resolve(self, result=None, error=None):
+        self.__done = True
+        self.__result = result
+        self.__error = error
+
+
+class Batch(object):
+    """
+    Collects statements and sends them to the transactional endpoint in as few requests as possible.
+
+    Statements are flushed as one POST when the batch exits, or earlier once ``max_statements`` or ``max_bytes`` is
+    reached. A batch that exits with an exception discards its unsent statements.
+    """
+
+    __local = threading.local()
+
+    def __init__(self, connection=None, max_statements=100, max_bytes=1 << 20):
+        super(Batch, self).__init__()
+        self.__connection = connection
+        self.__max_statements = max_statements
+        self.__max_bytes = max_bytes
+        self.__encoded = []
+        self.__pending = []
+        self.__bytes = 0
+        self.__requests = 0
+        self.__previous = None
+
+    @classmethod
+    def current(cls):
+        return getattr(cls.__local, u'current', None)
+
+    @property
+    def connection(self):
+        if self.__connection is None:
+            self.__connection = connections[DEFAULT_ALIAS]
+
+        return self.__connection
+
+    @property
+    def requests(self):
+        return self.__requests
+
+    @property
+    def size(self):
+        return len(self.__pending)
+
+    @property
+    def bytes(self):
+        return self.__bytes
+
+    def add(self, statement, parameters=None):
+        if hasattr(statement, u'build'):
+            statement, parameters = statement.build()
+
+        encoded = encode_statement(statement, parameters)
+        pending = Pending(statement, parameters)
+        self.__encoded.append(encoded)
+        self.__pending.append(pending)
+        self.__bytes += len(encoded) + 1
+        if len(self.__pending) >= self.__max_statements or self.__bytes >= self.__max_bytes:
+            self.flush()
+
+        return pending
+
+    def flush(self):
+        if not self.__pending:
+            return []
+
+        encoded, pending = self.__encoded, self.__pending
+        self.discard()
+        self.__requests += 1
+        try:
+            results = self.connection.send(encode_statements(encoded))
+        except Exception as e:
+            for item in pending:
+                item._resolve(error=e)
+            raise
+
+        for item, result in zip(pending, results):
+            item._resolve(result=result)
+        return results
+
+    def discard(self):
+        self.__encoded = []
+        self.__pending = []
+        self.__bytes = 0
+
+    def __enter__(self):
+        self.__previous = self.current()
+        self.__local.current = self
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.__local.current = self.__previous
+        self.__previous = None
+        if exc_type is None:
+            self.flush()
+        else:
+            self.discard()
+
+
+def execute(statement, parameters=None, using=DEFAULT_ALIAS):
+    """
+    Adds the statement to the active batch, or sends it immediately when there is none.
+    """
+    batch = Batch.current()
+    if batch is not None:
+        return batch.add(statement, parameters)
+
+    with Batch(connections[using]) as batch:
+        return batch.add(statement, parameters)
+
+
+class BatchMiddleware(object):
+    """
+    Runs each request inside a batch flushed before the response is returned.
+    """
+
+    def process_request(self, request):
+        request.neo4j_batch = Batch().__enter__()
+
+    def process_response(self, request, response):
+        batch = getattr(request, u'neo4j_batch', None)
+        if batch is not None:
+            del request.neo4j_batch
+            batch.__exit__(None, None, None)
+
+        return response
+
+    def process_exception(self, request, exception):
+        batch = getattr(request, u'neo4j_batch', None)
+        if batch is not None:
+            del request.neo4j_batch
+            batch.__exit__(type(exception), exception, None)
@@ -0,0 +1,207 @@
+# coding=utf-8
+"""
+Micro-benchmarks for expression rendering and query building. Nothing here touches the network.
+
+Run with ``python runtests.py --benchmark`` (``make benchmark``); ``--save`` stores the results as the new baseline.
+"""
+from __future__ import print_function
+
+import argparse
+import io
+import json
+import os
+import timeit
+
+from django_neo4j.expression import render_many
+from django_neo4j.match import Match
+from django_neo4j.operation import ops
+from django_neo4j.parameter import Parameters
+from django_neo4j.pattern import Node
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), u'benchmark.json')
+THRESHOLD = 0.25
+
+
+class Comparison(object):
+    def __init__(self, name, baseline, current, threshold=THRESHOLD):
+        super(Comparison, self).__init__()
+        self.__name = name
+        self.__baseline = baseline
+        self.__current = current
+        self.__threshold = threshold
+
+    @property
+    def name(self):
+        return self.__name
+
+    @property
+    def baseline(self):
+        return self.__baseline
+
+    @property
+    def current(self):
+        return self.__current
+
+    @property
+    def ratio(self):
+        if not self.__baseline or self.__current is None:
+            return None
+
+        return self.__current / self.__baseline
+
+    @property
+    def regressed(self):
+        ratio = self.ratio
+        return ratio is not None and ratio > 1 + self.__threshold
+
+
+class Suite(object):
+    def __init__(self):
+        super(Suite, self).__init__()
+        self.__benchmarks = []
+
+    @property
+    def names(self):
+        return [name for name, _ in self.__benchmarks]
+
+    def register(self, name):
+        """
+        Registers a zero-argument callable; each call is one iteration.
+        """
+
+        def decorator(function):
+            self.__benchmarks.append((name, function))
+            return function
+
+        return decorator
+
+    def run(self, names=None, repeat=5, min_time=0.05):
+        """
+        Returns the best seconds per iteration for each benchmark.
+        """
+        results = {}
+        for name, function in self.__benchmarks:
+            if names and name not in names:
+                continue
+            results[name] = measure(function, repeat, min_time)
+
+        return results
+
+
+def measure(function, repeat=5, min_time=0.05):
+    timer = timeit.Timer(function)
+    number = 1
+    while timer.timeit(number) < min_time:
+        number *= 2
+
+    return min(timer.repeat(repeat, number)) / number
+
+
+def load(path=BASELINE):
+    if not os.path.exists(path):
+        return {}
+
+    with io.open(path, encoding=u'utf-8') as f:
+        return json.load(f)
+
+
+def save(results, path=BASELINE):
+    with io.open(path, u'w', encoding=u'utf-8') as f:
+        f.write(json.dumps(results, indent=2, sort_keys=True, separators=(u',', u': '), ensure_ascii=False) + u'\n')
+
+
+def compare(results, baseline, threshold=THRESHOLD):
+    return [
+        Comparison(name, baseline.get(name), results.get(name), threshold)
+        for name in sorted(set(results) | set(baseline))
+    ]
+
+
+def report(comparisons):
+    lines = [u'{:<40} {:>12} {:>12} {:>8}'.format(u'benchmark', u'baseline', u'current', u'ratio')]
+    for comparison in comparisons:
+        lines.append(u'{:<40} {:>12} {:>12} {:>8}{}'.format(
+            comparison.name,
+            _microseconds(comparison.baseline),
+            _microseconds(comparison.current),
+            u'-' if comparison.ratio is None else u'{:.2f}x'.format(comparison.ratio),
+            u'  SLOWER' if comparison.regressed else u'',
+        ))
+
+    return u'\n'.join(lines)
+
+
+def _microseconds(seconds):
+    return u'-' if seconds is None else u'{:.2f}us'.format(seconds * 1e6)
+
+
+# BENCHMARKS
+####################
+suite = Suite()
+
+_COLUMN = list(range(1000))
+_n = Node(u'n', u'Person')
+
+
+def _operation(family, name, *args):
+    operation = getattr(family, name)
+    suite.register(u'render.{}'.format(name))(lambda: operation(*args).render(Parameters()))
+
+
+for _name in (u'add', u'subtract', u'multiply', u'divide', u'mod', u'pow'):
+    _operation(ops.mathematical, _name, _n[u'x'], 3)
+
+for _name in (u'eq', u'ne', u'gt', u'gte', u'lt', u'lte'):
+    _operation(ops.comparison, _name, _n[u'age'], 42)
+
+_operation(ops.comparison, u'starts_with', _n[u'name'], u'A')
+_operation(ops.comparison, u'is_null', _n[u'name'])
+
+
+@suite.register(u'tree.deep')
+def _deep_tree():
+    expression = _n[u'x']
+    for value in range(200):
+        expression = ops.mathematical.add(expression, value)
+    expression.render(Parameters())
+
+
+@suite.register(u'tree.render_cached')
+def _render_prebuilt(expression=ops.comparison.gt(ops.mathematical.multiply(_n[u'x'], 2), ops.mathematical.add(1, 2))):
+    expression.render(Parameters())
+
+
+@suite.register(u'batch.many')
+def _many():
+    render_many(ops.comparison.eq.many(_n[u'id'], _COLUMN), Parameters())
+
+
+@suite.register(u'batch.unwind')
+def _unwind():
+    ops.comparison.eq.unwind(_n[u'id'], _COLUMN)[0].render(Parameters())
+
+
+@suite.register(u'query.build')
+def _build():
+    query = Match(_n)
+    for index in range(20):
+        query = query.where(ops.comparison.ne(_n[u'p{}'.format(index)], index))
+    query.return_(u'n').limit(10).build()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=u'django_neo4j benchmarks')
+    parser.add_argument(u'names', nargs=u'*', help=u'benchmarks to run (default: all)')
+    parser.add_argument(u'--baseline', default=BASELINE)
+    parser.add_argument(u'--threshold', type=float, default=THRESHOLD)
+    parser.add_argument(u'--save', action=u'store_true', help=u'store the results as the new baseline')
+    options = parser.parse_args(argv)
+
+    results = suite.run(options.names)
+    comparisons = compare(results, load(options.baseline), options.threshold)
+    print(report(comparisons))
+
+    if options.save:
+        save(results, options.baseline)
+
+    return any(comparison.regressed for comparison in comparisons)
@@ -0,0 +1,244 @@
+# coding=utf-8
+import collections
+import hashlib
+import json
+import re
+import threading
+import time
+
+from django_neo4j.connection import DEFAULT_ALIAS, connections
+from django_neo4j.expression import as_expression, render, walk
+from django_neo4j.instrumentation import REQUEST
+from django_neo4j.parameter import Parameters
+
+_LABEL = re.compile(r'(?<=[\w`(])\s*:\s*(`(?:[^`]|``)+`|[A-Za-z_]\w*)')
+_WRITE = re.compile(r'\b(CREATE|MERGE|SET|DELETE|REMOVE)\b', re.IGNORECASE)
+# version shared by every entry, bumped by writes that name no label and so may touch any node
+_ANY = u'*'
+
+
+def labels(statement):
+    """
+    Node labels a statement mentions; a superset, since map keys such as ``{id: row.id}`` also match.
+    """
+    return frozenset(label.strip(u'`').replace(u'``', u'`') for label in _LABEL.findall(statement))
+
+
+def is_write(statement):
+    return _WRITE.search(statement) is not None
+
+
+class LRUCache(object):
+    def __init__(self, maxsize=1024):
+        super(LRUCache, self).__init__()
+        self.__maxsize = maxsize
+        self.__entries = collections.OrderedDict()
+        self.__lock = threading.Lock()
+        self.__hits = 0
+        self.__misses = 0
+        self.__evictions = 0
+
+    @property
+    def maxsize(self):
+        return self.__maxsize
+
+    @property
+    def hits(self):
+        return self.__hits
+
+    @property
+    def misses(self):
+        return self.__misses
+
+    @property
+    def evictions(self):
+        return self.__evictions
+
+    @property
+    def stats(self):
+        return {
+            u'hits': self.__hits,
+            u'misses': self.__misses,
+            u'evictions': self.__evictions,
+            u'size': len(self),
+            u'maxsize': self.__maxsize,
+        }
+
+    def get(self, key, default=None):
+        with self.__lock:
+            try:
+                value = self.__entries.pop(key)
+            except KeyError:
+                self.__misses += 1
+                return default
+
+            self.__entries[key] = value
+            self.__hits += 1
+            return value
+
+    def set(self, key, value):
+        with self.__lock:
+            self.__entries.pop(key, None)
+            self.__entries[key] = value
+            while len(self.__entries) > self.__maxsize:
+                self.__entries.popitem(last=False)
+                self.__evictions += 1
+
+    def clear(self):
+        with self.__lock:
+            self.__entries.clear()
+            self.__hits = self.__misses = self.__evictions = 0
+
+    def __contains__(self, key):
+        return key in self.__entries
+
+    def __len__(self):
+        return len(self.__entries)
+
+
+class TemplateCache(LRUCache):
+    """
+    Maps expression shapes to rendered parameterized Cypher, so re-rendering a known shape only binds its values.
+    """
+
+    def render(self, expression, parameters=None):
+        if parameters is None:
+            parameters = Parameters.current()
+
+        if parameters is None:
+            return render(expression)
+
+        expression = as_expression(expression)
+        shape, values = walk(expression)
+        key = (shape, parameters.prefix, parameters.style, len(parameters))
+        template = self.get(key)
+        if template is None:
+            template = render(expression, parameters)
+            self.set(key, template)
+        else:
+            for value in values:
+                parameters.bind(value)
+
+        return template
+
+
+templates = TemplateCache()
+results = None
+
+
+class ResultCache(object):
+    """
+    Read-through cache of query results in a Django cache.
+
+    Entries are keyed on the statement, its parameters and the current version of every label it mentions plus a
+    version shared by all entries; a write bumps the versions of its labels, or the shared one when it names no label,
+    orphaning the affected entries. Reads naming no label are not cached by ``execute``, since no labelled write would
+    reach them. On a miss one caller computes the result while others wait up to ``wait`` seconds for it to appear.
+    """
+
+    def __init__(self, alias=u'default', timeout=60, prefix=u'django_neo4j', lock_timeout=10, wait=5.0, poll=0.05):
+        super(ResultCache, self).__init__()
+        self.__alias = alias
+        self.__timeout = timeout
+        self.__prefix = prefix
+        self.__lock_timeout = lock_timeout
+        self.__wait = wait
+        self.__poll = poll
+
+    @classmethod
+    def from_settings(cls, options):
+        return cls(
+            alias=options.get(u'CACHE', u'default'),
+            timeout=options.get(u'TIMEOUT', 60),
+            prefix=options.get(u'KEY_PREFIX', u'django_neo4j'),
+            lock_timeout=options.get(u'LOCK_TIMEOUT', 10),
+            wait=options.get(u'WAIT', 5.0),
+        )
+
+    @property
+    def cache(self):
+        from django.core.cache import caches
+        return caches[self.__alias]
+
+    def __label_key(self, label):
+        return u'{}:label:{}'.format(self.__prefix, hashlib.sha1(label.encode(u'utf-8')).hexdigest())
+
+    def __versions(self, names):
+        keys = dict((self.__label_key(name), name) for name in names)
+        versions = self.cache.get_many(list(keys))
+        for key in set(keys) - set(versions):
+            # a missing version must not restart from a value older entries were stored under
+            self.cache.add(key, int(time.time() * 1000), None)
+            versions[key] = self.cache.get(key)
+
+        return sorted((keys[key], version) for key, version in versions.items())
+
+    def key(self, statement, parameters=None, names=None):
+        names = labels(statement) if names is None else names
+        versions = self.__versions(set(names) | {_ANY})
+        text = json.dumps([statement, parameters or {}, versions], sort_keys=True, default=str)
+        return u'{}:result:{}'.format(self.__prefix, hashlib.sha1(text.encode(u'utf-8')).hexdigest())
+
+    def get_or_compute(self, statement, parameters, compute, timeout=None, names=None):
+        """
+        Returns the cached result for the statement, calling ``compute()`` at most once across workers on a miss.
+        """
+        cache = self.cache
+        key = self.key(statement, parameters, names)
+        entry = cache.get(key)
+        if entry is not None:
+            return entry[0]
+
+        lock = key + u':lock'
+        deadline = time.time() + self.__wait
+        while not cache.add(lock, True, self.__lock_timeout):
+            time.sleep(self.__poll)
+            entry = cache.get(key)
+            if entry is not None:
+                return entry[0]
+            if time.time() >= deadline:
+                # the worker holding the lock is too slow; compute without caching rather than keep waiting
+                return compute()
+
+        try:
+            value = compute()
+            cache.set(key, (value,), self.__timeout if timeout is None else timeout)
+            return value
+        finally:
+            cache.delete(lock)
+
+    def execute(self, statement, parameters=None, using=DEFAULT_ALIAS, timeout=None, names=None):
+        """
+        Runs a read statement (or query) through the cache; writes always go to the server.
+        """
+        if hasattr(statement, u'build'):
+            statement, parameters = statement.build()
+
+        connection = connections[using]
+        names = labels(statement) if names is None else names
+        if is_write(statement) or not names:
+            return connection.execute(statement, parameters)
+
+        return self.get_or_compute(
+            statement,
+            parameters,
+            lambda: connection.execute(statement, parameters),
+            timeout,
+            names,
+        )
+
+    def invalidate(self, *names):
+        cache = self.cache
+        for name in names:
+            key = self.__label_key(name)
+            try:
+                cache.incr(key)
+            except ValueError:
+                cache.set(key, int(time.time() * 1000), None)
+
+    def observe(self, event):
+        """
+        Instrumentation subscriber invalidating the labels of every write sent through django_neo4j.
+        """
+        if event.kind == REQUEST and is_write(event.statement):
+            self.invalidate(*(labels(event.statement) or (_ANY,)))
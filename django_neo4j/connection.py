@@ -0,0 +1,417 @@
+# coding=utf-8
+import base64
+import contextlib
+import decimal
+import json
+import os
+import select
+import socket
+import threading
+import timeit
+
+import six
+from six.moves import http_client
+
+from django_neo4j import DEFAULT_PORT
+from django_neo4j.exception import CypherError, PoolTimeoutError, TransportError
+from django_neo4j.instrumentation import instrumentation, timer
+from django_neo4j.result import ResultReader
+from django_neo4j.row import ColumnSet, RowSet
+
+DEFAULT_ALIAS = u'default'
+TRANSACTION_PATH = u'/db/data/transaction/commit'
+
+
+class _Encoder(json.JSONEncoder):
+    def default(self, o):
+        if isinstance(o, decimal.Decimal):
+            return float(o)
+
+        return super(_Encoder, self).default(o)
+
+
+def encode(body):
+    return json.dumps(body, cls=_Encoder, separators=(u',', u':')).encode(u'utf-8')
+
+
+def encode_statement(statement, parameters=None):
+    return encode({u'statement': statement, u'parameters': parameters or {}, u'resultDataContents': [u'row']})
+
+
+def encode_statements(encoded):
+    return b'{"statements":[' + b','.join(encoded) + b']}'
+
+
+def _statements(body):
+    return [statement.get(u'statement') for statement in json.loads(body.decode(u'utf-8')).get(u'statements') or ()]
+
+
+def _is_stale(connection):
+    sock = connection.sock
+    if sock is None:
+        return False
+
+    try:
+        readable, _, _ = select.select([sock], [], [], 0)
+    except (ValueError, select.error, socket.error):
+        return True
+
+    # an idle keep-alive socket is only readable once the server has closed it
+    return bool(readable)
+
+
+class ConnectionPool(object):
+    """
+    Per-process pool of persistent HTTP connections to one Neo4j server.
+    """
+
+    def __init__(
+        self,
+        host=u'localhost',
+        port=DEFAULT_PORT,
+        scheme=u'http',
+        max_size=10,
+        idle_timeout=60,
+        timeout=30,
+        health_check=True,
+        block_timeout=None,
+    ):
+        super(ConnectionPool, self).__init__()
+        self.__host = host
+        self.__port = port
+        self.__factory = http_client.HTTPSConnection if scheme == u'https' else http_client.HTTPConnection
+        self.__max_size = max_size
+        self.__idle_timeout = idle_timeout
+        self.__timeout = timeout
+        self.__health_check = health_check
+        self.__block_timeout = block_timeout
+        self.__condition = threading.Condition(threading.Lock())
+        self.__reset()
+
+    def __reset(self):
+        self.__pid = os.getpid()
+        self.__idle = []
+        self.__in_use = 0
+        self.__created = 0
+        self.__reused = 0
+        self.__discarded = 0
+
+    @property
+    def host(self):
+        return self.__host
+
+    @property
+    def port(self):
+        return self.__port
+
+    @property
+    def max_size(self):
+        return self.__max_size
+
+    @property
+    def stats(self):
+        return {
+            u'idle': len(self.__idle),
+            u'in_use': self.__in_use,
+            u'created': self.__created,
+            u'reused': self.__reused,
+            u'discarded': self.__discarded,
+        }
+
+    def __expired(self, connection, returned_at):
+        if self.__idle_timeout is not None and timeit.default_timer() - returned_at > self.__idle_timeout:
+            return True
+
+        return self.__health_check and _is_stale(connection)
+
+    def acquire(self):
+        """
+        Returns ``(connection, reused)``; blocks while ``max_size`` connections are checked out.
+        """
+        with self.__condition:
+            if self.__pid != os.getpid():
+                self.__reset()
+
+            deadline = None if self.__block_timeout is None else timeit.default_timer() + self.__block_timeout
+            while self.__in_use >= self.__max_size:
+                remaining = None if deadline is None else deadline - timeit.default_timer()
+                if remaining is not None and remaining <= 0:
+                    raise PoolTimeoutError(u'no connection available within {}s'.format(self.__block_timeout))
+                self.__condition.wait(remaining)
+
+            self.__in_use += 1
+            while self.__idle:
+                connection, returned_at = self.__idle.pop()
+                if self.__expired(connection, returned_at):
+                    connection.close()
+                    self.__discarded += 1
+                    continue
+
+                self.__reused += 1
+                return connection, True
+
+            self.__created += 1
+
+        return self.__factory(self.__host, self.__port, timeout=self.__timeout), False
+
+    def release(self, connection, reusable=True):
+        with self.__condition:
+            if self.__pid != os.getpid():
+                return
+
+            self.__in_use -= 1
+            if reusable and len(self.__idle) < self.__max_size:
+                self.__idle.append((connection, timeit.default_timer()))
+            else:
+                connection.close()
+                self.__discarded += 1
+            self.__condition.notify()
+
+    @contextlib.contextmanager
+    def connection(self):
+        connection, _ = self.acquire()
+        try:
+            yield connection
+        except Exception:
+            self.release(connection, reusable=False)
+            raise
+        self.release(connection)
+
+    def close(self):
+        with self.__condition:
+            while self.__idle:
+                self.__idle.pop()[0].close()
+
+
+class Connection(object):
+    """
+    Client for the transactional Cypher HTTP endpoint.
+    """
+
+    def __init__(self, pool, user=None, password=None, path=TRANSACTION_PATH):
+        super(Connection, self).__init__()
+        self.__pool = pool
+        self.__path = path
+        self.__headers = {
+            u'Content-Type': u'application/json',
+            u'Accept': u'application/json; charset=UTF-8',
+            u'X-Stream': u'true',
+        }
+        if user is not None:
+            credentials = u'{}:{}'.format(user, password or u'').encode(u'utf-8')
+            self.__headers[u'Authorization'] = u'Basic {}'.format(base64.b64encode(credentials).decode(u'ascii'))
+
+    @property
+    def pool(self):
+        return self.__pool
+
+    @property
+    def path(self):
+        return self.__path
+
+    def __open(self, body):
+        # never re-sent: once the headers are out the statements may have run, and stale idle
+        # connections are already discarded by the pool's health check
+        connection, _ = self.__pool.acquire()
+        try:
+            connection.request(u'POST', self.__path, body, self.__headers)
+            response = connection.getresponse()
+        except (http_client.HTTPException, socket.error) as e:
+            self.__pool.release(connection, reusable=False)
+            raise TransportError(u'request to {}:{} failed: {}'.format(self.__pool.host, self.__pool.port, e))
+
+        if response.status >= 400:
+            response.read()
+            self.__pool.release(connection, reusable=not response.will_close)
+            raise TransportError(u'HTTP {} {}'.format(response.status, response.reason))
+
+        return connection, response
+
+    def __request(self, body, probe):
+        connection, response = self.__open(body)
+        probe[u'responded'] = timer()
+        try:
+            content = response.read()
+        except (http_client.HTTPException, socket.error) as e:
+            self.__pool.release(connection, reusable=False)
+            raise TransportError(
+                u'reading response from {}:{} failed: {}'.format(self.__pool.host, self.__pool.port, e),
+            )
+
+        self.__pool.release(connection, reusable=not response.will_close)
+        return content
+
+    def __chunks(self, body, chunk_size, probe):
+        probe[u'started'] = timer()
+        connection, response = self.__open(body)
+        probe[u'responded'] = timer()
+        complete = False
+        try:
+            while True:
+                chunk = response.read(chunk_size)
+                if not chunk:
+                    break
+                probe[u'bytes'] += len(chunk)
+                yield chunk
+            complete = True
+        finally:
+            self.__pool.release(connection, reusable=complete and not response.will_close)
+
+    def send(self, body):
+        probe = {u'started': timer()}
+        try:
+            content = self.__request(body, probe)
+        except TransportError as e:
+            self.__instrument(body, probe, (), 0, e)
+            raise
+
+        probe[u'finished'] = timer()
+        response = json.loads(content.decode(u'utf-8'))
+        results = response.get(u'results') or []
+        errors = [CypherError(error.get(u'code'), error.get(u'message')) for error in response.get(u'errors') or ()]
+        rows = [len(result.get(u'data') or ()) for result in results]
+        self.__instrument(body, probe, rows, len(content), errors[0] if errors else None)
+        if errors:
+            raise errors[0]
+
+        return results
+
+    @staticmethod
+    def __instrument(body, probe, rows, size, error=None):
+        if not instrumentation.enabled:
+            return
+
+        finished = probe.get(u'finished') or timer()
+        instrumentation.requested(
+            _statements(body),
+            network_time=finished - probe[u'started'],
+            server_time=probe.get(u'responded', finished) - probe[u'started'],
+            rows=rows,
+            size=size,
+            error=error,
+        )
+
+    def post(self, statements):
+        """
+        Sends ``(statement, parameters)`` pairs in one request and returns the decoded ``results``.
+        """
+        return self.send(encode_statements([encode_statement(*statement) for statement in statements]))
+
+    def execute(self, statement, parameters=None):
+        return self.post([(statement, parameters)])[0]
+
+    def stream(self, statement, parameters=None, typed=False, converters=None, chunk_size=8192):
+        """
+        Yields result rows while the response is still being received.
+        """
+        return self.__stream(statement, parameters, typed, converters, chunk_size)[1]
+
+    def __stream(self, statement, parameters, typed, converters, chunk_size):
+        body = encode_statements([encode_statement(statement, parameters)])
+        probe = {u'bytes': 0}
+        reader = ResultReader(self.__chunks(body, chunk_size, probe), typed=typed, converters=converters)
+        if not instrumentation.enabled:
+            return reader, iter(reader)
+
+        return reader, self.__instrumented(statement, iter(reader), probe)
+
+    def fetch(self, statement, parameters=None, columnar=False, typed=False, converters=None, chunk_size=8192):
+        """
+        Reads a whole result into a compact ``RowSet``, or a ``ColumnSet`` with ``columnar`` set.
+        """
+        reader, rows = self.__stream(statement, parameters, typed, converters, chunk_size)
+        container = ColumnSet if columnar else RowSet
+        result = None
+        for row in rows:
+            if result is None:
+                result = container(reader.columns)
+            result.append(row)
+
+        return container(reader.columns) if result is None else result
+
+    @staticmethod
+    def __instrumented(statement, rows, probe):
+        count = 0
+        error = None
+        try:
+            for row in rows:
+                count += 1
+                yield row
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            finished = timer()
+            started = probe.get(u'started', finished)
+            instrumentation.requested(
+                [statement],
+                network_time=finished - started,
+                server_time=probe.get(u'responded', finished) - started,
+                rows=[count],
+                size=probe[u'bytes'],
+                error=error,
+            )
+
+    def close(self):
+        self.__pool.close()
+
+
+def configuration(alias=DEFAULT_ALIAS):
+    """
+    Reads ``settings.NEO4J``, a ``DATABASES``-style dict of aliases; Neo4j is not a Django database backend.
+    """
+    from django.conf import settings
+    from django.core.exceptions import ImproperlyConfigured
+
+    databases = getattr(settings, u'NEO4J', None) or {}
+    if alias not in databases:
+        raise ImproperlyConfigured(u'no Neo4j database configured for alias {}'.format(alias))
+
+    return databases[alias]
+
+
+def connect(config):
+    options = config.get(u'OPTIONS') or {}
+    pool = ConnectionPool(
+        host=config.get(u'HOST') or u'localhost',
+        port=int(config.get(u'PORT') or DEFAULT_PORT),
+        scheme=config.get(u'SCHEME') or u'http',
+        max_size=options.get(u'POOL_SIZE', 10),
+        idle_timeout=options.get(u'IDLE_TIMEOUT', 60),
+        timeout=options.get(u'TIMEOUT', 30),
+        health_check=options.get(u'HEALTH_CHECK', True),
+        block_timeout=options.get(u'BLOCK_TIMEOUT'),
+    )
+    return Connection(
+        pool,
+        user=config.get(u'USER') or None,
+        password=config.get(u'PASSWORD'),
+        path=config.get(u'PATH') or TRANSACTION_PATH,
+    )
+
+
+class ConnectionHandler(object):
+    def __init__(self):
+        super(ConnectionHandler, self).__init__()
+        self.__connections = {}
+        self.__lock = threading.Lock()
+
+    def __getitem__(self, alias):
+        try:
+            return self.__connections[alias]
+        except KeyError:
+            pass
+
+        with self.__lock:
+            if alias not in self.__connections:
+                self.__connections[alias] = connect(configuration(alias))
+            return self.__connections[alias]
+
+    def close_all(self):
+        with self.__lock:
+            for connection in six.itervalues(self.__connections):
+                connection.close()
+            self.__connections.clear()
+
+
+connections = ConnectionHandler()
@@ -1 +1,51 @@
 # coding=utf-8
+import six
+
+from django_neo4j.pattern import escape
+
+
+class UniqueConstraint(object):
+    """
+    http://neo4j.com/docs/stable/query-constraints.html
+    """
+
+    def __init__(self, label, property_name):
+        super(UniqueConstraint, self).__init__()
+        self.__label = six.text_type(label)
+        self.__property = six.text_type(property_name)
+
+    @property
+    def label(self):
+        return self.__label
+
+    @property
+    def property_name(self):
+        return self.__property
+
+    @property
+    def key(self):
+        return self.__label, self.__property
+
+    @property
+    def assertion(self):
+        return u'(n:{}) ASSERT n.{} IS UNIQUE'.format(escape(self.__label), escape(self.__property))
+
+    @property
+    def create(self):
+        return u'CREATE CONSTRAINT ON {}'.format(self.assertion)
+
+    @property
+    def drop(self):
+        return u'DROP CONSTRAINT ON {}'.format(self.assertion)
+
+    def __eq__(self, other):
+        return isinstance(other, UniqueConstraint) and other.key == self.key
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash((UniqueConstraint, self.key))
+
+    def __repr__(self):
+        return u'UniqueConstraint({!r}, {!r})'.format(self.__label, self.__property)
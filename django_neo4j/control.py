@@ -1 +1,304 @@
 # coding=utf-8
+"""
+Row-level access control: per-label policies compiled into WHERE predicates for the active principal.
+
+Policies are compiled once per principal, policy version, labels and variable, and ``Query.match`` appends the cached
+predicate for every node it matches (``Query.merge`` filters through ``WITH *``), so restricted rows never leave the
+server.
+"""
+import threading
+
+from django_neo4j.exception import QueryError
+from django_neo4j.operation import ops
+from django_neo4j.pattern import Node, escape
+from django_neo4j.type import Identifier
+
+_DENY = Identifier(u'false')
+
+
+class Principal(object):
+    """
+    Who a query runs for: a user id and the names of their groups. A superuser is never restricted.
+    """
+
+    def __init__(self, id=None, groups=(), superuser=False):
+        super(Principal, self).__init__()
+        self.__id = id
+        self.__groups = frozenset(groups)
+        self.__superuser = superuser
+
+    @classmethod
+    def from_user(cls, user):
+        authenticated = getattr(user, u'is_authenticated', False)
+        if not (authenticated() if callable(authenticated) else authenticated):
+            return cls()
+
+        return cls(user.pk, user.groups.values_list(u'name', flat=True), user.is_superuser)
+
+    @property
+    def id(self):
+        return self.__id
+
+    @property
+    def groups(self):
+        return self.__groups
+
+    @property
+    def superuser(self):
+        return self.__superuser
+
+    @property
+    def key(self):
+        return self.__id, tuple(sorted(self.__groups)), self.__superuser
+
+    def __repr__(self):
+        return u'<Principal {} {}>'.format(self.__id, sorted(self.__groups))
+
+
+class Rule(object):
+    def __init__(self, label, predicate, groups=None):
+        super(Rule, self).__init__()
+        self.__label = label
+        self.__predicate = predicate
+        self.__groups = frozenset(groups) if groups is not None else None
+
+    @property
+    def label(self):
+        return self.__label
+
+    def applies(self, principal):
+        return self.__groups is None or bool(self.__groups & principal.groups)
+
+    def compile(self, node, principal):
+        """
+        Returns the rule's predicate for ``node``, True when it grants everything, or None when it grants nothing.
+        """
+        predicate = self.__predicate
+        if callable(predicate):
+            predicate = predicate(node, principal)
+        return predicate if predicate is not False else None
+
+
+class Policies(object):
+    """
+    Rules per label. A node with a governed label is visible when any applicable rule for each such label holds, and
+    invisible when none applies; labels without rules are unrestricted.
+
+    ``allow(u'Document', lambda node, principal: ops.comparison.eq(node[u'owner'], principal.id))`` limits documents
+    to their owner; ``allow(u'Document', True, groups=[u'staff'])`` opens them to staff. Changing the rules bumps
+    ``version`` and so invalidates every compiled predicate.
+    """
+
+    def __init__(self, cache_size=4096):
+        super(Policies, self).__init__()
+        self.__rules = {}
+        self.__version = 0
+        self.__compiled = {}
+        self.__cache_size = cache_size
+        self.__lock = threading.Lock()
+
+    @property
+    def version(self):
+        return self.__version
+
+    @property
+    def labels(self):
+        return frozenset(self.__rules)
+
+    def __changed(self):
+        with self.__lock:
+            self.__version += 1
+            self.__compiled = {}
+
+    def allow(self, label, predicate, groups=None):
+        """
+        Adds a rule; ``predicate`` is an expression over ``Node(u'n')``-style property identifiers, True, or a
+        callable ``(node, principal)`` returning either.
+        """
+        self.__rules.setdefault(label, []).append(Rule(label, predicate, groups))
+        self.__changed()
+
+    def clear(self, label=None):
+        if label is None:
+            self.__rules = {}
+        else:
+            self.__rules.pop(label, None)
+        self.__changed()
+
+    def __grant(self, label, node, principal):
+        """
+        Returns the predicate granting ``node`` under ``label``: None when everything is granted, ``false`` when
+        nothing is.
+        """
+        rules = [rule for rule in self.__rules.get(label, ()) if rule.applies(principal)]
+        granted = [rule.compile(node, principal) for rule in rules]
+        if True in granted:
+            return None
+
+        granted = [predicate for predicate in granted if predicate is not None]
+        if not granted:
+            return _DENY
+
+        return granted[0] if len(granted) == 1 else ops.boolean.or_(*granted)
+
+    def __compile(self, node, principal):
+        predicates = []
+        if node.labels:
+            for label in node.labels:
+                if label in self.__rules:
+                    predicate = self.__grant(label, node, principal)
+                    if predicate is _DENY:
+                        return _DENY
+                    if predicate is not None:
+                        predicates.append(predicate)
+        else:
+            # An unlabelled node may carry any governed label, so each grant applies only if it does.
+            for label in sorted(self.__rules):
+                labelled = Identifier(u'{}:{}'.format(node.variable, escape(label)))
+                predicate = self.__grant(label, node, principal)
+                if predicate is _DENY:
+                    predicates.append(ops.boolean.not_(labelled))
+                elif predicate is not None:
+                    predicates.append(ops.boolean.or_(ops.boolean.not_(labelled), predicate))
+
+        if not predicates:
+            return None
+
+        return predicates[0] if len(predicates) == 1 else ops.boolean.and_(*predicates)
+
+    def predicate(self, node, principal):
+        """
+        Returns the cached predicate restricting ``node`` for ``principal``, or None when it is unrestricted.
+
+        Unlabelled nodes are checked against every governed label.
+        """
+        if principal.superuser or not self.__rules:
+            return None
+
+        if node.labels and not any(label in self.__rules for label in node.labels):
+            return None
+
+        if not node.variable:
+            raise QueryError(u'restricted node pattern {} needs a variable'.format(
+                u''.join(u':' + label for label in node.labels) or u'()',
+            ))
+
+        key = principal.key, self.__version, node.variable, node.labels
+        try:
+            return self.__compiled[key]
+        except KeyError:
+            pass
+
+        version = self.__version
+        predicate = self.__compile(node, principal)
+        with self.__lock:
+            if version == self.__version:
+                if len(self.__compiled) >= self.__cache_size:
+                    self.__compiled = {}
+                self.__compiled[key] = predicate
+
+        return predicate
+
+    def predicates(self, patterns, principal):
+        """
+        Returns the predicates restricting every node in ``patterns``.
+        """
+        predicates = []
+        stack = list(reversed(patterns))
+        while stack:
+            pattern = stack.pop()
+            if isinstance(pattern, Node):
+                predicate = self.predicate(pattern, principal)
+                if predicate is not None and predicate not in predicates:
+                    predicates.append(predicate)
+            else:
+                stack.extend(reversed(pattern.children))
+
+        return predicates
+
+
+policies = Policies()
+
+
+class Restriction(object):
+    """
+    Runs the queries built inside the block for ``principal`` (a ``Principal`` or a callable returning one, resolved
+    when first needed).
+    """
+
+    __local = threading.local()
+
+    def __init__(self, principal, policies=policies):
+        super(Restriction, self).__init__()
+        self.__principal = principal
+        self.__policies = policies
+        self.__previous = None
+
+    @classmethod
+    def current(cls):
+        return getattr(cls.__local, u'current', None)
+
+    @property
+    def principal(self):
+        if not isinstance(self.__principal, Principal):
+            self.__principal = self.__principal()
+
+        return self.__principal
+
+    def predicates(self, patterns):
+        return self.__policies.predicates(patterns, self.principal)
+
+    def __enter__(self):
+        self.__previous = self.current()
+        self.__local.current = self
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.__local.current = self.__previous
+        self.__previous = None
+
+
+restricted = Restriction
+
+
+def unrestricted():
+    """
+    Lifts any restriction for the block, e.g. for maintenance jobs.
+    """
+    return Restriction(Principal(superuser=True))
+
+
+def predicates(patterns):
+    """
+    Predicates the current restriction adds for ``patterns``; none outside a restriction.
+    """
+    restriction = Restriction.current()
+    if restriction is None:
+        return []
+
+    return restriction.predicates(patterns)
+
+
+class AccessControlMiddleware(object):
+    """
+    Restricts the queries of each request to ``request.user``.
+    """
+
+    def __init__(self, get_response=None):
+        super(AccessControlMiddleware, self).__init__()
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with Restriction(lambda: Principal.from_user(getattr(request, u'user', None))):
+            return self.get_response(request)
+
+    def process_request(self, request):
+        request._neo4j_restriction = Restriction(lambda: Principal.from_user(getattr(request, u'user', None)))
+        request._neo4j_restriction.__enter__()
+
+    def process_response(self, request, response):
+        restriction = getattr(request, u'_neo4j_restriction', None)
+        if restriction is not None:
+            restriction.__exit__(None, None, None)
+            del request._neo4j_restriction
+        return response
@@ -74,3 +74,33 @@ class OperationArityError(OperationError, ValueError, _ErrorMessageMixin):
 
 class OperationZeroDivisionError(OperationError, ZeroDivisionError):
     pass
+
+
+class OperationColumnError(OperationError, ValueError):
+    pass
+
+
+class QueryError(DjangoNeo4jError, ValueError):
+    pass
+
+
+class TransportError(DjangoNeo4jError):
+    pass
+
+
+class PoolTimeoutError(TransportError):
+    pass
+
+
+class CypherError(DjangoNeo4jError):
+    def __init__(self, code, message):
+        super(CypherError, self).__init__(u'{}: {}'.format(code, message))
+        self.__code = code
+
+    @property
+    def code(self):
+        return self.__code
+
+
+class FanOutWarning(UserWarning):
+    pass
@@ -0,0 +1,273 @@
+# coding=utf-8
+import hashlib
+import re
+
+import six
+
+from django_neo4j.parameter import Parameters
+
+
+_NAME = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*$')
+
+
+def _cypher(o):
+    """
+    Cypher literal for ``o``, used when rendering without parameters.
+    """
+    if o is None:
+        return u'null'
+
+    if isinstance(o, bool):
+        return u'true' if o else u'false'
+
+    if isinstance(o, six.string_types):
+        return u'"{}"'.format(o.replace(u'\\', u'\\\\').replace(u'"', u'\\"'))
+
+    if isinstance(o, (list, tuple)):
+        return u'[{}]'.format(u', '.join(_cypher(item) for item in o))
+
+    if isinstance(o, dict):
+        return u'{{{}}}'.format(u', '.join(
+            u'{}: {}'.format(key if _NAME.match(key) else u'`{}`'.format(key.replace(u'`', u'``')), _cypher(value))
+            for key, value in sorted((six.text_type(key), value) for key, value in o.items())
+        ))
+
+    return u'{}'.format(o)
+
+
+def _freeze(o):
+    if isinstance(o, (list, tuple)):
+        return tuple(_freeze(item) for item in o)
+
+    if isinstance(o, dict):
+        return tuple(sorted((key, _freeze(value)) for key, value in o.items()))
+
+    return o
+
+
+def as_expression(o):
+    if isinstance(o, Expression):
+        return o
+
+    try:
+        return _INTERNED[type(o), o]
+    except (KeyError, TypeError):
+        return Literal(o)
+
+
+def write(expression, out, parameters=None):
+    """
+    Appends the tokens of ``expression`` to the ``out`` buffer, depth first and without recursion.
+    """
+    stack = [expression]
+    pop = stack.pop
+    extend = stack.extend
+    append = out.append
+    while stack:
+        token = pop()
+        if isinstance(token, Expression):
+            extend(reversed(token._tokens(parameters)))
+        else:
+            append(token)
+
+    return out
+
+
+def walk(expression):
+    """
+    Returns the structural shape of ``expression`` (pre-order node keys, literal values excluded) and its literal values
+    in render order.
+    """
+    shape = []
+    values = []
+    stack = [expression]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, Literal):
+            values.append(node.value)
+        shape.append(node._shape())
+        stack.extend(reversed(node.children))
+
+    return tuple(shape), values
+
+
+def fingerprint(shape):
+    text = u'\x1f'.join(u'\x1e'.join(six.text_type(part) for part in key) for key in shape)
+    return hashlib.sha1(text.encode(u'utf-8')).hexdigest()
+
+
+def render(expression, parameters=None):
+    if parameters is None:
+        parameters = Parameters.current()
+
+    return u''.join(write(as_expression(expression), [], parameters))
+
+
+def render_many(expressions, parameters=None):
+    if parameters is None:
+        parameters = Parameters.current()
+
+    out = []
+    marks = [0]
+    for expression in expressions:
+        write(as_expression(expression), out, parameters)
+        marks.append(len(out))
+
+    return [u''.join(out[start:end]) for start, end in zip(marks, marks[1:])]
+
+
+@six.python_2_unicode_compatible
+class Expression(object):
+    """
+    Immutable node of a Cypher expression tree, rendered only when converted to text.
+    """
+
+    __slots__ = ()
+
+    def _tokens(self, parameters):
+        raise NotImplementedError
+
+    def _key(self):
+        raise NotImplementedError
+
+    def _shape(self):
+        return (type(self).__name__,) + tuple(self._key())
+
+    @property
+    def children(self):
+        return ()
+
+    @property
+    def shape(self):
+        return walk(self)[0]
+
+    @property
+    def fingerprint(self):
+        return fingerprint(self.shape)
+
+    def render(self, parameters=None):
+        return render(self, parameters)
+
+    def __eq__(self, other):
+        return type(self) is type(other) and self._key() == other._key()
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash((type(self), self._key()))
+
+    def __repr__(self):
+        return u'<{} {}>'.format(type(self).__name__, u''.join(write(self, [])))
+
+    def __str__(self):
+        return self.render()
+
+
+class Literal(Expression):
+    __slots__ = ('__value',)
+
+    def __init__(self, value):
+        self.__value = value
+
+    @property
+    def value(self):
+        return self.__value
+
+    def _tokens(self, parameters):
+        if parameters is not None:
+            return parameters.bind(self.__value),
+
+        return _cypher(self.__value),
+
+    def _key(self):
+        return type(self.__value), _freeze(self.__value)
+
+    def _shape(self):
+        return u'Literal',
+
+
+# shared instances of the most common literal values, keyed by type so that True and 1 stay distinct
+_INTERNED = dict(((type(value), value), Literal(value)) for value in [True, False, u''] + list(range(-5, 257)))
+
+
+class OperationExpression(Expression):
+    __slots__ = ('__operation', '__operands')
+
+    def __init__(self, operation, *operands):
+        self.__operation = operation
+        self.__operands = tuple(as_expression(operand) for operand in operands)
+
+    @property
+    def operation(self):
+        return self.__operation
+
+    @property
+    def operands(self):
+        return self.__operands
+
+    @property
+    def children(self):
+        return self.__operands
+
+    def _tokens(self, parameters):
+        return self.__operation._tokens(self.__operands)
+
+    def _key(self):
+        return self.__operation, self.__operands
+
+    def _shape(self):
+        return self.__operation.type, self.__operation.name, len(self.__operands)
+
+
+class Alias(Expression):
+    __slots__ = ('__expression', '__name')
+
+    def __init__(self, expression, name):
+        self.__expression = as_expression(expression)
+        self.__name = six.text_type(name)
+
+    @property
+    def expression(self):
+        return self.__expression
+
+    @property
+    def name(self):
+        return self.__name
+
+    @property
+    def children(self):
+        return self.__expression,
+
+    def _tokens(self, parameters):
+        return self.__expression, u' AS ', self.__name
+
+    def _key(self):
+        return self.__expression, self.__name
+
+    def _shape(self):
+        return u'Alias', self.__name
+
+
+class Parameter(Expression):
+    """
+    Named parameter placeholder whose value is supplied separately, e.g. ``$rows``.
+    """
+
+    __slots__ = ('__name',)
+
+    def __init__(self, name):
+        self.__name = six.text_type(name)
+
+    @property
+    def name(self):
+        return self.__name
+
+    def _tokens(self, parameters):
+        if parameters is not None:
+            return parameters.placeholder(self.__name),
+
+        return Parameters.DOLLAR.format(self.__name),
+
+    def _key(self):
+        return self.__name,
@@ -1 +1,173 @@
 # coding=utf-8
+import itertools
+import timeit
+
+import six
+
+from django_neo4j.exception import QueryError
+from django_neo4j.expression import Parameter
+from django_neo4j.match import Query
+from django_neo4j.parameter import Parameters
+from django_neo4j.pattern import Node, property_of
+from django_neo4j.util import model_row
+
+
+def chunked(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _rows(source):
+    if hasattr(source, u'iterator'):
+        source = source.iterator()
+
+    for row in source:
+        yield row if isinstance(row, dict) else model_row(row)
+
+
+class BatchStats(object):
+    def __init__(self, index, rows, seconds):
+        super(BatchStats, self).__init__()
+        self.__index = index
+        self.__rows = rows
+        self.__seconds = seconds
+
+    @property
+    def index(self):
+        return self.__index
+
+    @property
+    def rows(self):
+        return self.__rows
+
+    @property
+    def seconds(self):
+        return self.__seconds
+
+    @property
+    def rate(self):
+        return self.__rows / self.__seconds if self.__seconds else float(u'inf')
+
+
+class ImportStats(object):
+    def __init__(self):
+        super(ImportStats, self).__init__()
+        self.__batches = 0
+        self.__rows = 0
+        self.__seconds = 0.0
+        self.__last = None
+
+    @property
+    def batches(self):
+        return self.__batches
+
+    @property
+    def rows(self):
+        return self.__rows
+
+    @property
+    def seconds(self):
+        return self.__seconds
+
+    @property
+    def rate(self):
+        return self.__rows / self.__seconds if self.__seconds else float(u'inf')
+
+    @property
+    def last(self):
+        return self.__last
+
+    def add(self, batch):
+        self.__batches += 1
+        self.__rows += batch.rows
+        self.__seconds += batch.seconds
+        self.__last = batch
+
+
+class Importer(object):
+    """
+    Streams rows into Neo4j as one ``UNWIND $rows AS row CREATE|MERGE ...`` statement per batch.
+
+    Rows are read lazily from any iterable of dicts, or from a queryset through ``.iterator()``, so memory use is
+    bounded by the batch size.
+    """
+
+    CREATE = Query.CREATE
+    MERGE = Query.MERGE
+
+    ROWS = u'rows'
+    ROW = u'row'
+
+    def __init__(self, label, keys=None, mode=None, batch_size=1000, execute=None, style=None):
+        super(Importer, self).__init__()
+        mode = mode or (self.MERGE if keys else self.CREATE)
+        if mode not in (self.CREATE, self.MERGE):
+            raise QueryError(u'import mode must be {} or {}'.format(self.CREATE, self.MERGE))
+        if mode == self.MERGE and not keys:
+            raise QueryError(u'{} import requires key properties'.format(self.MERGE))
+        if batch_size < 1:
+            raise QueryError(u'batch size must be positive')
+
+        keys = [keys] if isinstance(keys, six.string_types) else list(keys or [])
+        query = Query().unwind(Parameter(self.ROWS), self.ROW)
+        if mode == self.MERGE:
+            node = Node(u'n', label, dict((key, property_of(self.ROW, key)) for key in keys))
+            query.merge(node).set(u'n += {}'.format(self.ROW))
+        else:
+            query.create(Node(u'n', label)).set(u'n = {}'.format(self.ROW))
+
+        self.__label = label
+        self.__keys = tuple(keys)
+        self.__mode = mode
+        self.__batch_size = batch_size
+        self.__execute = execute
+        parameters = Parameters(style=style)
+        self.__statement = query.render(parameters)
+        # values bound while rendering, e.g. by access-control predicates, are sent with every batch
+        self.__parameters = dict(parameters.values)
+
+    @property
+    def label(self):
+        return self.__label
+
+    @property
+    def keys(self):
+        return self.__keys
+
+    @property
+    def mode(self):
+        return self.__mode
+
+    @property
+    def batch_size(self):
+        return self.__batch_size
+
+    @property
+    def statement(self):
+        return self.__statement
+
+    def batches(self, source):
+        for chunk in chunked(_rows(source), self.__batch_size):
+            parameters = dict(self.__parameters)
+            parameters[self.ROWS] = chunk
+            yield self.__statement, parameters
+
+    def run(self, source, execute=None, callback=None):
+        execute = execute or self.__execute
+        if execute is None:
+            raise QueryError(u'no execute callable given')
+
+        stats = ImportStats()
+        for index, (statement, parameters) in enumerate(self.batches(source)):
+            start = timeit.default_timer()
+            execute(statement, parameters)
+            batch = BatchStats(index, len(parameters[self.ROWS]), timeit.default_timer() - start)
+            stats.add(batch)
+            if callback is not None:
+                callback(batch)
+
+        return stats
@@ -1 +1,283 @@
 # coding=utf-8
+import collections
+import re
+
+import six
+
+from django_neo4j.constraint import UniqueConstraint
+from django_neo4j.expression import OperationExpression
+from django_neo4j.pattern import Node, escape
+from django_neo4j.type import Identifier
+
+_INDEX_DESCRIPTION = re.compile(r'^INDEX ON :`?(?P<label>[^`(]+)`?\((?P<properties>[^)]*)\)$')
+_CONSTRAINT_DESCRIPTION = re.compile(
+    r'^CONSTRAINT ON \(\s*`?(?P<variable>[^`:]+)`?:`?(?P<label>[^`) ]+)`?\s*\) '
+    r'ASSERT `?(?P=variable)`?\.`?(?P<property>[^` ]+)`? IS UNIQUE$'
+)
+_PROPERTY = re.compile(r'^(?P<variable>[A-Za-z_][A-Za-z0-9_]*)\.`?(?P<property>[^`]+)`?$')
+
+EQUALITY = u'equality'
+RANGE = u'range'
+PREFIX = u'prefix'
+
+_COMPARISONS = {
+    u'equal to': EQUALITY,
+    u'greater than': RANGE,
+    u'greater than or equal to': RANGE,
+    u'less than': RANGE,
+    u'less than or equal to': RANGE,
+    u'starts with': PREFIX,
+}
+
+
+def _strip(name):
+    return name.strip().strip(u'`')
+
+
+class Index(object):
+    """
+    http://neo4j.com/docs/stable/query-schema-index.html
+    """
+
+    def __init__(self, label, *properties):
+        super(Index, self).__init__()
+        self.__label = six.text_type(label)
+        self.__properties = tuple(six.text_type(p) for p in properties)
+
+    @property
+    def label(self):
+        return self.__label
+
+    @property
+    def properties(self):
+        return self.__properties
+
+    @property
+    def key(self):
+        return self.__label, self.__properties
+
+    @property
+    def create(self):
+        return u'CREATE INDEX ON :{}({})'.format(escape(self.__label), u', '.join(escape(p) for p in self.__properties))
+
+    @property
+    def drop(self):
+        return u'DROP INDEX ON :{}({})'.format(escape(self.__label), u', '.join(escape(p) for p in self.__properties))
+
+    def covers(self, label, property_name):
+        return self.__label == label and self.__properties[:1] == (property_name,)
+
+    def __eq__(self, other):
+        return isinstance(other, Index) and other.key == self.key
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash((Index, self.key))
+
+    def __repr__(self):
+        return u'Index({})'.format(u', '.join(repr(part) for part in (self.__label,) + self.__properties))
+
+
+class Schema(object):
+    """
+    Declared indexes and unique constraints.
+
+    Model-like classes are registered from an inner ``Neo4jMeta`` declaring ``label`` (defaults to the class name),
+    ``indexes`` (property names, or tuples for composite indexes) and ``unique`` (property names).
+    """
+
+    def __init__(self):
+        super(Schema, self).__init__()
+        self.__indexes = set()
+        self.__constraints = set()
+
+    @property
+    def indexes(self):
+        return frozenset(self.__indexes)
+
+    @property
+    def constraints(self):
+        return frozenset(self.__constraints)
+
+    def index(self, label, *properties):
+        self.__indexes.add(Index(label, *properties))
+        return self
+
+    def unique(self, label, property_name):
+        self.__constraints.add(UniqueConstraint(label, property_name))
+        return self
+
+    def register(self, model):
+        meta = getattr(model, u'Neo4jMeta', None)
+        if meta is None:
+            return model
+
+        label = getattr(meta, u'label', model.__name__)
+        for properties in getattr(meta, u'indexes', ()):
+            properties = (properties,) if isinstance(properties, six.string_types) else tuple(properties)
+            self.index(label, *properties)
+        for property_name in getattr(meta, u'unique', ()):
+            self.unique(label, property_name)
+
+        return model
+
+    def covers(self, label, property_name):
+        return any(index.covers(label, property_name) for index in self.__indexes) or \
+            any(constraint.key == (label, property_name) for constraint in self.__constraints)
+
+
+schema = Schema()
+
+
+class SchemaManager(object):
+    """
+    Diffs a declared ``Schema`` against the server and applies the difference.
+    """
+
+    def __init__(self, connection):
+        super(SchemaManager, self).__init__()
+        self.__connection = connection
+
+    def __rows(self, statement):
+        result = self.__connection.execute(statement)
+        return [dict(zip(result[u'columns'], data[u'row'])) for data in result.get(u'data', ())]
+
+    def existing(self):
+        indexes = set()
+        for row in self.__rows(u'CALL db.indexes()'):
+            match = _INDEX_DESCRIPTION.match(row[u'description'])
+            if match and row.get(u'type') != u'node_unique_property':
+                indexes.add(Index(_strip(match.group(u'label')), *[
+                    _strip(p) for p in match.group(u'properties').split(u',')
+                ]))
+
+        constraints = set()
+        for row in self.__rows(u'CALL db.constraints()'):
+            match = _CONSTRAINT_DESCRIPTION.match(row[u'description'])
+            if match:
+                constraints.add(UniqueConstraint(match.group(u'label'), match.group(u'property')))
+
+        return indexes, constraints
+
+    def diff(self, schema, drop=False):
+        """
+        Returns the statements that bring the server in line with ``schema``; undeclared entries are only dropped
+        when ``drop`` is set.
+        """
+        indexes, constraints = self.existing()
+        statements = []
+        if drop:
+            statements.extend(sorted(constraint.drop for constraint in constraints - schema.constraints))
+            statements.extend(sorted(index.drop for index in indexes - schema.indexes))
+        statements.extend(sorted(constraint.create for constraint in schema.constraints - constraints))
+        statements.extend(sorted(index.create for index in schema.indexes - indexes))
+        return statements
+
+    def sync(self, schema, drop=False, dry_run=False):
+        statements = self.diff(schema, drop=drop)
+        if not dry_run:
+            for statement in statements:
+                # schema changes cannot share a transaction with each other
+                self.__connection.execute(statement)
+
+        return statements
+
+
+class Advice(object):
+    def __init__(self, label, property_name, kinds, count):
+        super(Advice, self).__init__()
+        self.__label = label
+        self.__property = property_name
+        self.__kinds = frozenset(kinds)
+        self.__count = count
+
+    @property
+    def label(self):
+        return self.__label
+
+    @property
+    def property_name(self):
+        return self.__property
+
+    @property
+    def kinds(self):
+        return self.__kinds
+
+    @property
+    def count(self):
+        return self.__count
+
+    @property
+    def index(self):
+        return Index(self.__label, self.__property)
+
+    def __repr__(self):
+        return u'Advice({!r}, {!r}, {}, {})'.format(self.__label, self.__property, sorted(self.__kinds), self.__count)
+
+
+class IndexAdvisor(object):
+    """
+    Records which label/property pairs generated queries filter on, and reports those no index or unique constraint
+    covers.
+    """
+
+    def __init__(self):
+        super(IndexAdvisor, self).__init__()
+        self.__counts = collections.Counter()
+        self.__kinds = collections.defaultdict(set)
+
+    def observe(self, query, labels=None):
+        """
+        Records the filters of a ``Query`` or expression; ``labels`` maps variables to labels for expressions that
+        carry no node patterns.
+        """
+        root = getattr(query, u'statement', query)
+        nodes = []
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            nodes.append(node)
+            stack.extend(node.children)
+
+        variables = collections.defaultdict(set)
+        for variable, label in six.iteritems(labels or {}):
+            variables[variable].update((label,) if isinstance(label, six.string_types) else label)
+        for node in nodes:
+            if isinstance(node, Node) and node.variable:
+                variables[node.variable].update(node.labels)
+
+        for node in nodes:
+            if isinstance(node, Node):
+                for label in node.labels:
+                    for key, _ in node.properties:
+                        self.__record(label, key, EQUALITY)
+
+            elif isinstance(node, OperationExpression) and node.operation.type == u'Comparison':
+                kind = _COMPARISONS.get(node.operation.name)
+                if kind is None:
+                    continue
+                for operand in node.operands:
+                    match = isinstance(operand, Identifier) and _PROPERTY.match(operand.name)
+                    if match:
+                        for label in variables.get(match.group(u'variable'), ()):
+                            self.__record(label, match.group(u'property'), kind)
+
+    def __record(self, label, property_name, kind):
+        self.__counts[(label, property_name)] += 1
+        self.__kinds[(label, property_name)].add(kind)
+
+    def report(self, schema):
+        """
+        Returns ``Advice`` for every observed label/property pair ``schema`` does not cover, most frequent first.
+        """
+        return [
+            Advice(label, property_name, self.__kinds[(label, property_name)], count)
+            for (label, property_name), count in self.__counts.most_common()
+            if not schema.covers(label, property_name)
+        ]
+
+    def clear(self):
+        self.__counts.clear()
+        self.__kinds.clear()
@@ -0,0 +1,256 @@
+# coding=utf-8
+"""
+Callback registry for query timings, plus collectors and exporters built on it.
+
+Subscribers receive ``Event`` objects. ``render`` events come from ``Query.build``; ``request`` events come from the
+connection, one per statement sent. ``server_time`` is the wait until the response headers arrive (Neo4j's HTTP API
+reports no execution time of its own) and ``network_time`` the whole round trip including the body.
+"""
+import hashlib
+import logging
+import socket
+import threading
+import timeit
+
+import six
+
+RENDER = u'render'
+REQUEST = u'request'
+
+logger = logging.getLogger(__name__)
+
+
+def shape(statement):
+    """
+    Short, stable key for a parameterized statement.
+    """
+    return hashlib.sha1(statement.encode(u'utf-8')).hexdigest()[:12]
+
+
+class Event(object):
+    def __init__(
+        self,
+        kind,
+        statement,
+        render_time=0.0,
+        network_time=0.0,
+        server_time=0.0,
+        rows=0,
+        bytes=0,
+        error=None,
+    ):
+        super(Event, self).__init__()
+        self.__kind = kind
+        self.__statement = statement
+        self.__render_time = render_time
+        self.__network_time = network_time
+        self.__server_time = server_time
+        self.__rows = rows
+        self.__bytes = bytes
+        self.__error = error
+
+    @property
+    def kind(self):
+        return self.__kind
+
+    @property
+    def statement(self):
+        return self.__statement
+
+    @property
+    def shape(self):
+        return shape(self.__statement)
+
+    @property
+    def render_time(self):
+        return self.__render_time
+
+    @property
+    def network_time(self):
+        return self.__network_time
+
+    @property
+    def server_time(self):
+        return self.__server_time
+
+    @property
+    def rows(self):
+        return self.__rows
+
+    @property
+    def bytes(self):
+        return self.__bytes
+
+    @property
+    def error(self):
+        return self.__error
+
+
+class Instrumentation(object):
+    def __init__(self):
+        super(Instrumentation, self).__init__()
+        self.__subscribers = ()
+        self.__lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        return bool(self.__subscribers)
+
+    def subscribe(self, callback):
+        with self.__lock:
+            if callback not in self.__subscribers:
+                self.__subscribers += (callback,)
+        return callback
+
+    def unsubscribe(self, callback):
+        with self.__lock:
+            self.__subscribers = tuple(subscriber for subscriber in self.__subscribers if subscriber != callback)
+
+    def emit(self, event):
+        for subscriber in self.__subscribers:
+            try:
+                subscriber(event)
+            except Exception:
+                logger.exception(u'instrumentation subscriber %r failed', subscriber)
+
+    def rendered(self, statement, seconds):
+        if self.__subscribers:
+            self.emit(Event(RENDER, statement, render_time=seconds))
+
+    def requested(self, statements, network_time, server_time, rows, size, error=None):
+        """
+        Emits one request event per statement, splitting the request's time and bytes evenly between them.
+        """
+        if not self.__subscribers or not statements:
+            return
+
+        share = 1.0 / len(statements)
+        for index, statement in enumerate(statements):
+            self.emit(Event(
+                REQUEST,
+                statement,
+                network_time=network_time * share,
+                server_time=server_time * share,
+                rows=rows[index] if index < len(rows) else 0,
+                bytes=int(size * share),
+                error=error,
+            ))
+
+
+instrumentation = Instrumentation()
+timer = timeit.default_timer
+
+
+# COLLECTORS
+####################
+class ShapeStats(object):
+    FIELDS = (u'count', u'errors', u'render_time', u'network_time', u'server_time', u'rows', u'bytes')
+
+    def __init__(self, statement):
+        super(ShapeStats, self).__init__()
+        self.statement = statement
+        self.count = 0
+        self.errors = 0
+        self.render_time = 0.0
+        self.network_time = 0.0
+        self.server_time = 0.0
+        self.rows = 0
+        self.bytes = 0
+
+    def add(self, event):
+        if event.kind == RENDER:
+            self.render_time += event.render_time
+            return
+
+        self.count += 1
+        self.errors += event.error is not None
+        self.network_time += event.network_time
+        self.server_time += event.server_time
+        self.rows += event.rows
+        self.bytes += event.bytes
+
+    def as_dict(self):
+        return dict((field, getattr(self, field)) for field in (u'statement',) + self.FIELDS)
+
+
+class Collector(object):
+    """
+    Subscriber aggregating events per query shape.
+    """
+
+    def __init__(self):
+        super(Collector, self).__init__()
+        self.__shapes = {}
+        self.__lock = threading.Lock()
+
+    def __call__(self, event):
+        key = event.shape
+        with self.__lock:
+            stats = self.__shapes.get(key)
+            if stats is None:
+                stats = self.__shapes[key] = ShapeStats(event.statement)
+            stats.add(event)
+
+    def snapshot(self):
+        with self.__lock:
+            return dict((key, stats.as_dict()) for key, stats in six.iteritems(self.__shapes))
+
+    def clear(self):
+        with self.__lock:
+            self.__shapes.clear()
+
+
+# EXPORTERS
+####################
+class UDPSink(object):
+    def __init__(self, host=u'localhost', port=8125):
+        super(UDPSink, self).__init__()
+        self.__address = (host, port)
+        self.__socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+
+    def __call__(self, line):
+        try:
+            self.__socket.sendto(line.encode(u'utf-8'), self.__address)
+        except socket.error:
+            pass
+
+
+class StatsdExporter(object):
+    """
+    Subscriber writing each event as StatsD lines, e.g. ``django_neo4j.<shape>.network:1.5|ms``.
+
+    ``sink`` is any callable taking one line; it defaults to UDP on localhost:8125.
+    """
+
+    def __init__(self, sink=None, prefix=u'django_neo4j'):
+        super(StatsdExporter, self).__init__()
+        self.__sink = sink or UDPSink()
+        self.__prefix = prefix
+
+    def __call__(self, event):
+        name = u'{}.{}'.format(self.__prefix, event.shape)
+        if event.kind == RENDER:
+            self.__sink(u'{}.render:{:.3f}|ms'.format(name, event.render_time * 1000))
+            return
+
+        self.__sink(u'{}.network:{:.3f}|ms'.format(name, event.network_time * 1000))
+        self.__sink(u'{}.server:{:.3f}|ms'.format(name, event.server_time * 1000))
+        self.__sink(u'{}.rows:{}|c'.format(name, event.rows))
+        self.__sink(u'{}.bytes:{}|c'.format(name, event.bytes))
+        if event.error is not None:
+            self.__sink(u'{}.errors:1|c'.format(name))
+
+
+def prometheus(collector, prefix=u'django_neo4j'):
+    """
+    Renders a collector's totals in the Prometheus text exposition format.
+    """
+    snapshot = collector.snapshot()
+    lines = []
+    for field in ShapeStats.FIELDS:
+        metric = u'{}_{}{}'.format(prefix, field, u'_seconds_total' if field.endswith(u'_time') else u'_total')
+        lines.append(u'# TYPE {} counter'.format(metric))
+        for key in sorted(snapshot):
+            lines.append(u'{}{{shape="{}"}} {}'.format(metric, key, snapshot[key][field]))
+
+    return u'\n'.join(lines) + u'\n'
@@ -0,0 +1,26 @@
+# coding=utf-8
+from django.apps import apps
+from django.core.management.base import BaseCommand
+
+from django_neo4j.connection import DEFAULT_ALIAS, connections
+from django_neo4j.index import SchemaManager, schema
+
+
+class Command(BaseCommand):
+    help = u'Creates declared Neo4j indexes and unique constraints that are missing on the server.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(u'--database', default=DEFAULT_ALIAS, help=u'Neo4j database alias.')
+        parser.add_argument(u'--drop', action=u'store_true', help=u'Also drop undeclared indexes and constraints.')
+        parser.add_argument(u'--dry-run', action=u'store_true', help=u'Print the statements without running them.')
+
+    def handle(self, *args, **options):
+        for model in apps.get_models():
+            schema.register(model)
+
+        manager = SchemaManager(connections[options[u'database']])
+        statements = manager.sync(schema, drop=options[u'drop'], dry_run=options[u'dry_run'])
+        for statement in statements:
+            self.stdout.write(statement)
+        if not statements:
+            self.stdout.write(u'Schema is up to date.')
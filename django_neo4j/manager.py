@@ -0,0 +1,349 @@
+# coding=utf-8
+"""
+Django-style manager and lazy querysets over graph nodes.
+"""
+import six
+
+from django_neo4j.connection import DEFAULT_ALIAS, connections
+from django_neo4j.exception import QueryError
+from django_neo4j.expression import Literal
+from django_neo4j.match import Descending, Match, Query
+from django_neo4j.operation import ops
+from django_neo4j.pagination import ordering as keyset_ordering, seek
+from django_neo4j.pattern import Node
+from django_neo4j.relationship import BOTH, INCOMING, OUTGOING, Path
+from django_neo4j.type import Identifier
+
+_LOOKUPS = {
+    u'exact': lambda a, b: ops.comparison.eq(a, b),
+    u'ne': lambda a, b: ops.comparison.ne(a, b),
+    u'gt': lambda a, b: ops.comparison.gt(a, b),
+    u'gte': lambda a, b: ops.comparison.gte(a, b),
+    u'lt': lambda a, b: ops.comparison.lt(a, b),
+    u'lte': lambda a, b: ops.comparison.lte(a, b),
+    u'startswith': lambda a, b: ops.comparison.starts_with(a, b),
+    u'endswith': lambda a, b: ops.comparison.ends_with(a, b),
+    u'contains': lambda a, b: ops.comparison.contains(a, b),
+    u'in': lambda a, b: ops.collection.in_(a, list(b)),
+    u'isnull': lambda a, b: ops.comparison.is_null(a) if b else ops.comparison.is_not_null(a),
+}
+
+
+class GraphNode(object):
+    """
+    A node read from the graph: its internal id, properties and any prefetched neighbours.
+    """
+
+    def __init__(self, node_id, properties, related=None):
+        super(GraphNode, self).__init__()
+        self.__id = node_id
+        self.__properties = properties or {}
+        self.__related = related if related is not None else {}
+
+    @property
+    def id(self):
+        return self.__id
+
+    @property
+    def properties(self):
+        return self.__properties
+
+    def __getitem__(self, name):
+        return self.__properties[name]
+
+    def get(self, name, default=None):
+        return self.__properties.get(name, default)
+
+    def related(self, name):
+        try:
+            return self.__related[name]
+        except KeyError:
+            raise QueryError(u'relation {} was not prefetched'.format(name))
+
+    def _prefetched(self, name, nodes):
+        self.__related[name] = nodes
+
+    def __eq__(self, other):
+        return isinstance(other, GraphNode) and self.__id == other.__id
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash(self.__id)
+
+    def __repr__(self):
+        return u'<GraphNode {} {!r}>'.format(self.__id, self.__properties)
+
+
+class Prefetch(object):
+    """
+    Neighbours to load for every node of a page: ``Prefetch(u'KNOWS', label=u'Person', to_attr=u'friends')``.
+    """
+
+    def __init__(self, types, direction=OUTGOING, label=None, to_attr=None):
+        super(Prefetch, self).__init__()
+        if direction not in (OUTGOING, INCOMING, BOTH):
+            raise QueryError(u'unknown relationship direction {}'.format(direction))
+
+        self.__types = types
+        self.__direction = direction
+        self.__label = label
+        self.__to_attr = to_attr or (types if isinstance(types, six.string_types) else u'_'.join(types))
+
+    @property
+    def to_attr(self):
+        return self.__to_attr
+
+    def query(self, ids):
+        path = getattr(Path(Node(u'n')), self.__direction)(Node(u'm', self.__label), self.__types)
+        return Query().unwind(Literal(list(ids)), u'id').match(path).where(
+            ops.comparison.eq(Identifier(u'id(n)'), Identifier(u'id')),
+        ).return_(u'id', u'collect([id(m), m])')
+
+
+class GraphQuerySet(object):
+    """
+    Lazy, chainable query over the nodes with one label; nothing is sent until the queryset is iterated.
+
+    Each chained call returns a new queryset. Iterating caches the page; ``iterator()`` streams in chunks instead.
+    """
+
+    def __init__(self, label, using=DEFAULT_ALIAS, variable=u'n', connection=None):
+        super(GraphQuerySet, self).__init__()
+        self.__label = label
+        self.__using = using
+        self.__connection = connection
+        self.__node = Node(variable, label)
+        self.__filters = ()
+        self.__ordering = ()
+        self.__offset = None
+        self.__limit = None
+        self.__prefetch = ()
+        self.__cache = None
+
+    def __clone(self, **changes):
+        queryset = GraphQuerySet.__new__(GraphQuerySet)
+        queryset.__dict__.update(self.__dict__)
+        queryset.__cache = None
+        for name, value in six.iteritems(changes):
+            setattr(queryset, u'_GraphQuerySet__' + name, value)
+        return queryset
+
+    @property
+    def label(self):
+        return self.__label
+
+    @property
+    def node(self):
+        return self.__node
+
+    @property
+    def connection(self):
+        return self.__connection or connections[self.__using]
+
+    # CHAINING
+    ####################
+    def __lookups(self, lookups):
+        predicates = []
+        for key, value in sorted(six.iteritems(lookups)):
+            name, _, lookup = key.partition(u'__')
+            try:
+                predicates.append(_LOOKUPS[lookup or u'exact'](self.__node[name], value))
+            except KeyError:
+                raise QueryError(u'unsupported lookup {}'.format(key))
+        return predicates
+
+    def all(self):
+        return self.__clone()
+
+    def filter(self, *predicates, **lookups):
+        """
+        Narrows the queryset by ``ops`` predicates over ``queryset.node`` and by lookups such as ``age__gte=18``.
+        """
+        return self.__clone(filters=self.__filters + tuple(predicates) + tuple(self.__lookups(lookups)))
+
+    def exclude(self, *predicates, **lookups):
+        predicates = list(predicates) + self.__lookups(lookups)
+        if not predicates:
+            return self.__clone()
+
+        condition = predicates[0] if len(predicates) == 1 else ops.boolean.and_(*predicates)
+        return self.__clone(filters=self.__filters + (ops.boolean.not_(condition),))
+
+    def order_by(self, *names):
+        ordering = []
+        for name in names:
+            if not isinstance(name, six.string_types):
+                ordering.append(name)
+            elif name.startswith(u'-'):
+                ordering.append(Descending(self.__node[name[1:]]))
+            else:
+                ordering.append(self.__node[name])
+        return self.__clone(ordering=tuple(ordering))
+
+    def prefetch_related(self, *relations):
+        relations = tuple(Prefetch(relation) if isinstance(relation, six.string_types) else relation
+                          for relation in relations)
+        return self.__clone(prefetch=self.__prefetch + relations)
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            if key.step is not None or (key.start or 0) < 0 or (key.stop is not None and key.stop < 0):
+                raise QueryError(u'only non-negative slices without a step are supported')
+            start = (self.__offset or 0) + (key.start or 0)
+            stop = None if key.stop is None else (self.__offset or 0) + key.stop
+            if self.__limit is not None:
+                end = (self.__offset or 0) + self.__limit
+                stop = end if stop is None else min(stop, end)
+            return self.__clone(offset=start or None, limit=None if stop is None else max(stop - start, 0))
+
+        if self.__cache is not None:
+            return self.__cache[key]
+
+        return list(self[key:key + 1])[0]
+
+    # QUERIES
+    ####################
+    def query(self, offset=None, limit=None, after=None, key=None):
+        """
+        Returns the ``Match`` for this queryset; with ``key``, ordered by ``(key, id(n))`` and continuing after the
+        ``(value, id)`` pair ``after``.
+        """
+        query = Match(self.__node).where(*self.__filters)
+        ordering = self.__ordering
+        if key is not None:
+            query.where(ops.comparison.is_not_null(self.__node[key]))
+            if after is not None:
+                query.where(*seek(self.__node, key, *after))
+            ordering = keyset_ordering(self.__node, key)
+        query.return_(u'id({})'.format(self.__node.variable), self.__node.variable)
+
+        if ordering:
+            query.order_by(*ordering)
+        if offset:
+            query.skip(offset)
+        if limit is not None:
+            query.limit(limit)
+        return query
+
+    def __fetch(self, query):
+        nodes = [GraphNode(row[0], row[1]) for row in self.__rows(query)]
+        for relation in self.__prefetch:
+            self.__prefetch_into(relation, nodes)
+        return nodes
+
+    def __rows(self, query):
+        result = self.connection.execute(*query.build())
+        return [datum[u'row'] for datum in result.get(u'data') or ()]
+
+    def __prefetch_into(self, relation, nodes):
+        if not nodes:
+            return
+
+        related = dict((row[0], [GraphNode(*pair) for pair in row[1]]) for row in self.__rows(relation.query(
+            [node.id for node in nodes],
+        )))
+        for node in nodes:
+            node._prefetched(relation.to_attr, related.get(node.id, []))
+
+    def __iter__(self):
+        if self.__cache is None:
+            self.__cache = self.__fetch(self.query(self.__offset, self.__limit))
+
+        return iter(self.__cache)
+
+    def __len__(self):
+        return len(list(iter(self)))
+
+    def __bool__(self):
+        return bool(len(self))
+
+    __nonzero__ = __bool__
+
+    def count(self):
+        if self.__cache is not None or self.__offset or self.__limit is not None:
+            return len(self)
+
+        query = Match(self.__node).where(*self.__filters).return_(u'count({})'.format(self.__node.variable))
+        return self.__rows(query)[0][0]
+
+    def first(self):
+        nodes = list(self[:1])
+        return nodes[0] if nodes else None
+
+    def iterator(self, chunk_size=1000, key=None):
+        """
+        Yields nodes in chunks of ``chunk_size`` queries, without caching them.
+
+        By default chunks are read with SKIP/LIMIT in the queryset's order (``id(n)`` if none), which rescans the
+        skipped rows. With ``key`` naming an indexed property, each chunk instead continues after the last
+        ``(key, id(n))`` pair seen; nodes without the property are left out.
+        """
+        if chunk_size < 1:
+            raise QueryError(u'chunk size must be positive')
+        if key is not None and self.__ordering:
+            raise QueryError(u'keyset iteration orders by its key and cannot be combined with order_by()')
+
+        queryset = self
+        if key is None and not self.__ordering:
+            queryset = self.order_by(Identifier(u'id({})'.format(self.__node.variable)))
+
+        offset = self.__offset or 0
+        remaining = self.__limit
+        after = None
+        while remaining is None or remaining > 0:
+            size = chunk_size if remaining is None else min(chunk_size, remaining)
+            nodes = queryset.__fetch(queryset.query(offset, size, after, key))
+            for node in nodes:
+                yield node
+            if len(nodes) < size:
+                return
+
+            if key is None:
+                offset += size
+            else:
+                offset = 0
+                after = nodes[-1].get(key), nodes[-1].id
+            if remaining is not None:
+                remaining -= size
+
+
+class GraphManager(object):
+    """
+    Entry point for querysets over one label, e.g. ``people = GraphManager(u'Person')``.
+    """
+
+    def __init__(self, label, using=DEFAULT_ALIAS, connection=None):
+        super(GraphManager, self).__init__()
+        self.__label = label
+        self.__using = using
+        self.__connection = connection
+
+    @property
+    def label(self):
+        return self.__label
+
+    def get_queryset(self):
+        return GraphQuerySet(self.__label, using=self.__using, connection=self.__connection)
+
+    def all(self):
+        return self.get_queryset()
+
+    def filter(self, *predicates, **lookups):
+        return self.get_queryset().filter(*predicates, **lookups)
+
+    def exclude(self, *predicates, **lookups):
+        return self.get_queryset().exclude(*predicates, **lookups)
+
+    def order_by(self, *names):
+        return self.get_queryset().order_by(*names)
+
+    def prefetch_related(self, *relations):
+        return self.get_queryset().prefetch_related(*relations)
+
+    def count(self):
+        return self.get_queryset().count()
+
+    def iterator(self, chunk_size=1000, key=None):
+        return self.get_queryset().iterator(chunk_size, key)
@@ -1 +1,282 @@
 # coding=utf-8
+import six
+
+from django_neo4j import control
+from django_neo4j.aggregation import grouped
+from django_neo4j.exception import QueryError
+from django_neo4j.expression import Alias, Expression, OperationExpression, as_expression, render
+from django_neo4j.instrumentation import instrumentation, timer
+from django_neo4j.parameter import Parameters
+from django_neo4j.type import Identifier
+
+
+def _item(o):
+    if isinstance(o, six.string_types):
+        return Identifier(o)
+
+    if isinstance(o, tuple):
+        return Alias(_item(o[0]), o[1])
+
+    return as_expression(o)
+
+
+class Clause(Expression):
+    __slots__ = ('__keyword', '__items', '__separator')
+
+    def __init__(self, keyword, items, separator=u', '):
+        self.__keyword = keyword
+        self.__items = tuple(items)
+        self.__separator = separator
+
+    @property
+    def keyword(self):
+        return self.__keyword
+
+    @property
+    def items(self):
+        return self.__items
+
+    @property
+    def children(self):
+        return self.__items
+
+    def extend(self, items):
+        return Clause(self.__keyword, self.__items + tuple(items), self.__separator)
+
+    def _tokens(self, parameters):
+        grouped = self.__separator == Query.AND and len(self.__items) > 1
+        tokens = [self.__keyword, u' ']
+        for index, item in enumerate(self.__items):
+            if index:
+                tokens.append(self.__separator)
+            if grouped and isinstance(item, OperationExpression):
+                tokens.extend((u'(', item, u')'))
+            else:
+                tokens.append(item)
+        return tokens
+
+    def _key(self):
+        return self.__keyword, self.__items, self.__separator
+
+    def _shape(self):
+        return u'Clause', self.__keyword, len(self.__items)
+
+
+class Statement(Expression):
+    __slots__ = ('__clauses',)
+
+    def __init__(self, clauses):
+        self.__clauses = tuple(clauses)
+
+    @property
+    def clauses(self):
+        return self.__clauses
+
+    @property
+    def children(self):
+        return self.__clauses
+
+    def _tokens(self, parameters):
+        tokens = []
+        for index, clause in enumerate(self.__clauses):
+            if index:
+                tokens.append(u' ')
+            tokens.append(clause)
+        return tokens
+
+    def _key(self):
+        return self.__clauses
+
+    def _shape(self):
+        return u'Statement', len(self.__clauses)
+
+
+class Descending(Expression):
+    __slots__ = ('__expression',)
+
+    def __init__(self, expression):
+        self.__expression = as_expression(expression)
+
+    @property
+    def children(self):
+        return self.__expression,
+
+    def _tokens(self, parameters):
+        return self.__expression, u' DESC'
+
+    def _key(self):
+        return self.__expression,
+
+    def _shape(self):
+        return u'Descending',
+
+
+@six.python_2_unicode_compatible
+class Query(object):
+    """
+    Incremental Cypher query builder.
+
+    Clauses are appended to a single fragment list and rendered in one pass. ``clone()`` shares that list with the
+    copy until either side is modified, so a base query can be specialised cheaply.
+    """
+
+    AND = u' AND '
+
+    MATCH = u'MATCH'
+    OPTIONAL_MATCH = u'OPTIONAL MATCH'
+    WHERE = u'WHERE'
+    WITH = u'WITH'
+    UNWIND = u'UNWIND'
+    RETURN = u'RETURN'
+    ORDER_BY = u'ORDER BY'
+    SKIP = u'SKIP'
+    LIMIT = u'LIMIT'
+    CREATE = u'CREATE'
+    MERGE = u'MERGE'
+    SET = u'SET'
+
+    _FILTERABLE = (MATCH, OPTIONAL_MATCH, WITH)
+
+    def __init__(self):
+        super(Query, self).__init__()
+        self.__fragments = []
+        self.__shared = False
+
+    @property
+    def fragments(self):
+        return tuple(self.__fragments)
+
+    def clone(self):
+        query = Query.__new__(type(self))
+        query.__dict__.update(self.__dict__)
+        query.__shared = self.__shared = True
+        return query
+
+    def __own(self):
+        if self.__shared:
+            self.__fragments = list(self.__fragments)
+            self.__shared = False
+
+        return self.__fragments
+
+    def __append(self, clause):
+        self.__own().append(clause)
+        return self
+
+    def __last(self):
+        return self.__fragments[-1].keyword if self.__fragments else None
+
+    def __patterns(self, keyword, patterns):
+        patterns = [as_expression(pattern) for pattern in patterns]
+        for pattern in patterns:
+            if hasattr(pattern, u'check'):
+                pattern.check()
+
+        self.__append(Clause(keyword, patterns))
+        return self.where(*[predicate for pattern in patterns for predicate in getattr(pattern, u'predicates', ())] +
+                          control.predicates(patterns))
+
+    def match(self, *patterns):
+        return self.__patterns(self.MATCH, patterns)
+
+    def optional_match(self, *patterns):
+        return self.__patterns(self.OPTIONAL_MATCH, patterns)
+
+    def where(self, *predicates):
+        if not predicates:
+            return self
+
+        predicates = [as_expression(predicate) for predicate in predicates]
+        last = self.__last()
+        if last == self.WHERE:
+            fragments = self.__own()
+            fragments[-1] = fragments[-1].extend(predicates)
+            return self
+
+        if last not in self._FILTERABLE:
+            raise QueryError(u'WHERE must follow one of: {}'.format(u', '.join(self._FILTERABLE)))
+
+        return self.__append(Clause(self.WHERE, predicates, self.AND))
+
+    def with_(self, *items, **kwargs):
+        keyword = self.WITH + (u' DISTINCT' if kwargs.get(u'distinct') else u'')
+        return self.__append(Clause(keyword, [_item(item) for item in items]))
+
+    def unwind(self, expression, name):
+        return self.__append(Clause(self.UNWIND, [Alias(_item(expression), name)]))
+
+    def return_(self, *items, **kwargs):
+        keyword = self.RETURN + (u' DISTINCT' if kwargs.get(u'distinct') else u'')
+        return self.__append(Clause(keyword, [_item(item) for item in items]))
+
+    def create(self, *patterns):
+        return self.__append(Clause(self.CREATE, [as_expression(pattern) for pattern in patterns]))
+
+    def merge(self, pattern):
+        pattern = as_expression(pattern)
+        self.__append(Clause(self.MERGE, [pattern]))
+        predicates = control.predicates([pattern])
+        if predicates:
+            # MERGE takes no WHERE; restricted matches are dropped before any later clause sees them.
+            self.with_(u'*').where(*predicates)
+        return self
+
+    def set(self, *items):
+        return self.__append(Clause(self.SET, [_item(item) for item in items]))
+
+    def aggregate(self, keys, aggregates, with_=False, distinct=False):
+        """
+        Appends a RETURN (or WITH) clause reducing rows inside Neo4j, grouped by ``keys``.
+        """
+        items = grouped(keys, aggregates)
+        if with_:
+            return self.with_(*items, distinct=distinct)
+
+        return self.return_(*items, distinct=distinct)
+
+    def order_by(self, *items):
+        ordering = []
+        for item in items:
+            if isinstance(item, six.string_types) and item.startswith(u'-'):
+                ordering.append(Descending(Identifier(item[1:])))
+            else:
+                ordering.append(_item(item))
+
+        return self.__append(Clause(self.ORDER_BY, ordering))
+
+    def skip(self, count):
+        return self.__append(Clause(self.SKIP, [as_expression(count)]))
+
+    def limit(self, count):
+        return self.__append(Clause(self.LIMIT, [as_expression(count)]))
+
+    @property
+    def statement(self):
+        return Statement(self.__fragments)
+
+    def render(self, parameters=None):
+        return render(self.statement, parameters)
+
+    def build(self, parameters=None):
+        """
+        Returns the parameterized Cypher text and its parameter values.
+        """
+        if parameters is None:
+            parameters = Parameters()
+
+        started = timer()
+        text = self.render(parameters)
+        instrumentation.rendered(text, timer() - started)
+        return text, parameters.values
+
+    def __str__(self):
+        return self.render()
+
+
+class Match(Query):
+    def __init__(self, *patterns, **kwargs):
+        super(Match, self).__init__()
+        if kwargs.get(u'optional'):
+            self.optional_match(*patterns)
+        else:
+            self.match(*patterns)
@@ -1,18 +1,59 @@
 # coding=utf-8
 import decimal
+import itertools
+import threading
 
 import six
 
+from django_neo4j.aggregation import Aggregation
 from django_neo4j.exception import OperationArgumentTypeError, OperationArgumentMismatchError, OperationArityError, \
-    OperationZeroDivisionError, OperationInitializationError, OperationImplementationError
-from django_neo4j.type import NULL
+    OperationZeroDivisionError, OperationInitializationError, OperationImplementationError, OperationColumnError
+from django_neo4j.expression import Expression, OperationExpression
+from django_neo4j.type import NULL, Identifier
 
 
-def _wrap_string(o):
-    return u'"{}"'.format(o) if isinstance(o, (str, unicode)) else o
+def _group(o):
+    return (u'(', o, u')') if isinstance(o, OperationExpression) else (o,)
 
-def _reverse_binary(self, a, b):
-    self._binary(b, a)
+
+def _column(o):
+    # numpy arrays are recognised by their type's module, so numpy is never imported here
+    if type(o).__module__ == u'numpy':
+        return o.tolist()
+
+    if isinstance(o, (list, tuple)):
+        return o
+
+    return None
+
+
+class _Lazy(object):
+    """
+    Class attribute built on first access and shared from then on, so unused families cost nothing at import.
+    """
+
+    __lock = threading.RLock()
+
+    def __init__(self, factory, *args, **kwargs):
+        super(_Lazy, self).__init__()
+        self.__factory = factory
+        self.__args = args
+        self.__kwargs = kwargs
+        self.__value = None
+
+    @property
+    def built(self):
+        return self.__value is not None
+
+    def __get__(self, instance, owner):
+        value = self.__value
+        if value is None:
+            with _Lazy.__lock:
+                if self.__value is None:
+                    self.__value = self.__factory(*self.__args, **self.__kwargs)
+                value = self.__value
+
+        return value
 
 
 class Operation(object):
@@ -20,17 +61,21 @@ class Operation(object):
     http://neo4j.com/docs/stable/query-operations.html
     """
 
+    VARIADIC = 0
     UNARY = 1
     BINARY = 2
+    TERNARY = 3
 
-    _ARITY_NAMES = (u'unary', u'binary')
+    _ARITY_NAMES = (u'variadic', u'unary', u'binary', u'ternary')
+    _DISPATCH_SIZE = 32
 
     def __init__(
         self,
         name,
         symbol,
         valid_types=None,
-        arity=None
+        arity=None,
+        min_arity=None,
     ):
         super(Operation, self).__init__()
 
@@ -43,17 +88,25 @@ class Operation(object):
             raise OperationInitializationError(self, u'symbol must be set')
 
         # ARITY
-        arity = arity or self.BINARY
-        if arity not in (self.UNARY, self.BINARY):
-            raise OperationInitializationError(self, u'arity may only be 1 or 2')
+        arity = self.BINARY if arity is None else arity
+        if arity not in (self.VARIADIC, self.UNARY, self.BINARY, self.TERNARY):
+            raise OperationInitializationError(self, u'arity may only be 0 (variadic), 1, 2 or 3')
+        min_arity = min_arity or (self.BINARY if arity == self.VARIADIC else arity)
+        if min_arity < 1 or (arity != self.VARIADIC and min_arity > arity):
+            raise OperationInitializationError(self, u'minimum arity must be between 1 and the arity')
 
         # SET
         self.__type = self.__class__.__name__.lstrip(u'_')
         self.__name = name
         self.__symbol = symbol
-        self.__arity = arity or self.BINARY
-        self.__arity_name = self._ARITY_NAMES[arity - 1]
+        self.__symbol_token = (symbol,)
+        self.__arity = arity
+        self.__min_arity = min_arity
+        self.__arity_name = self._ARITY_NAMES[arity]
         self.__valid_types = tuple(valid_types or [])
+        self.__dispatch = {}
+        self.__validates = \
+            six.get_unbound_function(type(self)._validate) is not six.get_unbound_function(Operation._validate)
 
     @property
     def type(self):
@@ -71,6 +124,10 @@ class Operation(object):
     def arity(self):
         return self.__arity
 
+    @property
+    def min_arity(self):
+        return self.__min_arity
+
     @property
     def arity_name(self):
         return self.__arity_name
@@ -92,35 +149,152 @@ class Operation(object):
             if self.valid_types and not isinstance(arg, self.valid_types):
                 raise OperationArgumentTypeError(self, arg)
 
+    def _type_validate(self, *args):
+        """
+        Checks depending only on argument types; run once per distinct combination of argument types.
+        """
+        pass
+
     def _validate(self, *args):
         return args
 
     def _unary(self, a):
         raise OperationImplementationError(self, '_unary')
 
-    def __unary(self, a):
-        return self._unary(*self.__validate(a))
-
     def _binary(self, a, b):
         raise OperationImplementationError(self, '_binary')
 
-    def __validate(self, *args):
-        self._type_check(*args)
-        clean_args = [six.u(arg) if isinstance(arg, str) else arg for arg in args]
-        return self._validate(*clean_args)
+    def _nary(self, *args):
+        raise OperationImplementationError(self, '_nary')
 
-    def __binary(self, a, b):
-        return self._binary(*self.__validate(a, b))
+    def accepts(self, count):
+        return self.__min_arity <= count and (self.__arity == self.VARIADIC or count <= self.__arity)
 
-    def __call__(self, *args):
-        if len(args) != self.arity:
+    def __render(self, count):
+        if count == 1:
+            return self._unary
+        if count == 2:
+            return self._binary
+        return self._nary
+
+    def _tokens(self, operands):
+        if self.__arity == self.UNARY:
+            return _group(operands[0]) + self.__symbol_token
+
+        a, b = operands
+        return _group(a) + self.__symbol_token + _group(b)
+
+    def __compile(self, args):
+        if not self.accepts(len(args)):
             raise OperationArityError(self, len(args))
 
-        if self.is_unary:
-            return self.__unary(*args)
+        self._type_check(*args)
+        self._type_validate(*args)
+
+        renderer = self.__renderer(tuple(type(arg) for arg in args))
+        if len(self.__dispatch) < self._DISPATCH_SIZE:
+            self.__dispatch[tuple(type(arg) for arg in args)] = renderer
+
+        return renderer
+
+    def _prime(self, signatures):
+        """
+        Precomputes dispatch entries for each tuple of argument types, which must already be known to pass the type
+        checks; primed entries do not count against the lazily filled dispatch size.
+        """
+        for types in signatures:
+            self.__dispatch[types] = self.__renderer(types)
+
+    def __renderer(self, types):
+        render = self.__render(len(types))
+        convert = not six.PY3 and any(issubclass(arg_type, str) for arg_type in types)
+        validate = self._validate if self.__validates else None
+
+        if convert and validate:
+            def renderer(*a):
+                return render(*validate(*[six.u(arg) if isinstance(arg, str) else arg for arg in a]))
+        elif convert:
+            def renderer(*a):
+                return render(*[six.u(arg) if isinstance(arg, str) else arg for arg in a])
+        elif validate:
+            def renderer(*a):
+                return render(*validate(*a))
+        else:
+            renderer = render
+
+        return renderer
+
+    def trusted(self, *args):
+        """
+        Renders without arity, type or value validation; only for internally generated arguments.
+        """
+        return self.__render(len(args))(*args)
+
+    def __resolve(self, args):
+        renderer = self.__dispatch.get(tuple(type(arg) for arg in args))
+        if renderer is None:
+            return self.__compile(args)
+
+        return renderer
+
+    def __rows(self, args):
+        if not self.accepts(len(args)):
+            raise OperationArityError(self, len(args))
 
-        if self.is_binary:
-            return self.__binary(*args)
+        columns = [_column(arg) for arg in args]
+        indexes = [index for index, column in enumerate(columns) if column is not None]
+        lengths = set(len(columns[index]) for index in indexes)
+        if not lengths:
+            raise OperationColumnError(u'operation {} given no columns'.format(self.name))
+        if len(lengths) > 1:
+            raise OperationColumnError(u'operation {} given columns of lengths {}'.format(self.name, sorted(lengths)))
+
+        homogeneous = all(len(set(type(value) for value in columns[index])) <= 1 for index in indexes)
+        rows = list(six.moves.zip(*[
+            itertools.repeat(arg) if column is None else column
+            for arg, column in zip(args, columns)
+        ]))
+        return rows, indexes, homogeneous
+
+    def many(self, *args):
+        """
+        Applies the operation row-wise over columns (lists, tuples or NumPy arrays); other arguments are broadcast.
+        """
+        rows, _, homogeneous = self.__rows(args)
+        if not rows:
+            return []
+
+        if homogeneous:
+            renderer = self.__resolve(rows[0])
+            return [renderer(*row) for row in rows]
+
+        return [self.__resolve(row)(*row) for row in rows]
+
+    def unwind(self, *args, **kwargs):
+        """
+        Returns a single expression over ``row.c<i>`` for each column argument, with the list of row maps to bind to the
+        ``UNWIND`` parameter.
+        """
+        variable = kwargs.pop(u'variable', u'row')
+        rows, indexes, homogeneous = self.__rows(args)
+        if homogeneous and rows:
+            self.__resolve(rows[0])
+        elif rows:
+            for row in dict((tuple(type(value) for value in row), row) for row in rows).values():
+                self.__resolve(row)
+
+        if self.__validates:
+            for row in rows:
+                self._validate(*row)
+
+        operands = list(args)
+        for index in indexes:
+            operands[index] = Identifier(u'{}.c{}'.format(variable, index))
+
+        return self.trusted(*operands), [dict((u'c{}'.format(index), row[index]) for index in indexes) for row in rows]
+
+    def __call__(self, *args):
+        return self.__resolve(args)(*args)
 
 
 # MATHEMATICAL
@@ -131,12 +305,12 @@ class _Mathematical(Operation):
         super(_Mathematical, self).__init__(
             name=name,
             symbol=symbol,
-            valid_types=list(six.integer_types) + [float, decimal.Decimal],
+            valid_types=list(six.integer_types) + [float, decimal.Decimal, Expression],
             arity=arity,
         )
 
     def _binary(self, a, b):
-        return u'{}{}{}'.format(_wrap_string(a), self.symbol, _wrap_string(b))
+        return OperationExpression(self, a, b)
 
 
 class _DivideMathematicalOperation(_Mathematical):
@@ -151,12 +325,12 @@ class _DivideMathematicalOperation(_Mathematical):
 
 
 class Mathematical(object):
-    __add = _Mathematical(name=u'add', symbol=u'+')
-    __subtract = _Mathematical(name=u'subtract', symbol=u'-')
-    __multiply = _Mathematical(name=u'multiply', symbol=u'*')
-    __divide = _DivideMathematicalOperation()
-    __mod = _Mathematical(name=u'mod', symbol=u'%')
-    __pow = _Mathematical(name=u'pow', symbol=u'^')
+    __add = _Lazy(_Mathematical, name=u'add', symbol=u'+')
+    __subtract = _Lazy(_Mathematical, name=u'subtract', symbol=u'-')
+    __multiply = _Lazy(_Mathematical, name=u'multiply', symbol=u'*')
+    __divide = _Lazy(_DivideMathematicalOperation)
+    __mod = _Lazy(_Mathematical, name=u'mod', symbol=u'%')
+    __pow = _Lazy(_Mathematical, name=u'pow', symbol=u'^')
 
     @property
     def add(self):
@@ -191,24 +365,30 @@ class _Comparison(Operation):
         super(_Comparison, self).__init__(
             name=name,
             symbol=symbol,
-            valid_types=list(six.integer_types) + [float, decimal.Decimal, str, unicode, type(NULL)],
+            valid_types=list(six.integer_types) + list(six.string_types) + [
+                float,
+                decimal.Decimal,
+                type(NULL),
+                Expression,
+            ],
             arity=arity,
         )
 
-    def _validate(self, *args):
-        args = super(_Comparison, self)._validate(*args)
+    def _type_validate(self, *args):
+        super(_Comparison, self)._type_validate(*args)
         if self.is_binary:
             a, b = args
-            if isinstance(a, (str, unicode)) != isinstance(b, (str, unicode)):
-                raise OperationArgumentMismatchError(self, a, b)
+            if (isinstance(a, Expression) and a is not NULL) or (isinstance(b, Expression) and b is not NULL):
+                return
 
-        return args
+            if isinstance(a, six.string_types) != isinstance(b, six.string_types):
+                raise OperationArgumentMismatchError(self, a, b)
 
     def _unary(self, a):
-        return u'{}{}'.format(_wrap_string(a), self.symbol)
+        return OperationExpression(self, a)
 
     def _binary(self, a, b):
-        return u'{}{}{}'.format(_wrap_string(a), self.symbol, _wrap_string(b))
+        return OperationExpression(self, a, b)
 
 
 class _AbstractContainsComparisonOperation(_Comparison):
@@ -230,18 +410,18 @@ class _InComparisonOperation(_AbstractContainsComparisonOperation):
 
 
 class Comparison(object):
-    __equal_to = _Comparison(name=u'equal to', symbol=u'=')
-    __not_equal_to = _Comparison(name=u'not equal to', symbol=u'<>')
-    __greater_than = _Comparison(name=u'greater than', symbol=u'>')
-    __greater_than_or_equal_to = _Comparison(name=u'greater than or equal to', symbol=u'>=')
-    __less_than = _Comparison(name=u'less than', symbol=u'<')
-    __less_than_or_equal_to = _Comparison(name=u'less than or equal to', symbol=u'<=')
-    __is_null = _Comparison(name='null', symbol=' IS NULL', arity=Operation.UNARY)
-    __is_not_null = _Comparison(name='not null', symbol=' IS NOT NULL', arity=Operation.UNARY)
-    __starts_with = _Comparison(name='starts with', symbol=' STARTS WITH ')
-    __ends_with = _Comparison(name='starts with', symbol=' ENDS WITH ')
-    __contains = _ContainsComparisonOperation()
-    __is_in = _InComparisonOperation()
+    __equal_to = _Lazy(_Comparison, name=u'equal to', symbol=u'=')
+    __not_equal_to = _Lazy(_Comparison, name=u'not equal to', symbol=u'<>')
+    __greater_than = _Lazy(_Comparison, name=u'greater than', symbol=u'>')
+    __greater_than_or_equal_to = _Lazy(_Comparison, name=u'greater than or equal to', symbol=u'>=')
+    __less_than = _Lazy(_Comparison, name=u'less than', symbol=u'<')
+    __less_than_or_equal_to = _Lazy(_Comparison, name=u'less than or equal to', symbol=u'<=')
+    __is_null = _Lazy(_Comparison, name='null', symbol=' IS NULL', arity=Operation.UNARY)
+    __is_not_null = _Lazy(_Comparison, name='not null', symbol=' IS NOT NULL', arity=Operation.UNARY)
+    __starts_with = _Lazy(_Comparison, name='starts with', symbol=' STARTS WITH ')
+    __ends_with = _Lazy(_Comparison, name='ends with', symbol=' ENDS WITH ')
+    __contains = _Lazy(_ContainsComparisonOperation)
+    __is_in = _Lazy(_InComparisonOperation)
 
     @property
     def equal_to(self):
@@ -324,70 +504,216 @@ class Comparison(object):
         return self.__is_in
 
 
-# BOOLEAN
+# TABLE
 ####################
+INFIX = u'infix'
+PREFIX = u'prefix'
+FUNCTION = u'function'
+INDEX = u'index'
+SLICE = u'slice'
+
+_NUMBER = tuple(six.integer_types) + (float, decimal.Decimal)
+_STRING_TYPES = tuple(six.string_types)
+_EXPRESSION = (Expression,)
+
+_BOOLEAN = (bool,) + _EXPRESSION
+_INTEGER = tuple(six.integer_types) + _EXPRESSION
+_STRING = _STRING_TYPES + _EXPRESSION
+_LIST = (list, tuple) + _EXPRESSION
+_VALUE = _NUMBER + _STRING_TYPES + (bool, list, tuple) + _EXPRESSION
+
+# family, name, symbol, style, arity, minimum arity, per-argument types (the last repeats), associative, attributes
+_OPERATIONS = (
+    (u'Boolean', u'and', u' AND ', INFIX, Operation.VARIADIC, 2, (_BOOLEAN,), True, (u'and_', u'all')),
+    (u'Boolean', u'or', u' OR ', INFIX, Operation.VARIADIC, 2, (_BOOLEAN,), True, (u'or_', u'any')),
+    (u'Boolean', u'xor', u' XOR ', INFIX, Operation.BINARY, None, (_BOOLEAN,), False, (u'xor',)),
+    (u'Boolean', u'not', u'NOT ', PREFIX, Operation.UNARY, None, (_BOOLEAN,), False, (u'not_', u'negate')),
+
+    (u'String', u'concat', u'+', INFIX, Operation.VARIADIC, 2, (_STRING,), True, (u'concat',)),
+    (u'String', u'lower', u'toLower', FUNCTION, Operation.UNARY, None, (_STRING,), False, (u'lower',)),
+    (u'String', u'upper', u'toUpper', FUNCTION, Operation.UNARY, None, (_STRING,), False, (u'upper',)),
+    (u'String', u'trim', u'trim', FUNCTION, Operation.UNARY, None, (_STRING,), False, (u'trim',)),
+    (u'String', u'left trim', u'lTrim', FUNCTION, Operation.UNARY, None, (_STRING,), False, (u'ltrim',)),
+    (u'String', u'right trim', u'rTrim', FUNCTION, Operation.UNARY, None, (_STRING,), False, (u'rtrim',)),
+    (u'String', u'reverse', u'reverse', FUNCTION, Operation.UNARY, None, (_STRING,), False, (u'reverse',)),
+    (u'String', u'to string', u'toString', FUNCTION, Operation.UNARY, None, (_VALUE,), False, (u'to_string',)),
+    (u'String', u'left', u'left', FUNCTION, Operation.BINARY, None, (_STRING, _INTEGER), False, (u'left',)),
+    (u'String', u'right', u'right', FUNCTION, Operation.BINARY, None, (_STRING, _INTEGER), False, (u'right',)),
+    (u'String', u'split', u'split', FUNCTION, Operation.BINARY, None, (_STRING,), False, (u'split',)),
+    (u'String', u'replace', u'replace', FUNCTION, Operation.TERNARY, None, (_STRING,), False, (u'replace',)),
+    (u'String', u'substring', u'substring', FUNCTION, Operation.TERNARY, 2, (_STRING, _INTEGER), False,
+     (u'substring',)),
+
+    (u'Collection', u'concat', u'+', INFIX, Operation.VARIADIC, 2, (_LIST,), True, (u'concat',)),
+    (u'Collection', u'in', u' IN ', INFIX, Operation.BINARY, None, (_VALUE, _LIST), False, (u'in_', u'member')),
+    (u'Collection', u'index', u'[]', INDEX, Operation.BINARY, None, (_LIST, _INTEGER), False, (u'index', u'at')),
+    (u'Collection', u'slice', u'[..]', SLICE, Operation.TERNARY, None, (_LIST, _INTEGER), False, (u'slice',)),
+    (u'Collection', u'size', u'size', FUNCTION, Operation.UNARY, None, (_LIST,), False, (u'size',)),
+    (u'Collection', u'head', u'head', FUNCTION, Operation.UNARY, None, (_LIST,), False, (u'head',)),
+    (u'Collection', u'last', u'last', FUNCTION, Operation.UNARY, None, (_LIST,), False, (u'last',)),
+    (u'Collection', u'tail', u'tail', FUNCTION, Operation.UNARY, None, (_LIST,), False, (u'tail',)),
+    (u'Collection', u'range', u'range', FUNCTION, Operation.TERNARY, 2, (_INTEGER,), False, (u'range',)),
+
+    (u'Regex', u'matches', u' =~ ', INFIX, Operation.BINARY, None, (_STRING,), False, (u'matches', u'match')),
+)
+
+_PRIME_LIMIT = 256
+
+
+def _concrete(types):
+    """
+    Concrete argument types worth priming for a signature position: the listed builtins plus the common leaf
+    expressions (and NULL).
+    """
+    from django_neo4j.expression import Alias, Literal, Parameter
+
+    concrete = []
+    for arg_type in types:
+        if arg_type is Expression:
+            concrete.extend((Identifier, Literal, OperationExpression, Parameter, Alias, type(NULL)))
+        elif arg_type is six.string_types[0] and not six.PY3:
+            concrete.extend((str, six.text_type))
+        else:
+            concrete.append(arg_type)
 
-class _Boolean(Operation):
-    pass
+    return tuple(concrete)
 
 
-class Boolean(object):
-    pass
+class _TableOperation(Operation):
+    """
+    Operation generated from a row of the operation table.
+    """
 
+    def __init__(self, name, symbol, style, arity, min_arity, signature, associative):
+        super(_TableOperation, self).__init__(
+            name=name,
+            symbol=symbol,
+            valid_types=tuple(set(arg_type for types in signature for arg_type in types)),
+            arity=arity,
+            min_arity=min_arity,
+        )
+        self.__style = style
+        self.__signature = signature
+        self.__associative = associative
+        self.__prime()
 
-# STRING
-####################
+    @property
+    def style(self):
+        return self.__style
 
+    @property
+    def signature(self):
+        return self.__signature
 
-class _String(Operation):
-    pass
+    def __types(self, position):
+        return self.__signature[min(position, len(self.__signature) - 1)]
 
+    def __prime(self):
+        counts = range(self.min_arity, (self.arity or self.min_arity) + 1)
+        signatures = []
+        for count in counts:
+            positions = [_concrete(self.__types(position)) for position in range(count)]
+            size = 1
+            for types in positions:
+                size *= len(types)
+            if size <= _PRIME_LIMIT:
+                signatures.extend(itertools.product(*positions))
 
-class String(object):
-    pass
+        self._prime(signatures)
 
+    def _type_check(self, *args):
+        for position, arg in enumerate(args):
+            if not isinstance(arg, self.__types(position)):
+                raise OperationArgumentTypeError(self, arg)
 
-# COLLECTION
-####################
-class _Collection(Operation):
-    pass
+    def __expression(self, args):
+        if self.__associative:
+            operands = []
+            for arg in args:
+                if isinstance(arg, OperationExpression) and arg.operation is self:
+                    operands.extend(arg.operands)
+                else:
+                    operands.append(arg)
+            args = operands
 
+        return OperationExpression(self, *args)
 
-class Collection(object):
-    pass
+    def _unary(self, a):
+        return self.__expression((a,))
 
+    def _binary(self, a, b):
+        return self.__expression((a, b))
 
-# REGEX
-####################
+    def _nary(self, *args):
+        return self.__expression(args)
 
+    def _tokens(self, operands):
+        style = self.__style
+        if style == INFIX:
+            tokens = list(_group(operands[0]))
+            for operand in operands[1:]:
+                tokens.append(self.symbol)
+                tokens.extend(_group(operand))
+            return tuple(tokens)
 
-class _Regex(Operation):
-    pass
+        if style == PREFIX:
+            return (self.symbol,) + _group(operands[0])
 
+        if style == INDEX:
+            return _group(operands[0]) + (u'[', operands[1], u']')
 
-class Regex(object):
-    pass
+        if style == SLICE:
+            return _group(operands[0]) + (u'[', operands[1], u'..', operands[2], u']')
+
+        tokens = [self.symbol + u'(']
+        for index, operand in enumerate(operands):
+            if index:
+                tokens.append(u', ')
+            tokens.append(operand)
+        tokens.append(u')')
+        return tuple(tokens)
+
+
+def _family(name, rows):
+    operation_type = type(str(u'_' + name), (_TableOperation,), {})
+    attributes = {u'__doc__': u'{} operations generated from the operation table.'.format(name)}
+    for _, operation_name, symbol, style, arity, min_arity, signature, associative, names in rows:
+        operation = _Lazy(operation_type, operation_name, symbol, style, arity, min_arity, signature, associative)
+        for attribute in names:
+            attributes[attribute] = operation
+
+    return operation_type, type(str(name), (object,), attributes)
+
+
+_Boolean, Boolean = _family(u'Boolean', [row for row in _OPERATIONS if row[0] == u'Boolean'])
+_String, String = _family(u'String', [row for row in _OPERATIONS if row[0] == u'String'])
+_Collection, Collection = _family(u'Collection', [row for row in _OPERATIONS if row[0] == u'Collection'])
+_Regex, Regex = _family(u'Regex', [row for row in _OPERATIONS if row[0] == u'Regex'])
 
 
 # noinspection PyPep8Naming
 class ops(object):
-    mathematical = Mathematical()
+    mathematical = _Lazy(Mathematical)
     math = mathematical
     m = mathematical
 
-    comparison = Comparison()
+    comparison = _Lazy(Comparison)
     compare = comparison
     c = comparison
 
-    boolean = Boolean()
+    boolean = _Lazy(Boolean)
     b = boolean
 
-    string = String()
+    string = _Lazy(String)
     s = string
 
-    collection = Collection()
+    collection = _Lazy(Collection)
     collect = collection
     C = collection
 
-    regex = Regex()
+    regex = _Lazy(Regex)
     r = regex
+
+    aggregation = _Lazy(Aggregation)
+    aggregate = aggregation
+    a = aggregation
@@ -0,0 +1,228 @@
+# coding=utf-8
+"""
+Keyset (seek) pagination over graph querysets.
+
+Each page continues after the last key seen, ``WHERE n.key > $last ... LIMIT per_page``, so the server seeks into the
+property index instead of skipping every earlier row and page N costs the same as page 1.
+"""
+import base64
+import json
+
+import six
+from django.core.paginator import EmptyPage, InvalidPage, Page, Paginator
+
+from django_neo4j.exception import QueryError
+from django_neo4j.match import Descending
+from django_neo4j.operation import ops
+from django_neo4j.type import Identifier
+
+
+class Cursor(object):
+    """
+    Position between two rows: the ordering key and node id of the row it follows (or precedes, when ``backwards``).
+
+    The node id breaks ties between rows sharing a key, so cursors stay stable for non-unique keys.
+    """
+
+    def __init__(self, value, node_id, backwards=False):
+        super(Cursor, self).__init__()
+        self.__value = value
+        self.__node_id = node_id
+        self.__backwards = backwards
+
+    @property
+    def value(self):
+        return self.__value
+
+    @property
+    def node_id(self):
+        return self.__node_id
+
+    @property
+    def backwards(self):
+        return self.__backwards
+
+    def encode(self):
+        data = json.dumps([self.__value, self.__node_id, int(self.__backwards)], separators=(u',', u':'))
+        return base64.urlsafe_b64encode(data.encode(u'utf-8')).decode(u'ascii').rstrip(u'=')
+
+    @classmethod
+    def decode(cls, token):
+        try:
+            token = token.encode(u'ascii') if not isinstance(token, bytes) else token
+            value, node_id, backwards = json.loads(
+                base64.urlsafe_b64decode(token + b'=' * (-len(token) % 4)).decode(u'utf-8'),
+            )
+        except (TypeError, ValueError, UnicodeError):
+            raise QueryError(u'invalid cursor {!r}'.format(token))
+
+        scalar = value is None or isinstance(value, (bool, float) + six.integer_types + six.string_types)
+        if not scalar or isinstance(node_id, bool) or not isinstance(node_id, six.integer_types):
+            raise QueryError(u'invalid cursor {!r}'.format(token))
+
+        return cls(value, node_id, bool(backwards))
+
+    def __eq__(self, other):
+        return isinstance(other, Cursor) and (self.__value, self.__node_id, self.__backwards) == (
+            other.__value, other.__node_id, other.__backwards,
+        )
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash((self.__value, self.__node_id, self.__backwards))
+
+    def __str__(self):
+        return self.encode()
+
+
+def seek(node, key, value, node_id, descending=False):
+    """
+    Predicates selecting the rows after ``(value, node_id)`` in ``(key, id(node))`` order.
+
+    The leading ``key >= value`` conjunct (``<=`` when descending) lets the planner use an index range seek, which a
+    top-level OR would prevent.
+    """
+    bound, after = (ops.comparison.lte, ops.comparison.lt) if descending else (ops.comparison.gte, ops.comparison.gt)
+    return (
+        bound(node[key], value),
+        ops.boolean.or_(after(node[key], value), after(Identifier(u'id({})'.format(node.variable)), node_id)),
+    )
+
+
+def ordering(node, key, descending=False):
+    items = (node[key], Identifier(u'id({})'.format(node.variable)))
+    return tuple(Descending(item) for item in items) if descending else items
+
+
+class Seek(object):
+    """
+    Reads pages of a ``GraphQuerySet`` ordered by ``key``, an indexed, non-null property; any other ordering on the
+    queryset is replaced. Rows without the key are left out.
+    """
+
+    def __init__(self, queryset, key, per_page, descending=False):
+        super(Seek, self).__init__()
+        if per_page < 1:
+            raise QueryError(u'page size must be positive')
+
+        self.__queryset = queryset
+        self.__key = key
+        self.__per_page = per_page
+        self.__descending = descending
+
+    @property
+    def per_page(self):
+        return self.__per_page
+
+    def query(self, cursor=None):
+        """
+        Returns the queryset for the page after ``cursor``, one row longer than a page to tell whether more follow.
+        """
+        descending = self.__descending != bool(cursor and cursor.backwards)
+        node = self.__queryset.node
+        queryset = self.__queryset.filter(ops.comparison.is_not_null(node[self.__key]))
+        if cursor is not None:
+            queryset = queryset.filter(*seek(node, self.__key, cursor.value, cursor.node_id, descending))
+        return queryset.order_by(*ordering(node, self.__key, descending))[:self.__per_page + 1]
+
+    def cursor(self, node, backwards=False):
+        return Cursor(node.get(self.__key), node.id, backwards)
+
+    def page(self, cursor=None):
+        """
+        Returns ``(nodes, previous, following)``, where either cursor is None at the respective end of the result set.
+        """
+        nodes = list(self.query(cursor))
+        more = len(nodes) > self.__per_page
+        nodes = nodes[:self.__per_page]
+        backwards = bool(cursor and cursor.backwards)
+        if backwards:
+            nodes.reverse()
+
+        if not nodes:
+            return nodes, None, None
+
+        has_previous = more if backwards else cursor is not None
+        has_next = True if backwards else more
+        return (
+            nodes,
+            self.cursor(nodes[0], backwards=True) if has_previous else None,
+            self.cursor(nodes[-1]) if has_next else None,
+        )
+
+
+# DJANGO
+####################
+class KeysetPage(Page):
+    """
+    Page whose ``number`` is its cursor token; ``next_page_number()`` and ``previous_page_number()`` return tokens.
+
+    ``start_index()`` and ``end_index()`` count from the start of the page, not of the result set.
+    """
+
+    def __init__(self, object_list, number, paginator, previous, following):
+        super(KeysetPage, self).__init__(object_list, number, paginator)
+        self.__previous = previous
+        self.__next = following
+
+    def __repr__(self):
+        return u'<KeysetPage {}>'.format(self.number or u'first')
+
+    def has_next(self):
+        return self.__next is not None
+
+    def has_previous(self):
+        return self.__previous is not None
+
+    def next_page_number(self):
+        if self.__next is None:
+            raise EmptyPage(u'That page contains no results')
+        return self.__next.encode()
+
+    def previous_page_number(self):
+        if self.__previous is None:
+            raise EmptyPage(u'That page number is less than 1')
+        return self.__previous.encode()
+
+    def start_index(self):
+        """
+        1-based index of the first node within this page; keyset pages have no absolute position.
+        """
+        return 1 if self.object_list else 0
+
+    def end_index(self):
+        """
+        1-based index of the last node within this page.
+        """
+        return len(self.object_list)
+
+
+class KeysetPaginator(Paginator):
+    """
+    ``Paginator`` over a ``GraphQuerySet`` that accepts cursor tokens as page numbers.
+
+    ``None``, ``''`` and ``1`` select the first page. ``count`` and ``num_pages`` still work but cost a count query.
+    """
+
+    def __init__(self, object_list, per_page, key, descending=False, allow_empty_first_page=True):
+        super(KeysetPaginator, self).__init__(object_list, per_page, allow_empty_first_page=allow_empty_first_page)
+        self.seek = Seek(object_list, key, self.per_page, descending)
+
+    def validate_number(self, number):
+        if number in (None, u'', 1, u'1'):
+            return None
+
+        try:
+            return Cursor.decode(number)
+        except QueryError:
+            raise InvalidPage(u'That page cursor is not valid')
+
+    def page(self, number=None):
+        cursor = self.validate_number(number)
+        nodes, previous, following = self.seek.page(cursor)
+        if not nodes and (cursor is not None or not self.allow_empty_first_page):
+            raise EmptyPage(u'That page contains no results')
+
+        return KeysetPage(nodes, None if cursor is None else cursor.encode(), self, previous, following)
@@ -0,0 +1,72 @@
+# coding=utf-8
+"""
+Debug toolbar panel listing the Neo4j statements of the current request; add
+``'django_neo4j.panel.Neo4jPanel'`` to ``DEBUG_TOOLBAR_PANELS``.
+"""
+import threading
+
+from django.utils.html import format_html, format_html_join
+
+from django_neo4j.instrumentation import Collector, instrumentation
+
+try:
+    # noinspection PyUnresolvedReferences
+    from debug_toolbar.panels import Panel
+except ImportError:
+    Panel = object
+
+
+class _ThreadCollector(Collector):
+    def __init__(self):
+        super(_ThreadCollector, self).__init__()
+        self.__thread = threading.current_thread()
+
+    def __call__(self, event):
+        if threading.current_thread() is self.__thread:
+            super(_ThreadCollector, self).__call__(event)
+
+
+class Neo4jPanel(Panel):
+    title = u'Neo4j'
+    template = None
+
+    __collector = None
+
+    @property
+    def nav_subtitle(self):
+        stats = self.get_stats().get(u'shapes') or {}
+        return u'{} statements in {:.2f}ms'.format(
+            sum(shape[u'count'] for shape in stats.values()),
+            sum(shape[u'network_time'] for shape in stats.values()) * 1000,
+        )
+
+    def enable_instrumentation(self):
+        self.__collector = instrumentation.subscribe(_ThreadCollector())
+
+    def disable_instrumentation(self):
+        if self.__collector is not None:
+            instrumentation.unsubscribe(self.__collector)
+
+    def generate_stats(self, request, response):
+        self.record_stats({u'shapes': self.__collector.snapshot() if self.__collector is not None else {}})
+
+    @property
+    def content(self):
+        shapes = sorted((self.get_stats().get(u'shapes') or {}).values(), key=lambda shape: -shape[u'network_time'])
+        rows = format_html_join(u'', u'<tr><td><code>{}</code></td>' + u'<td>{}</td>' * 6 + u'</tr>', (
+            (
+                shape[u'statement'],
+                shape[u'count'],
+                u'{:.2f}'.format(shape[u'render_time'] * 1000),
+                u'{:.2f}'.format(shape[u'server_time'] * 1000),
+                u'{:.2f}'.format(shape[u'network_time'] * 1000),
+                shape[u'rows'],
+                shape[u'bytes'],
+            )
+            for shape in shapes
+        ))
+        return format_html(
+            u'<table><thead><tr><th>Statement</th><th>Count</th><th>Render (ms)</th><th>Server (ms)</th>'
+            u'<th>Network (ms)</th><th>Rows</th><th>Bytes</th></tr></thead><tbody>{}</tbody></table>',
+            rows,
+        )
@@ -0,0 +1,82 @@
+# coding=utf-8
+import threading
+
+
+class Parameters(object):
+    """
+    Binding context collecting literal values as Cypher parameters.
+
+    While a ``Parameters`` instance is active (``with Parameters() as params:``) operations render each literal as a
+    placeholder and record its value, so structurally identical queries produce identical Cypher text.
+    """
+
+    DOLLAR = u'${}'
+    BRACES = u'{{{}}}'
+
+    _INTERN_SIZE = 256
+
+    __local = threading.local()
+    __names = {}
+
+    def __init__(self, prefix=u'p', style=None):
+        super(Parameters, self).__init__()
+        self.__prefix = prefix
+        self.__style = style or self.DOLLAR
+        self.__values = {}
+        self.__previous = None
+        self.__bound = self.__interned(self.__prefix, self.__style)
+
+    @classmethod
+    def __interned(cls, prefix, style):
+        key = (prefix, style)
+        names = cls.__names.get(key)
+        if names is None:
+            names = tuple(
+                (u'{}{}'.format(prefix, index), style.format(u'{}{}'.format(prefix, index)))
+                for index in range(cls._INTERN_SIZE)
+            )
+            names = cls.__names.setdefault(key, names)
+
+        return names
+
+    @classmethod
+    def current(cls):
+        return getattr(cls.__local, u'current', None)
+
+    @property
+    def prefix(self):
+        return self.__prefix
+
+    @property
+    def style(self):
+        return self.__style
+
+    @property
+    def values(self):
+        return dict(self.__values)
+
+    def placeholder(self, name):
+        return self.__style.format(name)
+
+    def bind(self, value):
+        index = len(self.__values)
+        if index < self._INTERN_SIZE:
+            name, placeholder = self.__bound[index]
+        else:
+            name = u'{}{}'.format(self.__prefix, index)
+            placeholder = self.placeholder(name)
+
+        self.__values[name] = value
+        return placeholder
+
+    def __len__(self):
+        return len(self.__values)
+
+    def __enter__(self):
+        self.__previous = self.current()
+        self.__local.current = self
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.__local.current = self.__previous
+        self.__previous = None
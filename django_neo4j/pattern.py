@@ -1 +1,104 @@
 # coding=utf-8
+import re
+
+import six
+
+from django_neo4j.exception import QueryError
+from django_neo4j.expression import Expression, as_expression
+from django_neo4j.type import Identifier
+
+_NAME = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*$')
+
+
+def escape(name):
+    name = six.text_type(name)
+    return name if _NAME.match(name) else u'`{}`'.format(name.replace(u'`', u'``'))
+
+
+_PROPERTIES = {}
+_PROPERTIES_SIZE = 4096
+
+
+def property_of(variable, name):
+    """
+    Shared ``variable.name`` identifier.
+    """
+    key = (variable, name)
+    identifier = _PROPERTIES.get(key)
+    if identifier is None:
+        identifier = Identifier(u'{}.{}'.format(variable, escape(name)))
+        if len(_PROPERTIES) < _PROPERTIES_SIZE:
+            _PROPERTIES[key] = identifier
+
+    return identifier
+
+
+def _labels(labels):
+    if not labels:
+        return ()
+
+    if isinstance(labels, six.string_types):
+        return six.text_type(labels),
+
+    return tuple(six.text_type(label) for label in labels)
+
+
+def _properties(properties):
+    return tuple((six.text_type(key), as_expression(value)) for key, value in sorted((properties or {}).items()))
+
+
+def _property_tokens(properties):
+    if not properties:
+        return ()
+
+    tokens = [u' {']
+    for index, (key, value) in enumerate(properties):
+        tokens.append(u'{}{}: '.format(u', ' if index else u'', escape(key)))
+        tokens.append(value)
+    tokens.append(u'}')
+    return tuple(tokens)
+
+
+class Node(Expression):
+    """
+    Node pattern, e.g. ``(n:Person {name: $p0})``; property values are rendered as literals.
+    """
+
+    __slots__ = ('__variable', '__labels', '__properties')
+
+    def __init__(self, variable=None, labels=None, properties=None):
+        self.__variable = six.text_type(variable) if variable else None
+        self.__labels = _labels(labels)
+        self.__properties = _properties(properties)
+
+    @property
+    def variable(self):
+        return self.__variable
+
+    @property
+    def labels(self):
+        return self.__labels
+
+    @property
+    def properties(self):
+        return self.__properties
+
+    @property
+    def children(self):
+        return tuple(value for _, value in self.__properties)
+
+    def __getitem__(self, name):
+        if not self.__variable:
+            raise QueryError(u'node pattern without a variable has no properties')
+
+        return property_of(self.__variable, name)
+
+    def _tokens(self, parameters):
+        head = u'({}{}'.format(self.__variable or u'', u''.join(u':' + escape(label) for label in self.__labels))
+        return (head,) + _property_tokens(self.__properties) + (u')',)
+
+    def _key(self):
+        return self.__variable, self.__labels, self.__properties
+
+    def _shape(self):
+        return u'Node', self.__variable, self.__labels, tuple(key for key, _ in self.__properties)
@@ -0,0 +1,266 @@
+# coding=utf-8
+"""
+Parsing of ``EXPLAIN``/``PROFILE`` plans and detection of plan regressions per query shape.
+"""
+import hashlib
+import logging
+import random
+import threading
+
+import six
+
+from django_neo4j.connection import DEFAULT_ALIAS, connections
+from django_neo4j.exception import QueryError
+from django_neo4j.instrumentation import shape
+
+EXPLAIN = u'EXPLAIN'
+PROFILE = u'PROFILE'
+
+SCANS = frozenset((u'AllNodesScan', u'NodeByLabelScan'))
+
+NEW_SCAN = u'new scan'
+DB_HITS = u'db hits'
+CHANGED = u'changed'
+
+# operator arguments that identify what is read, as opposed to estimates and counters
+_IDENTIFYING = (u'LabelName', u'Index', u'KeyNames', u'ExpandExpression')
+_RESERVED = (u'operatorType', u'identifiers', u'children', u'EstimatedRows', u'DbHits', u'Rows')
+
+logger = logging.getLogger(__name__)
+
+
+class PlanOperator(object):
+    def __init__(
+        self,
+        operator_type,
+        identifiers=(),
+        estimated_rows=None,
+        db_hits=None,
+        rows=None,
+        arguments=None,
+        children=(),
+    ):
+        super(PlanOperator, self).__init__()
+        self.__operator_type = operator_type
+        self.__identifiers = tuple(identifiers)
+        self.__estimated_rows = estimated_rows
+        self.__db_hits = db_hits
+        self.__rows = rows
+        self.__arguments = arguments or {}
+        self.__children = tuple(children)
+
+    @property
+    def operator_type(self):
+        return self.__operator_type
+
+    @property
+    def identifiers(self):
+        return self.__identifiers
+
+    @property
+    def estimated_rows(self):
+        return self.__estimated_rows
+
+    @property
+    def db_hits(self):
+        return self.__db_hits
+
+    @property
+    def rows(self):
+        return self.__rows
+
+    @property
+    def arguments(self):
+        return self.__arguments
+
+    @property
+    def children(self):
+        return self.__children
+
+    def walk(self):
+        stack = [self]
+        while stack:
+            operator = stack.pop()
+            yield operator
+            stack.extend(reversed(operator.children))
+
+    def _key(self):
+        arguments = tuple(
+            (name, six.text_type(self.__arguments[name])) for name in _IDENTIFYING if name in self.__arguments
+        )
+        return (self.__operator_type, arguments, tuple(child._key() for child in self.__children))
+
+    def __repr__(self):
+        return u'<PlanOperator {}>'.format(self.__operator_type)
+
+
+class Plan(object):
+    def __init__(self, root, profiled=False):
+        super(Plan, self).__init__()
+        self.__root = root
+        self.__profiled = profiled
+
+    @property
+    def root(self):
+        return self.__root
+
+    @property
+    def profiled(self):
+        return self.__profiled
+
+    @property
+    def operators(self):
+        return list(self.__root.walk())
+
+    @property
+    def operator_types(self):
+        return frozenset(operator.operator_type for operator in self.__root.walk())
+
+    @property
+    def scans(self):
+        return self.operator_types & SCANS
+
+    @property
+    def db_hits(self):
+        if not self.__profiled:
+            return None
+
+        return sum(operator.db_hits or 0 for operator in self.__root.walk())
+
+    @property
+    def estimated_rows(self):
+        return self.__root.estimated_rows
+
+    @property
+    def fingerprint(self):
+        """
+        Hash of the operator tree and what each operator reads, ignoring estimates and counters.
+        """
+        return hashlib.sha1(repr(self.__root._key()).encode(u'utf-8')).hexdigest()
+
+
+def _operator(node):
+    return PlanOperator(
+        operator_type=node.get(u'operatorType'),
+        identifiers=node.get(u'identifiers') or (),
+        estimated_rows=node.get(u'EstimatedRows'),
+        db_hits=node.get(u'DbHits'),
+        rows=node.get(u'Rows'),
+        arguments=dict((key, value) for key, value in six.iteritems(node) if key not in _RESERVED),
+        children=[_operator(child) for child in node.get(u'children') or ()],
+    )
+
+
+def parse(plan):
+    """
+    Builds a ``Plan`` from the ``plan`` member of a transactional endpoint result (``{"root": {...}}``).
+    """
+    if not plan:
+        raise QueryError(u'result has no plan')
+
+    root = plan.get(u'root', plan)
+    return Plan(_operator(root), profiled=u'DbHits' in root)
+
+
+class Regression(object):
+    def __init__(self, shape, kind, message):
+        super(Regression, self).__init__()
+        self.__shape = shape
+        self.__kind = kind
+        self.__message = message
+
+    @property
+    def shape(self):
+        return self.__shape
+
+    @property
+    def kind(self):
+        return self.__kind
+
+    @property
+    def message(self):
+        return self.__message
+
+    def __repr__(self):
+        return u'<Regression {} {}: {}>'.format(self.__shape, self.__kind, self.__message)
+
+
+class PlanMonitor(object):
+    """
+    Samples query executions, captures their plans and compares each against the first plan seen for the shape.
+
+    In ``PROFILE`` mode a sampled statement runs once with the ``PROFILE`` prefix and its rows are returned as usual;
+    in ``EXPLAIN`` mode the plan is fetched with an extra request that does not execute the statement.
+    """
+
+    def __init__(self, sample_rate=0.01, mode=PROFILE, db_hits_growth=0.5, store=None, sample=random.random):
+        super(PlanMonitor, self).__init__()
+        if mode not in (EXPLAIN, PROFILE):
+            raise QueryError(u'unknown plan mode {}'.format(mode))
+
+        self.__sample_rate = sample_rate
+        self.__mode = mode
+        self.__db_hits_growth = db_hits_growth
+        self.__baselines = {} if store is None else store
+        self.__sample = sample
+        self.__regressions = []
+        self.__lock = threading.Lock()
+
+    @property
+    def baselines(self):
+        return self.__baselines
+
+    @property
+    def regressions(self):
+        return list(self.__regressions)
+
+    def compare(self, statement, plan):
+        """
+        Returns the regressions of ``plan`` against the baseline for the statement's shape, storing it as the
+        baseline when there is none.
+        """
+        key = shape(statement)
+        with self.__lock:
+            baseline = self.__baselines.get(key)
+            if baseline is None:
+                self.__baselines[key] = plan
+                return []
+
+        regressions = []
+        for scan in sorted(plan.scans - baseline.scans):
+            regressions.append(Regression(key, NEW_SCAN, u'plan now uses {}'.format(scan)))
+
+        if baseline.db_hits and plan.db_hits is not None:
+            if plan.db_hits > baseline.db_hits * (1 + self.__db_hits_growth):
+                regressions.append(Regression(
+                    key, DB_HITS, u'db hits grew from {} to {}'.format(baseline.db_hits, plan.db_hits),
+                ))
+
+        if plan.fingerprint != baseline.fingerprint and not regressions:
+            regressions.append(Regression(key, CHANGED, u'plan changed'))
+
+        for regression in regressions:
+            logger.warning(u'plan regression for %s (%s): %s', key, regression.kind, statement)
+        with self.__lock:
+            self.__regressions.extend(regressions)
+
+        return regressions
+
+    def execute(self, statement, parameters=None, using=DEFAULT_ALIAS, connection=None):
+        """
+        Executes the statement (or query), capturing and comparing its plan for a sample of calls.
+        """
+        if hasattr(statement, u'build'):
+            statement, parameters = statement.build()
+
+        connection = connection or connections[using]
+        if self.__sample() >= self.__sample_rate:
+            return connection.execute(statement, parameters)
+
+        if self.__mode == EXPLAIN:
+            self.compare(statement, parse(connection.execute(u'EXPLAIN ' + statement, parameters).get(u'plan')))
+            return connection.execute(statement, parameters)
+
+        result = connection.execute(u'PROFILE ' + statement, parameters)
+        self.compare(statement, parse(result.get(u'plan')))
+        return result
@@ -1 +1,378 @@
 # coding=utf-8
+import warnings
+
+import six
+
+from django_neo4j.exception import FanOutWarning, QueryError
+from django_neo4j.expression import Expression, Literal, OperationExpression, as_expression
+from django_neo4j.pattern import Node, _properties, _property_tokens, escape, property_of
+from django_neo4j.type import Identifier
+
+OUTGOING = u'outgoing'
+INCOMING = u'incoming'
+BOTH = u'both'
+
+MAX_HOPS = 5
+FAN_OUT_LIMIT = 10 ** 6
+
+_ARROWS = {
+    OUTGOING: (u'-', u'->'),
+    INCOMING: (u'<-', u'-'),
+    BOTH: (u'-', u'-'),
+}
+
+
+def _rename(expression, old, new):
+    if isinstance(expression, Identifier):
+        name = expression.name
+        if name == old or name.startswith(old + u'.'):
+            return Identifier(new + name[len(old):])
+        return expression
+
+    if isinstance(expression, OperationExpression):
+        return OperationExpression(expression.operation, *[_rename(o, old, new) for o in expression.operands])
+
+    return expression
+
+
+class _All(Expression):
+    __slots__ = ('__variable', '__collection', '__predicate')
+
+    def __init__(self, variable, collection, predicate):
+        self.__variable = variable
+        self.__collection = as_expression(collection)
+        self.__predicate = as_expression(predicate)
+
+    @property
+    def children(self):
+        return self.__collection, self.__predicate
+
+    def _tokens(self, parameters):
+        return u'ALL({} IN '.format(self.__variable), self.__collection, u' WHERE ', self.__predicate, u')'
+
+    def _key(self):
+        return self.__variable, self.__collection, self.__predicate
+
+    def _shape(self):
+        return u'All', self.__variable
+
+
+class Statistics(object):
+    """
+    Average relationship degree per type, used to estimate traversal fan-out.
+    """
+
+    def __init__(self, default_degree=10):
+        super(Statistics, self).__init__()
+        self.__default_degree = default_degree
+        self.__degrees = {}
+
+    def update(self, type_name, degree):
+        self.__degrees[type_name] = degree
+
+    def degree(self, types):
+        if not types:
+            return self.__default_degree
+
+        return sum(self.__degrees.get(type_name, self.__default_degree) for type_name in types)
+
+
+statistics = Statistics()
+
+
+class Relationship(Expression):
+    """
+    Relationship pattern such as ``-[r:KNOWS*1..3 {since: $p0}]->``.
+
+    ``hops`` is an exact count or a ``(min, max)`` pair; a missing upper bound defaults to ``MAX_HOPS`` unless
+    ``unbounded`` is set explicitly.
+    """
+
+    __slots__ = ('__variable', '__types', '__direction', '__properties', '__hops', '__predicates')
+
+    def __init__(
+        self,
+        variable=None,
+        types=None,
+        direction=BOTH,
+        properties=None,
+        hops=None,
+        unbounded=False,
+        predicates=(),
+    ):
+        if direction not in _ARROWS:
+            raise QueryError(u'unknown relationship direction {}'.format(direction))
+
+        if hops is not None and not isinstance(hops, tuple):
+            hops = (hops, hops)
+        if hops is not None:
+            low, high = hops
+            if high is None and not unbounded:
+                high = MAX_HOPS
+            if low is not None and (low < 0 or (high is not None and high < low)):
+                raise QueryError(u'invalid relationship hops {}'.format(hops))
+            hops = (low, high)
+        elif unbounded:
+            hops = (None, None)
+
+        self.__variable = six.text_type(variable) if variable else None
+        self.__types = (types,) if isinstance(types, six.string_types) else tuple(types or ())
+        self.__direction = direction
+        self.__properties = _properties(properties)
+        self.__hops = hops
+        self.__predicates = tuple(predicates)
+
+    @property
+    def variable(self):
+        return self.__variable
+
+    @property
+    def types(self):
+        return self.__types
+
+    @property
+    def direction(self):
+        return self.__direction
+
+    @property
+    def properties(self):
+        return self.__properties
+
+    @property
+    def hops(self):
+        return self.__hops
+
+    @property
+    def is_variable_length(self):
+        return self.__hops is not None and self.__hops != (1, 1)
+
+    @property
+    def max_hops(self):
+        if self.__hops is None:
+            return 1
+
+        return self.__hops[1]
+
+    @property
+    def children(self):
+        return tuple(value for _, value in self.__properties)
+
+    def __getitem__(self, name):
+        if not self.__variable:
+            raise QueryError(u'relationship pattern without a variable has no properties')
+
+        return property_of(self.__variable, name)
+
+    def where(self, *predicates):
+        """
+        Equality against a literal on a property of this relationship moves into the pattern's property map; other
+        predicates are kept for the enclosing WHERE, quantified over every hop of a variable-length pattern.
+        """
+        if not self.__variable:
+            raise QueryError(u'relationship predicates need a relationship variable')
+
+        properties = dict((key, value) for key, value in self.__properties)
+        kept = list(self.__predicates)
+        prefix = self.__variable + u'.'
+        for predicate in predicates:
+            if isinstance(predicate, OperationExpression) and predicate.operation.name == u'equal to':
+                a, b = predicate.operands
+                if isinstance(b, Identifier) and not isinstance(a, Identifier):
+                    a, b = b, a
+                if isinstance(a, Identifier) and a.name.startswith(prefix) and isinstance(b, Literal):
+                    properties[a.name[len(prefix):]] = b
+                    continue
+            kept.append(predicate)
+
+        relationship = Relationship.__new__(Relationship)
+        relationship.__variable = self.__variable
+        relationship.__types = self.__types
+        relationship.__direction = self.__direction
+        relationship.__properties = _properties(properties)
+        relationship.__hops = self.__hops
+        relationship.__predicates = tuple(kept)
+        return relationship
+
+    @property
+    def predicates(self):
+        if not self.is_variable_length:
+            return self.__predicates
+
+        item = u'_{}'.format(self.__variable)
+        return tuple(
+            _All(item, Identifier(self.__variable), _rename(predicate, self.__variable, item))
+            for predicate in self.__predicates
+        )
+
+    def _tokens(self, parameters):
+        left, right = _ARROWS[self.__direction]
+        head = []
+        if self.__variable:
+            head.append(self.__variable)
+        if self.__types:
+            head.append(u':' + u'|'.join(escape(type_name) for type_name in self.__types))
+        if self.__hops is not None:
+            low, high = self.__hops
+            if low == high:
+                head.append(u'*{}'.format(low))
+            else:
+                head.append(u'*{}..{}'.format(u'' if low is None else low, u'' if high is None else high))
+
+        if not head and not self.__properties:
+            return left, right
+
+        return (u'{}[{}'.format(left, u''.join(head)),) + _property_tokens(self.__properties) + (u']' + right,)
+
+    def _key(self):
+        return self.__variable, self.__types, self.__direction, self.__properties, self.__hops, self.__predicates
+
+    def _shape(self):
+        return (
+            u'Relationship',
+            self.__variable,
+            self.__types,
+            self.__direction,
+            tuple(key for key, _ in self.__properties),
+            self.__hops,
+        )
+
+
+class Path(Expression):
+    """
+    Alternating node and relationship patterns, built fluently from a start node.
+    """
+
+    __slots__ = ('__elements', '__variable')
+
+    def __init__(self, start, variable=None):
+        self.__elements = (as_expression(start),)
+        self.__variable = six.text_type(variable) if variable else None
+
+    @classmethod
+    def __extended(cls, path, relationship, end):
+        if not isinstance(end, Node):
+            raise QueryError(u'path elements must alternate between nodes and relationships')
+
+        extended = Path.__new__(Path)
+        extended.__elements = path.__elements + (relationship, end)
+        extended.__variable = path.__variable
+        return extended
+
+    def outgoing(self, end, types=None, **kwargs):
+        return self.__extended(self, Relationship(types=types, direction=OUTGOING, **kwargs), end)
+
+    def incoming(self, end, types=None, **kwargs):
+        return self.__extended(self, Relationship(types=types, direction=INCOMING, **kwargs), end)
+
+    def both(self, end, types=None, **kwargs):
+        return self.__extended(self, Relationship(types=types, direction=BOTH, **kwargs), end)
+
+    def via(self, relationship, end):
+        return self.__extended(self, relationship, end)
+
+    @property
+    def variable(self):
+        return self.__variable
+
+    @property
+    def elements(self):
+        return self.__elements
+
+    @property
+    def relationships(self):
+        return self.__elements[1::2]
+
+    @property
+    def predicates(self):
+        return tuple(predicate for relationship in self.relationships for predicate in relationship.predicates)
+
+    @property
+    def children(self):
+        return self.__elements
+
+    def estimate(self, statistics=statistics):
+        """
+        Rough upper bound of the rows expanded from one start node; infinite for unbounded patterns.
+        """
+        rows = 1
+        for relationship in self.relationships:
+            if relationship.max_hops is None:
+                return float(u'inf')
+            degree = statistics.degree(relationship.types)
+            rows *= sum(degree ** hop for hop in range(1, relationship.max_hops + 1)) if relationship.hops else degree
+
+        return rows
+
+    def check(self, limit=None, statistics=statistics):
+        limit = FAN_OUT_LIMIT if limit is None else limit
+        estimate = self.estimate(statistics)
+        if estimate > limit:
+            warnings.warn(
+                FanOutWarning(u'pattern {!r} may expand to ~{:.3g} rows per start node'.format(self, estimate)),
+                stacklevel=2,
+            )
+
+        return estimate
+
+    def _tokens(self, parameters):
+        if self.__variable:
+            return (u'{} = '.format(self.__variable),) + self.__elements
+
+        return self.__elements
+
+    def _key(self):
+        return self.__elements, self.__variable
+
+    def _shape(self):
+        return u'Path', self.__variable, len(self.__elements)
+
+
+class ShortestPath(Expression):
+    __slots__ = ('__path', '__variable', '__all')
+
+    def __init__(self, path, variable=None, all=False):
+        if len(path.relationships) != 1:
+            raise QueryError(u'shortest path patterns must contain exactly one relationship')
+        if path.relationships[0].max_hops is None:
+            raise QueryError(u'shortest path patterns require an upper bound on hops')
+
+        self.__path = path
+        self.__variable = six.text_type(variable) if variable else None
+        self.__all = bool(all)
+
+    @property
+    def path(self):
+        return self.__path
+
+    @property
+    def predicates(self):
+        return self.__path.predicates
+
+    @property
+    def children(self):
+        return self.__path,
+
+    def estimate(self, statistics=statistics):
+        return self.__path.estimate(statistics)
+
+    def check(self, limit=None, statistics=statistics):
+        return self.__path.check(limit, statistics)
+
+    def _tokens(self, parameters):
+        function = u'allShortestPaths(' if self.__all else u'shortestPath('
+        prefix = u'{} = '.format(self.__variable) if self.__variable else u''
+        return prefix + function, self.__path, u')'
+
+    def _key(self):
+        return self.__path, self.__variable, self.__all
+
+    def _shape(self):
+        return u'ShortestPath', self.__variable, self.__all
+
+
+def shortest_path(path, variable=None):
+    return ShortestPath(path, variable)
+
+
+def all_shortest_paths(path, variable=None):
+    return ShortestPath(path, variable, all=True)
@@ -0,0 +1,266 @@
+# coding=utf-8
+import codecs
+import json
+
+import six
+
+from django_neo4j.exception import CypherError, TransportError
+from django_neo4j.type import NULL
+
+_WHITESPACE = u' \t\n\r'
+_COMPACT_SIZE = 1 << 16
+
+_TOP, _RESULTS, _RESULT, _DATA, _DATUM = range(5)
+_ARRAY_ELEMENTS = {_RESULTS: _RESULT, _DATA: _DATUM}
+
+NEED_DATA = object()
+END = object()
+
+
+def to_python(value):
+    if value is None:
+        return NULL
+
+    if isinstance(value, list):
+        return [to_python(item) for item in value]
+
+    if isinstance(value, dict):
+        return dict((key, to_python(item)) for key, item in six.iteritems(value))
+
+    return value
+
+
+class _Starved(Exception):
+    pass
+
+
+class _Scanner(object):
+    """
+    Scanner over JSON text fed in chunks; raises ``_Starved`` when a token extends past the data received so far.
+    """
+
+    def __init__(self):
+        super(_Scanner, self).__init__()
+        self.__decoder = codecs.getincrementaldecoder(u'utf-8')()
+        self.__json = json.JSONDecoder()
+        self.__buffer = u''
+        self.position = 0
+        self.closed = False
+
+    def feed(self, chunk):
+        if self.position > _COMPACT_SIZE:
+            self.__buffer = self.__buffer[self.position:]
+            self.position = 0
+
+        self.__buffer += self.__decoder.decode(chunk) if isinstance(chunk, bytes) else chunk
+
+    def close(self):
+        self.__buffer += self.__decoder.decode(b'', True)
+        self.closed = True
+
+    def __starved(self):
+        if self.closed:
+            raise TransportError(u'unexpected end of result stream')
+        raise _Starved
+
+    def peek(self):
+        buffer, position = self.__buffer, self.position
+        while position < len(buffer) and buffer[position] in _WHITESPACE:
+            position += 1
+        self.position = position
+        if position == len(buffer):
+            self.__starved()
+        return buffer[position]
+
+    def expect(self, character):
+        if self.peek() != character:
+            raise TransportError(u'expected {!r} in result stream at {!r}'.format(character, self.peek()))
+        self.position += 1
+
+    def accept(self, character):
+        if self.peek() == character:
+            self.position += 1
+            return True
+        return False
+
+    def value(self):
+        self.peek()
+        try:
+            value, end = self.__json.raw_decode(self.__buffer, self.position)
+        except ValueError:
+            if self.closed:
+                raise TransportError(u'malformed result stream')
+            raise _Starved
+
+        if end == len(self.__buffer) and not self.closed:
+            # a number or literal may continue in the next chunk
+            raise _Starved
+
+        self.position = end
+        return value
+
+
+class ResultDecoder(object):
+    """
+    Push decoder for transactional endpoint responses.
+
+    ``feed()`` chunks as they arrive and call ``read()`` until it returns ``NEED_DATA`` (feed more, or ``close()`` at
+    the end of the body) or ``END``; any other return value is the next ``results[].data[].row``. Each step either
+    completes or is rolled back, so rows are produced as soon as their last byte is received.
+    """
+
+    def __init__(self, typed=False, converters=None):
+        super(ResultDecoder, self).__init__()
+        self.__scanner = _Scanner()
+        self.__typed = typed
+        self.__converters = converters or {}
+        self.__stack = []
+        self.__started = False
+        self.__index = -1
+        self.__columns = ()
+        self.__errors = []
+
+    @property
+    def index(self):
+        return self.__index
+
+    @property
+    def columns(self):
+        return self.__columns
+
+    @property
+    def errors(self):
+        return self.__errors
+
+    def feed(self, chunk):
+        self.__scanner.feed(chunk)
+
+    def close(self):
+        self.__scanner.close()
+
+    def __convert(self, row):
+        if self.__typed:
+            row = to_python(row)
+
+        if self.__converters:
+            row = list(row)
+            for position, column in enumerate(self.__columns):
+                converter = self.__converters.get(column)
+                if converter is not None and row[position] is not None and row[position] is not NULL:
+                    row[position] = converter(row[position])
+
+        return row
+
+    def __step(self):
+        scanner = self.__scanner
+        if not self.__stack:
+            if self.__started:
+                return END
+            scanner.expect(u'{')
+            self.__started = True
+            self.__stack.append([_TOP, True])
+            return None
+
+        frame = self.__stack[-1]
+        kind, first = frame
+
+        if kind in _ARRAY_ELEMENTS:
+            if scanner.accept(u']'):
+                self.__stack.pop()
+                return None
+            if not first:
+                scanner.expect(u',')
+            scanner.expect(u'{')
+            frame[1] = False
+            if kind == _RESULTS:
+                self.__index += 1
+                self.__columns = ()
+            self.__stack.append([_ARRAY_ELEMENTS[kind], True])
+            return None
+
+        if scanner.accept(u'}'):
+            self.__stack.pop()
+            return None
+        if not first:
+            scanner.expect(u',')
+        key = scanner.value()
+        scanner.expect(u':')
+
+        row = None
+        if (kind, key) in ((_TOP, u'results'), (_RESULT, u'data')):
+            scanner.expect(u'[')
+            frame[1] = False
+            self.__stack.append([_RESULTS if kind == _TOP else _DATA, True])
+            return None
+        elif (kind, key) == (_TOP, u'errors'):
+            self.__errors = scanner.value()
+        elif (kind, key) == (_RESULT, u'columns'):
+            self.__columns = tuple(scanner.value())
+        elif (kind, key) == (_DATUM, u'row'):
+            row = self.__convert(scanner.value())
+        else:
+            scanner.value()
+
+        frame[1] = False
+        return row
+
+    def read(self):
+        while True:
+            position = self.__scanner.position
+            try:
+                item = self.__step()
+            except _Starved:
+                self.__scanner.position = position
+                return NEED_DATA
+
+            if item is not None:
+                return item
+
+    def raise_errors(self):
+        for error in self.__errors:
+            raise CypherError(error.get(u'code'), error.get(u'message'))
+
+
+class ResultReader(object):
+    """
+    Incrementally decodes a transactional endpoint response from an iterable of chunks, yielding each
+    ``results[].data[].row`` as it arrives.
+
+    With ``typed`` set, JSON nulls are returned as ``NULL``; ``converters`` maps column names to conversion callables.
+    """
+
+    def __init__(self, chunks, typed=False, converters=None):
+        super(ResultReader, self).__init__()
+        self.__chunks = iter(chunks)
+        self.__decoder = ResultDecoder(typed=typed, converters=converters)
+
+    @property
+    def index(self):
+        return self.__decoder.index
+
+    @property
+    def columns(self):
+        return self.__decoder.columns
+
+    @property
+    def errors(self):
+        return self.__decoder.errors
+
+    def __iter__(self):
+        decoder = self.__decoder
+        while True:
+            item = decoder.read()
+            if item is END:
+                break
+            if item is NEED_DATA:
+                chunk = next(self.__chunks, None)
+                if chunk is None:
+                    decoder.close()
+                else:
+                    decoder.feed(chunk)
+                continue
+            yield item
+
+        for _ in self.__chunks:
+            pass
+        decoder.raise_errors()
@@ -0,0 +1,202 @@
+# coding=utf-8
+"""
+Compact containers for large results: rows share one column header instead of carrying their own keys, and are only
+turned into dicts on request.
+"""
+import array
+
+import six
+
+from django_neo4j.exception import QueryError
+
+_TYPECODES = {float: u'd'}
+for _type in six.integer_types:
+    _TYPECODES[_type] = u'l'
+
+
+class Row(tuple):
+    """
+    Tuple of column values, also indexable by column name.
+    """
+
+    __slots__ = ()
+
+    _columns = ()
+    _positions = {}
+
+    @property
+    def columns(self):
+        return self._columns
+
+    def __getitem__(self, key):
+        if isinstance(key, six.string_types):
+            try:
+                key = self._positions[key]
+            except KeyError:
+                raise QueryError(u'no column {} in {}'.format(key, list(self._columns)))
+
+        return tuple.__getitem__(self, key)
+
+    def get(self, key, default=None):
+        position = self._positions.get(key)
+        return default if position is None else tuple.__getitem__(self, position)
+
+    def as_dict(self):
+        return dict(zip(self._columns, self))
+
+    def __repr__(self):
+        return u'Row({})'.format(u', '.join(u'{}={!r}'.format(*item) for item in zip(self._columns, self)))
+
+
+def row_type(columns):
+    columns = tuple(columns)
+    return type(str(u'Row'), (Row,), {
+        u'__slots__': (),
+        u'_columns': columns,
+        u'_positions': dict((column, position) for position, column in enumerate(columns)),
+    })
+
+
+class RowSet(object):
+    """
+    List of ``Row`` tuples sharing one row type.
+    """
+
+    def __init__(self, columns=()):
+        super(RowSet, self).__init__()
+        self.__type = row_type(columns)
+        self.__rows = []
+
+    @property
+    def columns(self):
+        return self.__type._columns
+
+    def append(self, values):
+        self.__rows.append(self.__type(values))
+
+    def extend(self, rows):
+        for values in rows:
+            self.append(values)
+
+    def dicts(self):
+        for row in self.__rows:
+            yield row.as_dict()
+
+    def __getitem__(self, index):
+        return self.__rows[index]
+
+    def __iter__(self):
+        return iter(self.__rows)
+
+    def __len__(self):
+        return len(self.__rows)
+
+
+class _Column(object):
+    """
+    Values of one column, held in an ``array`` while they are all ints or all floats and in a list otherwise.
+    """
+
+    __slots__ = ('values', 'typecode')
+
+    def __init__(self):
+        self.values = None
+        self.typecode = None
+
+    def append(self, value):
+        values = self.values
+        if values is None:
+            self.typecode = _TYPECODES.get(type(value))
+            self.values = array.array(str(self.typecode), ()) if self.typecode else []
+            values = self.values
+
+        if self.typecode is not None:
+            if _TYPECODES.get(type(value)) == self.typecode:
+                try:
+                    values.append(value)
+                    return
+                except OverflowError:
+                    pass
+            self.values = values = values.tolist()
+            self.typecode = None
+
+        values.append(value)
+
+
+class ColumnSet(object):
+    """
+    Column-oriented result: each column is one buffer; rows are assembled only when accessed.
+    """
+
+    def __init__(self, columns=()):
+        super(ColumnSet, self).__init__()
+        self.__type = row_type(columns)
+        self.__columns = [_Column() for _ in self.__type._columns]
+        self.__size = 0
+
+    @property
+    def columns(self):
+        return self.__type._columns
+
+    def append(self, values):
+        if len(values) != len(self.__columns):
+            raise QueryError(u'row has {} values for {} columns'.format(len(values), len(self.__columns)))
+
+        for column, value in zip(self.__columns, values):
+            column.append(value)
+        self.__size += 1
+
+    def extend(self, rows):
+        for values in rows:
+            self.append(values)
+
+    def column(self, name):
+        """
+        Returns the buffer holding a column: an ``array.array`` for numeric columns, else a list.
+        """
+        try:
+            values = self.__columns[self.__type._positions[name]].values
+        except KeyError:
+            raise QueryError(u'no column {} in {}'.format(name, list(self.columns)))
+
+        return [] if values is None else values
+
+    def to_numpy(self):
+        """
+        Returns a dict of column name to NumPy array; numeric columns are wrapped without copying.
+        """
+        try:
+            # noinspection PyUnresolvedReferences
+            import numpy
+        except ImportError:
+            raise QueryError(u'numpy is not installed')
+
+        arrays = {}
+        for name, column in zip(self.columns, self.__columns):
+            if column.typecode is not None:
+                arrays[name] = numpy.frombuffer(column.values, dtype=column.values.typecode)
+            else:
+                arrays[name] = numpy.array(column.values or [], dtype=object)
+
+        return arrays
+
+    def dicts(self):
+        for row in self:
+            yield row.as_dict()
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self.__size
+        if not 0 <= index < self.__size:
+            raise IndexError(u'row index out of range')
+
+        return self.__type(column.values[index] for column in self.__columns)
+
+    def __iter__(self):
+        if not self.__columns:
+            return iter(())
+
+        return six.moves.map(self.__type, six.moves.zip(*[column.values or () for column in self.__columns]))
+
+    def __len__(self):
+        return self.__size
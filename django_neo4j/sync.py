@@ -0,0 +1,417 @@
+# coding=utf-8
+"""
+Mirrors Django model changes into Neo4j.
+
+Saves, deletes and many-to-many changes are collected per thread, coalesced per object and written when the database
+transaction commits, as a single request of ``UNWIND`` statements per flush.
+"""
+import collections
+import contextlib
+import logging
+import threading
+
+import six
+from six.moves import queue
+
+from django_neo4j.connection import DEFAULT_ALIAS, connections
+from django_neo4j.exception import DjangoNeo4jError
+from django_neo4j.pattern import escape
+from django_neo4j.util import model_row, to_value
+
+logger = logging.getLogger(__name__)
+
+KEY = u'id'
+
+
+class _Hooks(object):
+    """
+    Transaction events of one database connection. Django's ``on_commit`` (1.9+, absent in 1.8) cannot tell when a
+    savepoint is released, so the connection's commit, rollback and savepoint methods are wrapped instead.
+
+    Listeners run after the outermost ``atomic`` commits and are dropped when it rolls back or the connection closes
+    mid-transaction.
+    """
+
+    def __init__(self, connection):
+        super(_Hooks, self).__init__()
+        self.connection = connection
+        self.listeners = []
+        commit, rollback, close = connection.commit, connection.rollback, connection.close
+        savepoint_commit, savepoint_rollback = connection.savepoint_commit, connection.savepoint_rollback
+
+        def committed():
+            commit()
+            if not connection.in_atomic_block:
+                listeners, self.listeners = self.listeners, []
+                for listener in listeners:
+                    listener.commit()
+
+        def discarded(method):
+            def wrapper():
+                self.listeners = []
+                method()
+            return wrapper
+
+        def released(sid):
+            savepoint_commit(sid)
+            for listener in self.listeners:
+                listener.release(sid, self.savepoint)
+
+        def rolled_back(sid):
+            savepoint_rollback(sid)
+            for listener in self.listeners:
+                listener.rollback(sid)
+
+        connection.commit = committed
+        connection.rollback = discarded(rollback)
+        connection.close = discarded(close)
+        connection.savepoint_commit = released
+        connection.savepoint_rollback = rolled_back
+
+    @classmethod
+    def of(cls, connection):
+        hooks = getattr(connection, u'_neo4j_hooks', None)
+        if hooks is None:
+            hooks = connection._neo4j_hooks = cls(connection)
+        return hooks
+
+    @property
+    def savepoint(self):
+        savepoints = self.connection.savepoint_ids
+        return savepoints[-1] if savepoints else None
+
+
+class _Transaction(object):
+    """
+    Changes of one database transaction, kept per savepoint: a released savepoint's changes move to its parent and a
+    rolled back savepoint's are dropped.
+    """
+
+    def __init__(self, flush):
+        super(_Transaction, self).__init__()
+        self.flush = flush
+        self.levels = [(None, Changes())]
+
+    def changes(self, savepoint):
+        if self.levels[-1][0] != savepoint:
+            self.levels.append((savepoint, Changes()))
+        return self.levels[-1][1]
+
+    def release(self, sid, parent):
+        if self.levels[-1][0] == sid and len(self.levels) > 1:
+            _, changes = self.levels.pop()
+            self.changes(parent).merge(changes)
+
+    def rollback(self, sid):
+        if self.levels[-1][0] == sid and len(self.levels) > 1:
+            self.levels.pop()
+
+    def commit(self):
+        changes = self.levels[0][1]
+        for _, nested in self.levels[1:]:
+            changes.merge(nested)
+        self.flush(changes)
+
+
+class _Registration(object):
+    def __init__(self, model, label, fields):
+        super(_Registration, self).__init__()
+        self.model = model
+        self.label = label
+        self.fields = fields
+
+    def row(self, instance):
+        row = model_row(instance, self.fields)
+        row[KEY] = to_value(instance.pk)
+        return row
+
+
+class _Relation(object):
+    def __init__(self, source, target, type_name):
+        super(_Relation, self).__init__()
+        self.source = source
+        self.target = target
+        self.type_name = type_name
+
+
+class Changes(object):
+    """
+    Pending changes, coalesced so that each object is written at most once per flush.
+    """
+
+    def __init__(self):
+        super(Changes, self).__init__()
+        self.upserts = collections.OrderedDict()
+        self.deletes = collections.OrderedDict()
+        self.links = collections.OrderedDict()
+        self.clears = collections.OrderedDict()
+
+    def __len__(self):
+        return len(self.upserts) + len(self.deletes) + len(self.links) + len(self.clears)
+
+    def save(self, label, row):
+        self.deletes.pop((label, row[KEY]), None)
+        self.upserts[label, row[KEY]] = row
+
+    def delete(self, label, key):
+        self.upserts.pop((label, key), None)
+        self.deletes[label, key] = key
+
+    def link(self, relation, source, target, add):
+        self.links[relation, source, target] = add
+
+    def merge(self, other):
+        """
+        Applies the changes of ``other``, recorded after this set's, on top of it.
+        """
+        for (label, _), row in six.iteritems(other.upserts):
+            self.save(label, row)
+        for label, key in other.deletes:
+            self.delete(label, key)
+        for (relation, key, outgoing) in other.clears:
+            self.clear(relation, key, outgoing)
+        for (relation, source, target), add in six.iteritems(other.links):
+            self.link(relation, source, target, add)
+
+    def clear(self, relation, key, outgoing):
+        for link in [link for link in self.links if link[0] is relation and link[1 if outgoing else 2] == key]:
+            del self.links[link]
+        self.clears[relation, key, outgoing] = key
+
+
+class Synchronizer(object):
+    """
+    Registers models whose changes are written to Neo4j.
+
+    ``register`` takes the label from an inner ``Neo4jMeta`` (as ``Schema.register`` does) or the class name, and
+    ``fields`` limits the copied properties. Nodes are keyed on an ``id`` property holding the primary key.
+    Many-to-many fields of registered models become relationships typed after the field name, in upper case.
+
+    With ``background`` set, flushes are handed to a worker thread through a queue of ``queue_size`` entries; a full
+    queue blocks the committing thread.
+    """
+
+    def __init__(self, using=DEFAULT_ALIAS, execute=None, database=None, background=False, queue_size=100):
+        super(Synchronizer, self).__init__()
+        self.__using = using
+        self.__execute = execute
+        self.__database = database
+        self.__models = {}
+        self.__relations = {}
+        self.__local = threading.local()
+        self.__connected = False
+        self.__queue = None
+        self.__worker = None
+        if background:
+            self.__queue = queue.Queue(queue_size)
+            self.__worker = threading.Thread(target=self.__work, name=u'django_neo4j.sync')
+            self.__worker.daemon = True
+            self.__worker.start()
+
+    def register(self, model, label=None, fields=None):
+        meta = getattr(model, u'Neo4jMeta', None)
+        label = label or getattr(meta, u'label', None) or model.__name__
+        fields = fields if fields is not None else getattr(meta, u'fields', None)
+        self.__models[model] = _Registration(model, label, None if fields is None else frozenset(fields))
+
+        for field in model._meta.many_to_many:
+            through = field.rel.through
+            self.__relations[through] = _Relation(model, field.rel.to, field.name.upper())
+
+        return model
+
+    def label(self, model):
+        registration = self.__models.get(model)
+        return registration.label if registration is not None else model.__name__
+
+    # SIGNALS
+    ####################
+    def connect(self):
+        from django.db.models import signals
+
+        if not self.__connected:
+            uid = u'django_neo4j.sync.{}'.format(id(self))
+            signals.post_save.connect(self.__saved, dispatch_uid=uid + u'.save', weak=False)
+            signals.post_delete.connect(self.__deleted, dispatch_uid=uid + u'.delete', weak=False)
+            signals.m2m_changed.connect(self.__m2m_changed, dispatch_uid=uid + u'.m2m', weak=False)
+            self.__connected = True
+
+        return self
+
+    def disconnect(self):
+        from django.db.models import signals
+
+        uid = u'django_neo4j.sync.{}'.format(id(self))
+        signals.post_save.disconnect(dispatch_uid=uid + u'.save')
+        signals.post_delete.disconnect(dispatch_uid=uid + u'.delete')
+        signals.m2m_changed.disconnect(dispatch_uid=uid + u'.m2m')
+        self.__connected = False
+
+    def __saved(self, sender, instance, raw=False, **kwargs):
+        registration = self.__models.get(sender)
+        if registration is not None and not raw:
+            self.__changes().save(registration.label, registration.row(instance))
+            self.__settle()
+
+    def __deleted(self, sender, instance, **kwargs):
+        registration = self.__models.get(sender)
+        if registration is not None:
+            self.__changes().delete(registration.label, to_value(instance.pk))
+            self.__settle()
+
+    def __m2m_changed(self, sender, instance, action, reverse, pk_set, **kwargs):
+        relation = self.__relations.get(sender)
+        if relation is None or action not in (u'post_add', u'post_remove', u'post_clear'):
+            return
+
+        changes = self.__changes()
+        key = to_value(instance.pk)
+        if action == u'post_clear':
+            changes.clear(relation, key, outgoing=not reverse)
+        else:
+            for other in pk_set or ():
+                other = to_value(other)
+                source, target = (other, key) if reverse else (key, other)
+                changes.link(relation, source, target, add=action == u'post_add')
+        self.__settle()
+
+    # CHANGES
+    ####################
+    def __changes(self):
+        deferred = getattr(self.__local, u'deferred', None)
+        if deferred is not None:
+            return deferred
+
+        from django.db import transaction
+
+        connection = transaction.get_connection(self.__database)
+        if not connection.in_atomic_block:
+            # autocommit: the change is already committed and is written straight away by __settle
+            self.__local.immediate = Changes()
+            return self.__local.immediate
+
+        hooks = _Hooks.of(connection)
+        current = getattr(self.__local, u'transaction', None)
+        if current is None or not any(listener is current for listener in hooks.listeners):
+            current = self.__local.transaction = _Transaction(self.flush)
+            hooks.listeners.append(current)
+        return current.changes(hooks.savepoint)
+
+    def __settle(self):
+        immediate = getattr(self.__local, u'immediate', None)
+        if immediate is not None:
+            self.__local.immediate = None
+            self.flush(immediate)
+
+    @contextlib.contextmanager
+    def deferred(self):
+        """
+        Collects every change made inside the block and writes them on exit, e.g. around bulk updates.
+        """
+        outer = getattr(self.__local, u'deferred', None)
+        changes = outer if outer is not None else Changes()
+        self.__local.deferred = changes
+        try:
+            yield changes
+        except Exception:
+            self.__local.deferred = outer
+            raise
+
+        self.__local.deferred = outer
+        if outer is None:
+            self.flush(changes)
+
+    # STATEMENTS
+    ####################
+    def statements(self, changes):
+        statements = []
+
+        upserts = collections.OrderedDict()
+        for (label, _), row in six.iteritems(changes.upserts):
+            upserts.setdefault(label, []).append(row)
+        for label, rows in six.iteritems(upserts):
+            statements.append((
+                u'UNWIND $rows AS row MERGE (n:{} {{{}: row.{}}}) SET n += row'.format(escape(label), KEY, KEY),
+                {u'rows': rows},
+            ))
+
+        for (relation, _, outgoing), key in six.iteritems(changes.clears):
+            if outgoing:
+                pattern = u'(n:{0} {{{1}: $key}})-[r:{2}]->()'
+                label = self.label(relation.source)
+            else:
+                pattern = u'()-[r:{2}]->(n:{0} {{{1}: $key}})'
+                label = self.label(relation.target)
+            statements.append((
+                u'MATCH ' + pattern.format(escape(label), KEY, escape(relation.type_name)) + u' DELETE r',
+                {u'key': key},
+            ))
+
+        links = collections.OrderedDict()
+        for (relation, source, target), add in six.iteritems(changes.links):
+            links.setdefault((relation, add), []).append({u'a': source, u'b': target})
+        for (relation, add), pairs in six.iteritems(links):
+            match = u'UNWIND $pairs AS pair MATCH (a:{} {{{key}: pair.a}}), (b:{} {{{key}: pair.b}}) '.format(
+                escape(self.label(relation.source)), escape(self.label(relation.target)), key=KEY,
+            )
+            if add:
+                statement = match + u'MERGE (a)-[:{}]->(b)'.format(escape(relation.type_name))
+            else:
+                statement = match + u'MATCH (a)-[r:{}]->(b) DELETE r'.format(escape(relation.type_name))
+            statements.append((statement, {u'pairs': pairs}))
+
+        deletes = collections.OrderedDict()
+        for (label, _), key in six.iteritems(changes.deletes):
+            deletes.setdefault(label, []).append(key)
+        for label, keys in six.iteritems(deletes):
+            statements.append((
+                u'UNWIND $keys AS key MATCH (n:{} {{{}: key}}) DETACH DELETE n'.format(escape(label), KEY),
+                {u'keys': keys},
+            ))
+
+        return statements
+
+    def flush(self, changes):
+        statements = self.statements(changes)
+        if not statements:
+            return
+
+        if self.__queue is not None:
+            self.__queue.put(statements)
+        else:
+            self.__send(statements)
+
+    def __send(self, statements):
+        if self.__execute is not None:
+            for statement, parameters in statements:
+                self.__execute(statement, parameters)
+        else:
+            connections[self.__using].post(statements)
+
+    def __work(self):
+        while True:
+            statements = self.__queue.get()
+            try:
+                if statements is None:
+                    return
+                self.__send(statements)
+            except Exception:
+                logger.exception(u'failed to write %d sync statements', len(statements))
+            finally:
+                self.__queue.task_done()
+
+    def join(self):
+        """
+        Blocks until the background worker has written everything queued so far.
+        """
+        if self.__queue is not None:
+            self.__queue.join()
+
+    def stop(self):
+        if self.__worker is None:
+            raise DjangoNeo4jError(u'synchronizer has no background worker')
+
+        self.__queue.put(None)
+        self.__worker.join()
+        self.__worker = None
+        self.__queue = None
@@ -0,0 +1,85 @@
+# coding=utf-8
+import json
+import threading
+
+from six.moves import BaseHTTPServer, socketserver
+
+
+class _Handler(BaseHTTPServer.BaseHTTPRequestHandler):
+    protocol_version = u'HTTP/1.1'
+
+    def do_POST(self):
+        content = self.rfile.read(int(self.headers.get(u'Content-Length') or 0))
+        body = json.loads(content.decode(u'utf-8')) if content else {}
+        self.server.paths.append((self.command, self.path))
+        headers = dict((name.lower(), value) for name, value in self.headers.items())
+        self.server.requests.append((self.client_address[1], headers, body))
+        reply = self.server.respond(body)
+        if reply is None:
+            # drop the connection without answering
+            self.close_connection = True
+            return
+
+        status, response, close = reply
+        content = response if isinstance(response, bytes) else json.dumps(response).encode(u'utf-8')
+        self.send_response(status)
+        self.send_header(u'Content-Type', u'application/json')
+        if self.server.chunk_size:
+            self.send_header(u'Transfer-Encoding', u'chunked')
+        else:
+            self.send_header(u'Content-Length', str(len(content)))
+        if close:
+            self.send_header(u'Connection', u'close')
+        self.end_headers()
+        if self.server.chunk_size:
+            for start in range(0, len(content), self.server.chunk_size):
+                chunk = content[start:start + self.server.chunk_size]
+                self.wfile.write(u'{:x}\r\n'.format(len(chunk)).encode(u'ascii') + chunk + b'\r\n')
+            self.wfile.write(b'0\r\n\r\n')
+        else:
+            self.wfile.write(content)
+
+    do_DELETE = do_POST
+
+    def log_message(self, *args):
+        pass
+
+
+def echo(body):
+    return 200, {
+        u'results': [
+            {u'columns': [u'statement'], u'data': [{u'row': [statement[u'statement']]}]}
+            for statement in body.get(u'statements') or []
+        ],
+        u'errors': [],
+    }, False
+
+
+class StubServer(socketserver.ThreadingMixIn, BaseHTTPServer.HTTPServer):
+    """
+    Local stand-in for the Neo4j transactional endpoint; ``respond(body)`` returns ``(status, json, close)``, or None
+    to drop the connection unanswered.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, respond=echo, chunk_size=None):
+        BaseHTTPServer.HTTPServer.__init__(self, (u'127.0.0.1', 0), _Handler)
+        self.respond = respond
+        self.chunk_size = chunk_size
+        self.requests = []
+        self.paths = []
+        self.__thread = threading.Thread(target=self.serve_forever, args=(0.05,))
+        self.__thread.daemon = True
+
+    @property
+    def port(self):
+        return self.server_address[1]
+
+    def __enter__(self):
+        self.__thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.shutdown()
+        self.server_close()
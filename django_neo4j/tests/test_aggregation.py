@@ -0,0 +1,54 @@
+# coding=utf-8
+from __future__ import unicode_literals
+
+import unittest
+
+from django_neo4j.exception import QueryError
+from django_neo4j.match import Match
+from django_neo4j.operation import ops
+from django_neo4j.pattern import Node
+
+
+class AggregationTest(unittest.TestCase):
+    def test_functions(self):
+        a, n = ops.aggregation, Node('n')
+        self.assertEqual('count(*)', a.count().render())
+        self.assertEqual('count(DISTINCT n.name)', a.count('n.name', distinct=True).render())
+        self.assertEqual('sum(n.price*n.quantity)', a.sum(ops.math.multiply(n['price'], n['quantity'])).render())
+        self.assertEqual('avg(n.age)', a.avg('n.age').render())
+        self.assertEqual('min(n.age)', a.min('n.age').render())
+        self.assertEqual('max(n.age)', a.max('n.age').render())
+        self.assertEqual('collect(DISTINCT n.tag)', a.collect('n.tag', distinct=True).render())
+        self.assertEqual('percentileDisc(n.age, 0.5)', a.percentile_disc('n.age', 0.5).render())
+        self.assertEqual('percentileCont(n.age, 0.9)', a.percentile_cont('n.age', 0.9).render())
+
+    def test_invalid(self):
+        with self.assertRaises(QueryError):
+            ops.aggregation.percentile_cont('n.age', 2)
+        with self.assertRaises(QueryError):
+            ops.aggregation.count(distinct=True)
+        with self.assertRaises(QueryError):
+            ops.aggregation.sum(ops.math.add(ops.aggregation.count(), 1))
+
+    def test_compose_with_mathematical(self):
+        average = ops.math.divide(ops.aggregation.sum('n.age'), ops.aggregation.count('n'))
+        self.assertEqual('sum(n.age)/count(n)', average.render())
+
+    def test_query_aggregate(self):
+        n = Node('n', 'Person')
+        query = Match(n).aggregate(
+            [(n['city'], 'city')],
+            [(ops.aggregation.count(), 'total'), (ops.aggregation.percentile_disc(n['age'], 0.5), 'median')],
+        )
+        self.assertEqual(
+            (
+                'MATCH (n:Person) RETURN n.city AS city, count(*) AS total, percentileDisc(n.age, $p0) AS median',
+                {'p0': 0.5},
+            ),
+            query.build(),
+        )
+
+        query = Match(n).aggregate(['n'], [(ops.aggregation.collect('n.tag'), 'tags')], with_=True).return_('tags')
+        self.assertEqual('MATCH (n:Person) WITH n, collect(n.tag) AS tags RETURN tags', query.render())
+        with self.assertRaises(QueryError):
+            Match(n).aggregate(['n'], [ops.aggregation.count()])
@@ -0,0 +1,160 @@
+# coding=utf-8
+from __future__ import unicode_literals
+
+import gc
+import importlib
+import sys
+import unittest
+
+from django_neo4j.exception import CypherError, PoolTimeoutError, TransportError
+from django_neo4j.tests.server import StubServer, echo
+from django_neo4j.tests.test_result import RESPONSE
+
+if sys.version_info >= (3, 5):
+    import asyncio
+    aio = importlib.import_module('django_neo4j.aio')
+else:
+    aio = None
+
+
+@unittest.skipIf(aio is None, 'asyncio client requires Python 3.5+')
+class AsyncConnectionTest(unittest.TestCase):
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        self.addCleanup(self.loop.close)
+        self.addCleanup(asyncio.set_event_loop, None)
+
+    def run_async(self, coroutine):
+        return self.loop.run_until_complete(coroutine)
+
+    def collect(self, rows):
+        collected = []
+        while True:
+            try:
+                collected.append(self.run_async(rows.__anext__()))
+            except StopAsyncIteration:
+                return collected
+
+    def test_execute_reuses_connection(self):
+        with StubServer() as server:
+            connection = aio.AsyncConnection(aio.AsyncConnectionPool(port=server.port), user='neo4j')
+            self.run_async(connection.execute('RETURN 1'))
+            result = self.run_async(connection.execute('RETURN $p0', {'p0': 2}))
+
+            self.assertEqual([{'row': ['RETURN $p0']}], result['data'])
+            self.assertEqual(1, len(set(port for port, _, _ in server.requests)))
+            self.assertEqual({'idle': 1, 'in_use': 0, 'created': 1, 'reused': 1}, connection.pool.stats)
+            connection.close()
+
+    def test_stream(self):
+        for chunk_size in (None, 7):
+            with StubServer(lambda body: (200, RESPONSE, False), chunk_size=chunk_size) as server:
+                connection = aio.AsyncConnection(aio.AsyncConnectionPool(port=server.port))
+                rows = self.collect(connection.stream('MATCH (n) RETURN n'))
+                self.assertEqual([['élève', 12], [None, 1500.0], [{'tags': ['a', None]}]], rows)
+                self.assertEqual(0, connection.pool.stats['in_use'])
+                self.assertEqual(1, connection.pool.stats['idle'])
+                connection.close()
+
+    def test_abandoned_stream(self):
+        with StubServer(lambda body: (200, RESPONSE, False), chunk_size=7) as server:
+            connection = aio.AsyncConnection(aio.AsyncConnectionPool(port=server.port))
+            rows = connection.stream('MATCH (n) RETURN n')
+            self.run_async(rows.__anext__())
+            self.run_async(rows.aclose())
+            self.assertEqual({'idle': 0, 'in_use': 0, 'created': 1, 'reused': 0}, connection.pool.stats)
+
+    def test_garbage_collected_stream(self):
+        with StubServer(lambda body: (200, RESPONSE, False), chunk_size=7) as server:
+            connection = aio.AsyncConnection(aio.AsyncConnectionPool(port=server.port, max_size=1))
+            rows = connection.stream('MATCH (n) RETURN n')
+            self.run_async(rows.__anext__())
+            del rows
+            gc.collect()
+            self.assertEqual(0, connection.pool.stats['in_use'])
+            self.run_async(connection.execute('RETURN 1'))
+
+    def test_sent_post_is_not_retried(self):
+        answers = [True, False, True]
+        with StubServer(lambda body: echo(body) if answers.pop(0) else None) as server:
+            connection = aio.AsyncConnection(aio.AsyncConnectionPool(port=server.port))
+            self.run_async(connection.execute('RETURN 1'))
+            with self.assertRaises(TransportError):
+                self.run_async(connection.execute('CREATE (n)'))
+            self.assertEqual(2, len(server.requests))
+            connection.close()
+
+    def test_bounded_concurrency(self):
+        with StubServer() as server:
+            pool = aio.AsyncConnectionPool(port=server.port, max_size=2)
+            connection = aio.AsyncConnection(pool)
+            results = self.run_async(asyncio.gather(*[connection.execute('RETURN {}'.format(i)) for i in range(6)]))
+            self.assertEqual(6, len(results))
+            self.assertLessEqual(pool.stats['created'], 2)
+            connection.close()
+
+            blocked = aio.AsyncConnectionPool(port=server.port, max_size=1, block_timeout=0.01)
+            reader, writer, _ = self.run_async(blocked.acquire())
+            with self.assertRaises(PoolTimeoutError):
+                self.run_async(blocked.acquire())
+            blocked.release(reader, writer, reusable=False)
+
+    def test_transaction(self):
+        def respond(body):
+            status, response, close = echo(body)
+            response['commit'] = 'http://localhost/db/data/transaction/7/commit'
+            return status, response, close
+
+        with StubServer(respond) as server:
+            connection = aio.AsyncConnection(aio.AsyncConnectionPool(port=server.port))
+            transaction = connection.transaction()
+            self.run_async(transaction.__aenter__())
+            self.run_async(transaction.execute('CREATE (n)'))
+            self.run_async(transaction.execute('CREATE (m)'))
+            self.run_async(transaction.__aexit__(None, None, None))
+
+            transaction = connection.transaction()
+            self.run_async(transaction.execute('CREATE (n)'))
+            self.run_async(transaction.__aexit__(RuntimeError, RuntimeError(), None))
+
+            self.assertEqual(
+                [
+                    ('POST', '/db/data/transaction'),
+                    ('POST', '/db/data/transaction/7'),
+                    ('POST', '/db/data/transaction/7/commit'),
+                    ('POST', '/db/data/transaction'),
+                    ('DELETE', '/db/data/transaction/7'),
+                ],
+                server.paths,
+            )
+
+    def test_failed_statement_ends_transaction(self):
+        def respond(body):
+            if body['statements'][0]['statement'] == 'BAD':
+                return 200, {'results': [], 'errors': [{'code': 'Neo.ClientError', 'message': 'bad'}]}, False
+            status, response, close = echo(body)
+            response['commit'] = 'http://localhost/db/data/transaction/7/commit'
+            return status, response, close
+
+        with StubServer(respond) as server:
+            connection = aio.AsyncConnection(aio.AsyncConnectionPool(port=server.port))
+            transaction = connection.transaction()
+            self.run_async(transaction.execute('CREATE (n)'))
+            with self.assertRaises(CypherError) as context:
+                self.run_async(transaction.execute('BAD'))
+            self.run_async(transaction.__aexit__(CypherError, context.exception, None))
+            self.assertIsNone(transaction.location)
+            self.assertEqual([('POST', '/db/data/transaction'), ('POST', '/db/data/transaction/7')], server.paths)
+            connection.close()
+
+    def test_errors(self):
+        def respond(body):
+            return 200, {'results': [], 'errors': [{'code': 'Neo.ClientError', 'message': 'bad'}]}, False
+
+        with StubServer(respond) as server:
+            connection = aio.AsyncConnection(aio.AsyncConnectionPool(port=server.port))
+            with self.assertRaises(CypherError):
+                self.run_async(connection.execute('RETURN'))
+            with self.assertRaises(CypherError):
+                self.collect(connection.stream('RETURN'))
@@ -0,0 +1,94 @@
+# coding=utf-8
+from __future__ import unicode_literals
+
+import unittest
+
+from django.test.utils import override_settings
+
+from django_neo4j.batch import Batch, BatchMiddleware, execute
+from django_neo4j.connection import Connection, ConnectionPool, connections
+from django_neo4j.exception import CypherError, DjangoNeo4jError
+from django_neo4j.match import Match
+from django_neo4j.operation import ops
+from django_neo4j.pattern import Node
+from django_neo4j.tests.server import StubServer
+
+
+class BatchTest(unittest.TestCase):
+    def test_single_request(self):
+        with StubServer() as server:
+            connection = Connection(ConnectionPool(port=server.port))
+            n = Node('n', 'Person')
+            with Batch(connection) as batch:
+                first = batch.add('CREATE (n:Person)')
+                second = execute(Match(n).where(ops.comparison.eq(n['id'], 1)).return_('n'))
+                with self.assertRaises(DjangoNeo4jError):
+                    first.result
+
+            self.assertEqual(1, len(server.requests))
+            self.assertEqual(
+                [
+                    {'statement': 'CREATE (n:Person)', 'parameters': {}, 'resultDataContents': ['row']},
+                    {
+                        'statement': 'MATCH (n:Person) WHERE n.id=$p0 RETURN n',
+                        'parameters': {'p0': 1},
+                        'resultDataContents': ['row'],
+                    },
+                ],
+                server.requests[0][2]['statements'],
+            )
+            self.assertEqual([['CREATE (n:Person)']], [row['row'] for row in first.result['data']])
+            self.assertTrue(second.done)
+
+    def test_auto_flush(self):
+        with StubServer() as server:
+            connection = Connection(ConnectionPool(port=server.port))
+            with Batch(connection, max_statements=2) as batch:
+                for i in range(5):
+                    batch.add('RETURN {}'.format(i))
+                self.assertEqual(2, batch.requests)
+
+            self.assertEqual([2, 2, 1], [len(body['statements']) for _, _, body in server.requests])
+
+            with Batch(connection, max_bytes=1) as batch:
+                batch.add('RETURN 1')
+                self.assertEqual(0, batch.size)
+
+    def test_discard_on_exception(self):
+        with StubServer() as server:
+            connection = Connection(ConnectionPool(port=server.port))
+            with self.assertRaises(RuntimeError):
+                with Batch(connection) as batch:
+                    batch.add('RETURN 1')
+                    raise RuntimeError
+
+            self.assertEqual([], server.requests)
+            self.assertIsNone(Batch.current())
+
+    def test_errors_resolve_pending(self):
+        def respond(body):
+            return 200, {'results': [], 'errors': [{'code': 'Neo.ClientError', 'message': 'bad'}]}, False
+
+        with StubServer(respond) as server:
+            batch = Batch(Connection(ConnectionPool(port=server.port)))
+            pending = batch.add('RETURN')
+            with self.assertRaises(CypherError):
+                batch.flush()
+            with self.assertRaises(CypherError):
+                pending.result
+
+    def test_middleware(self):
+        class Request(object):
+            pass
+
+        with StubServer() as server, override_settings(NEO4J={'default': {'PORT': server.port}}):
+            self.addCleanup(connections.close_all)
+            middleware = BatchMiddleware()
+            request = Request()
+            middleware.process_request(request)
+            execute('RETURN 1')
+            execute('RETURN 2')
+            self.assertEqual([], server.requests)
+            self.assertEqual('response', middleware.process_response(request, 'response'))
+            self.assertEqual(1, len(server.requests))
+            self.assertIsNone(Batch.current())
@@ -0,0 +1,37 @@
+# coding=utf-8
+from __future__ import unicode_literals
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from django_neo4j.benchmark import Suite, compare, load, report, save, suite
+
+
+class BenchmarkTest(unittest.TestCase):
+    def test_compare_flags_slowdowns(self):
+        comparisons = compare({'a': 1.5, 'b': 1.1, 'c': 1.0}, {'a': 1.0, 'b': 1.0, 'd': 1.0}, threshold=0.25)
+        self.assertEqual(['a', 'b', 'c', 'd'], [comparison.name for comparison in comparisons])
+        self.assertEqual([True, False, False, False], [comparison.regressed for comparison in comparisons])
+        self.assertIn('SLOWER', report(comparisons).splitlines()[1])
+
+    def test_save_and_load(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        path = os.path.join(directory, 'baseline.json')
+        self.assertEqual({}, load(path))
+        save({'a': 0.5}, path)
+        self.assertEqual({'a': 0.5}, load(path))
+
+    def test_run(self):
+        calls = []
+        local = Suite()
+        local.register('noop')(lambda: calls.append(1))
+        results = local.run(repeat=1, min_time=0)
+        self.assertEqual(['noop'], list(results))
+        self.assertTrue(calls)
+
+    def test_suite_benchmarks_execute(self):
+        self.assertIn('tree.deep', suite.names)
+        self.assertEqual(set(suite.names), set(suite.run(repeat=1, min_time=0)))
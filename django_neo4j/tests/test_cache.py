@@ -0,0 +1,150 @@
+# coding=utf-8
+from __future__ import unicode_literals
+
+import threading
+import time
+import unittest
+
+import mock
+from django.test import SimpleTestCase
+from django.test.utils import override_settings
+
+from django_neo4j.cache import LRUCache, ResultCache, TemplateCache, is_write, labels
+from django_neo4j.instrumentation import REQUEST, Event
+from django_neo4j.operation import ops
+from django_neo4j.parameter import Parameters
+from django_neo4j.type import Identifier
+
+
+class ShapeTest(unittest.TestCase):
+    def test_shape_ignores_literal_values(self):
+        a = ops.comparison.gt(Identifier('n.age'), 1)
+        b = ops.comparison.gt(Identifier('n.age'), 2)
+        self.assertNotEqual(a, b)
+        self.assertEqual(a.shape, b.shape)
+        self.assertEqual(a.fingerprint, b.fingerprint)
+
+    def test_shape_distinguishes_structure(self):
+        shapes = {
+            ops.comparison.gt(Identifier('n.age'), 1).shape,
+            ops.comparison.lt(Identifier('n.age'), 1).shape,
+            ops.comparison.gt(Identifier('n.size'), 1).shape,
+            ops.comparison.gt(1, Identifier('n.age')).shape,
+            ops.comparison.starts_with(Identifier('n.name'), 'a').shape,
+            ops.comparison.ends_with(Identifier('n.name'), 'a').shape,
+        }
+        self.assertEqual(6, len(shapes))
+
+
+class LRUCacheTest(unittest.TestCase):
+    def test_eviction(self):
+        cache = LRUCache(maxsize=2)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        self.assertEqual(1, cache.get('a'))
+        cache.set('c', 3)
+        self.assertNotIn('b', cache)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual({'hits': 1, 'misses': 1, 'evictions': 1, 'size': 2, 'maxsize': 2}, cache.stats)
+
+
+class TemplateCacheTest(unittest.TestCase):
+    def test_render(self):
+        cache = TemplateCache(maxsize=8)
+        rendered = []
+        for value in (1, 2):
+            with Parameters() as params:
+                expression = ops.mathematical.add(ops.mathematical.multiply(Identifier('n.a'), value), value + 10)
+                rendered.append((cache.render(expression), params.values))
+
+        self.assertEqual(('(n.a*$p0)+$p1', {'p0': 1, 'p1': 11}), rendered[0])
+        self.assertEqual(('(n.a*$p0)+$p1', {'p0': 2, 'p1': 12}), rendered[1])
+        self.assertEqual((1, 1), (cache.hits, cache.misses))
+
+    def test_offset_parameters(self):
+        cache = TemplateCache(maxsize=8)
+        params = Parameters()
+        expression = ops.comparison.eq(Identifier('n.a'), 1)
+        self.assertEqual('n.a=$p0', cache.render(expression, params))
+        self.assertEqual('n.a=$p1', cache.render(expression, params))
+        self.assertEqual(0, cache.hits)
+
+    def test_inline_without_parameters(self):
+        cache = TemplateCache(maxsize=8)
+        self.assertEqual('n.a=1', cache.render(ops.comparison.eq(Identifier('n.a'), 1)))
+        self.assertEqual(0, len(cache))
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'r'}})
+class ResultCacheTest(SimpleTestCase):
+    def setUp(self):
+        self.cache = ResultCache(wait=2, poll=0.01)
+        self.addCleanup(lambda: self.cache.cache.clear())
+        self.calls = []
+
+    def compute(self, value=1):
+        def compute():
+            self.calls.append(value)
+            return value
+        return compute
+
+    def test_labels(self):
+        self.assertEqual(
+            {'Person', 'Odd Label', 'Admin'},
+            labels('MATCH (n:Person:`Odd Label`)-[:KNOWS]->(m) SET m:Admin'),
+        )
+        self.assertTrue(is_write('MATCH (n) SET n.x = 1'))
+        self.assertFalse(is_write('MATCH (n:Person) RETURN n.settings'))
+
+    def test_read_through(self):
+        statement = 'MATCH (n:Person) RETURN n'
+        self.assertEqual(1, self.cache.get_or_compute(statement, {'p0': 1}, self.compute(1)))
+        self.assertEqual(1, self.cache.get_or_compute(statement, {'p0': 1}, self.compute(2)))
+        self.assertEqual(3, self.cache.get_or_compute(statement, {'p0': 2}, self.compute(3)))
+        self.assertEqual([1, 3], self.calls)
+
+    def test_write_invalidates_labels(self):
+        person, city = 'MATCH (n:Person) RETURN n', 'MATCH (n:City) RETURN n'
+        self.cache.get_or_compute(person, None, self.compute(1))
+        self.cache.get_or_compute(city, None, self.compute(2))
+        self.cache.observe(Event(REQUEST, 'MATCH (n:Person) SET n.age = $p0'))
+        self.cache.observe(Event(REQUEST, 'MATCH (n:City) RETURN n'))
+        self.assertEqual(3, self.cache.get_or_compute(person, None, self.compute(3)))
+        self.assertEqual(2, self.cache.get_or_compute(city, None, self.compute(4)))
+        self.assertEqual([1, 2, 3], self.calls)
+
+    def test_unlabelled_write_invalidates_everything(self):
+        person = 'MATCH (n:Person) RETURN n'
+        self.cache.get_or_compute(person, None, self.compute(1))
+        self.cache.observe(Event(REQUEST, 'MATCH (n) WHERE id(n)=$p0 SET n.x=$p1'))
+        self.assertEqual(2, self.cache.get_or_compute(person, None, self.compute(2)))
+        self.assertEqual([1, 2], self.calls)
+
+    def test_unlabelled_read_is_not_cached(self):
+        connection = mock.Mock()
+        connection.execute.side_effect = [1, 2]
+        with mock.patch('django_neo4j.cache.connections', {'default': connection}):
+            self.assertEqual(1, self.cache.execute('MATCH (n)-[:OWNS]->(m) RETURN m'))
+            self.assertEqual(2, self.cache.execute('MATCH (n)-[:OWNS]->(m) RETURN m'))
+
+    def test_stampede(self):
+        barrier = threading.Event()
+
+        def slow():
+            barrier.wait(1)
+            time.sleep(0.05)
+            return self.compute(7)()
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(self.cache.get_or_compute('RETURN 7', None, slow)))
+            for _ in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        barrier.set()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual([7] * 5, results)
+        self.assertEqual([7], self.calls)
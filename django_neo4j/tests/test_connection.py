@@ -0,0 +1,95 @@
+# coding=utf-8
+from __future__ import unicode_literals
+
+import unittest
+
+from django.core.exceptions import ImproperlyConfigured
+from django.test.utils import override_settings
+
+from django_neo4j import DEFAULT_PORT
+from django_neo4j.connection import Connection, ConnectionPool, configuration, connect
+from django_neo4j.exception import CypherError, PoolTimeoutError, TransportError
+from django_neo4j.tests.server import StubServer, echo
+
+
+class ConnectionTest(unittest.TestCase):
+    def test_execute_reuses_connection(self):
+        with StubServer() as server:
+            connection = Connection(ConnectionPool(port=server.port), user='neo4j', password='secret')
+            result = connection.execute('RETURN $p0', {'p0': 1})
+            connection.execute('RETURN 2')
+
+            self.assertEqual({'columns': ['statement'], 'data': [{'row': ['RETURN $p0']}]}, result)
+            self.assertEqual(1, len(set(port for port, _, _ in server.requests)))
+            self.assertEqual({'p0': 1}, server.requests[0][2]['statements'][0]['parameters'])
+            self.assertTrue(server.requests[0][1]['authorization'].startswith('Basic '))
+            self.assertEqual(1, connection.pool.stats['created'])
+            self.assertEqual(1, connection.pool.stats['reused'])
+            connection.close()
+
+    def test_idle_timeout(self):
+        with StubServer() as server:
+            connection = Connection(ConnectionPool(port=server.port, idle_timeout=0))
+            connection.execute('RETURN 1')
+            connection.execute('RETURN 2')
+            self.assertEqual(2, connection.pool.stats['created'])
+            self.assertEqual(2, len(set(port for port, _, _ in server.requests)))
+
+    def test_server_closed_connection(self):
+        with StubServer(lambda body: echo(body)[:2] + (True,)) as server:
+            connection = Connection(ConnectionPool(port=server.port))
+            connection.execute('RETURN 1')
+            connection.execute('RETURN 2')
+            self.assertEqual(2, connection.pool.stats['created'])
+            self.assertEqual(0, connection.pool.stats['idle'])
+
+    def test_sent_request_is_not_retried(self):
+        answers = [True, False, True]
+        with StubServer(lambda body: echo(body) if answers.pop(0) else None) as server:
+            connection = Connection(ConnectionPool(port=server.port))
+            connection.execute('RETURN 1')
+            with self.assertRaises(TransportError):
+                connection.execute('CREATE (n)')
+            self.assertEqual(2, len(server.requests))
+
+    def test_errors(self):
+        def respond(body):
+            return 200, {'results': [], 'errors': [{'code': 'Neo.ClientError', 'message': 'bad'}]}, False
+
+        with StubServer(respond) as server:
+            with self.assertRaises(CypherError) as context:
+                Connection(ConnectionPool(port=server.port)).execute('RETURN')
+            self.assertEqual('Neo.ClientError', context.exception.code)
+
+        with StubServer(lambda body: (500, {}, False)) as server:
+            with self.assertRaises(TransportError):
+                Connection(ConnectionPool(port=server.port)).execute('RETURN 1')
+
+    def test_block_timeout(self):
+        pool = ConnectionPool(max_size=1, block_timeout=0.01)
+        connection, reused = pool.acquire()
+        self.assertFalse(reused)
+        with self.assertRaises(PoolTimeoutError):
+            pool.acquire()
+        pool.release(connection)
+        self.assertTrue(pool.acquire()[1])
+
+
+class ConfigurationTest(unittest.TestCase):
+    def test_neo4j_setting(self):
+        with override_settings(NEO4J={'default': {'HOST': 'graph', 'OPTIONS': {'POOL_SIZE': 3}}}):
+            connection = connect(configuration())
+            self.assertEqual(('graph', DEFAULT_PORT, 3), (
+                connection.pool.host,
+                connection.pool.port,
+                connection.pool.max_size,
+            ))
+
+    def test_databases_setting_ignored(self):
+        databases = {
+            'default': {'ENGINE': 'django.db.backends.sqlite3'},
+            'graph': {'ENGINE': 'django_neo4j', 'HOST': 'graph', 'PORT': '7475'},
+        }
+        with override_settings(DATABASES=databases, NEO4J=None):
+            with self.assertRaises(ImproperlyConfigured):
+                configuration('graph')
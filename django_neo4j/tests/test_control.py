@@ -0,0 +1,155 @@
+# coding=utf-8
+from __future__ import unicode_literals
+
+import unittest
+
+from django_neo4j.control import (
+    AccessControlMiddleware, Policies, Principal, Restriction, predicates, restricted, unrestricted,
+)
+from django_neo4j.exception import QueryError
+from django_neo4j.manager import GraphManager
+from django_neo4j.match import Match
+from django_neo4j.operation import ops
+from django_neo4j.pattern import Node
+from django_neo4j.relationship import Path
+from django_neo4j.tests.test_manager import FakeConnection
+
+
+class PoliciesTest(unittest.TestCase):
+    def setUp(self):
+        self.calls = []
+        self.policies = Policies()
+
+        def owner(node, principal):
+            self.calls.append(principal.id)
+            return ops.comparison.eq(node['owner'], principal.id)
+
+        self.policies.allow('Doc', owner)
+        self.policies.allow('Doc', True, groups=['staff'])
+
+    def build(self, principal, *patterns):
+        with Restriction(principal, self.policies):
+            return Match(*patterns).where(ops.comparison.gt(Node('d')['size'], 1)).return_('d').build()
+
+    def test_injects_predicate(self):
+        path = Path(Node('u', 'User')).outgoing(Node('d', 'Doc'), 'OWNS')
+        self.assertEqual(
+            ('MATCH (u:User)-[:OWNS]->(d:Doc) WHERE (d.owner=$p0) AND (d.size>$p1) RETURN d', {'p0': 7, 'p1': 1}),
+            self.build(Principal(7), path),
+        )
+
+    def test_compiled_once_per_principal_and_version(self):
+        self.build(Principal(7), Node('d', 'Doc'))
+        self.build(Principal(7), Node('d', 'Doc'))
+        self.build(Principal(8), Node('d', 'Doc'))
+        self.assertEqual([7, 8], self.calls)
+
+        self.policies.allow('Doc', False)
+        self.build(Principal(7), Node('d', 'Doc'))
+        self.assertEqual([7, 8, 7], self.calls)
+
+    def test_grants(self):
+        expected = 'MATCH (d:Doc) WHERE d.size>$p0 RETURN d'
+        self.assertEqual(expected, self.build(Principal(7, ['staff']), Node('d', 'Doc'))[0])
+        self.assertEqual(expected, self.build(Principal(superuser=True), Node('d', 'Doc'))[0])
+        self.assertEqual('MATCH (u:User) WHERE u.size>$p0 RETURN d', Match(Node('u', 'User')).where(
+            ops.comparison.gt(Node('u')['size'], 1)).return_('d').build()[0])
+
+    def test_denies_without_applicable_rule(self):
+        self.policies.clear('Doc')
+        self.policies.allow('Doc', True, groups=['staff'])
+        self.assertEqual(
+            'MATCH (d:Doc) WHERE false AND (d.size>$p0) RETURN d',
+            self.build(Principal(7), Node('d', 'Doc'))[0],
+        )
+
+    def test_anonymous_node(self):
+        with self.assertRaises(QueryError):
+            self.build(Principal(7), Node(None, 'Doc'))
+
+    def test_or_of_rules(self):
+        self.policies.allow('Doc', lambda node, principal: ops.comparison.eq(node['public'], True))
+        self.assertEqual(
+            'MATCH (d:Doc) WHERE ((d.owner=$p0) OR (d.public=$p1)) AND (d.size>$p2) RETURN d',
+            self.build(Principal(7), Node('d', 'Doc'))[0],
+        )
+
+    def test_unlabelled_node(self):
+        self.policies.allow('Secret', False)
+        self.assertEqual(
+            ('MATCH (d) WHERE (((NOT d:Doc) OR (d.owner=$p0)) AND (NOT d:Secret)) AND (d.size>$p1) RETURN d',
+             {'p0': 7, 'p1': 1}),
+            self.build(Principal(7), Node('d')),
+        )
+        with self.assertRaises(QueryError):
+            self.build(Principal(7), Path(Node('d', 'User')).outgoing(Node(), 'OWNS'))
+
+    def test_merge(self):
+        with Restriction(Principal(7), self.policies):
+            query = Match(Node('u', 'User')).merge(Path(Node('u')).outgoing(Node('d', 'Doc'), 'OWNS')).return_('d')
+        self.assertEqual(
+            'MATCH (u:User) MERGE (u)-[:OWNS]->(d:Doc) WITH * WHERE ((NOT u:Doc) OR (u.owner=$p0)) AND (d.owner=$p1) '
+            'RETURN d',
+            query.build()[0],
+        )
+
+    def test_prefetch(self):
+        connection = FakeConnection([[1, {}]], [[1, [[2, {}]]]])
+        with Restriction(Principal(7), self.policies):
+            list(GraphManager('User', connection=connection).prefetch_related('OWNS'))
+        self.assertEqual(
+            'UNWIND $p0 AS id MATCH (n)-[:OWNS]->(m) WHERE ((NOT n:Doc) OR (n.owner=$p1)) '
+            'AND ((NOT m:Doc) OR (m.owner=$p2)) AND (id(n)=id) RETURN id, collect([id(m), m])',
+            connection.statements[1][0],
+        )
+
+
+class RestrictionTest(unittest.TestCase):
+    def test_nesting(self):
+        policies = Policies()
+        policies.allow('Doc', lambda node, principal: ops.comparison.eq(node['owner'], principal.id))
+        self.assertEqual([], predicates([Node('d', 'Doc')]))
+        with Restriction(lambda: Principal(1), policies) as outer:
+            self.assertIs(outer, Restriction.current())
+            self.assertEqual(1, len(predicates([Node('d', 'Doc')])))
+            with unrestricted():
+                self.assertEqual([], predicates([Node('d', 'Doc')]))
+            self.assertIs(outer, restricted.current())
+        self.assertIsNone(Restriction.current())
+
+
+class FakeUser(object):
+    pk = 3
+    is_superuser = False
+
+    def __init__(self, authenticated=True):
+        self.is_authenticated = lambda: authenticated
+
+    class groups(object):
+        @staticmethod
+        def values_list(name, flat=False):
+            return ['staff']
+
+
+class FakeRequest(object):
+    user = FakeUser()
+
+
+class AccessControlMiddlewareTest(unittest.TestCase):
+    def test_principal_from_user(self):
+        principal = Principal.from_user(FakeUser())
+        self.assertEqual((3, ('staff',), False), principal.key)
+        self.assertEqual((None, (), False), Principal.from_user(FakeUser(authenticated=False)).key)
+
+    def test_middleware(self):
+        seen = []
+        middleware = AccessControlMiddleware(lambda request: seen.append(Restriction.current().principal) or 'ok')
+        self.assertEqual('ok', middleware(FakeRequest()))
+        self.assertEqual(3, seen[0].id)
+        self.assertIsNone(Restriction.current())
+
+        request = FakeRequest()
+        middleware.process_request(request)
+        self.assertEqual(3, Restriction.current().principal.id)
+        self.assertEqual('ok', middleware.process_response(request, 'ok'))
+        self.assertIsNone(Restriction.current())
@@ -0,0 +1,85 @@
+# coding=utf-8
+from __future__ import unicode_literals
+
+import pickle
+import unittest
+
+from django_neo4j.expression import Literal, OperationExpression, as_expression, render, render_many
+from django_neo4j.operation import ops
+from django_neo4j.parameter import Parameters
+from django_neo4j.pattern import Node
+from django_neo4j.type import Identifier
+
+
+class ExpressionTest(unittest.TestCase):
+    def test_nested(self):
+        a, b = Identifier('n.a'), Identifier('n.b')
+        expression = ops.mathematical.add(ops.mathematical.multiply(a, b), 3)
+        self.assertIsInstance(expression, OperationExpression)
+        self.assertEqual('(n.a*n.b)+3', expression.render())
+        self.assertEqual('n.a*(n.b+3)', ops.mathematical.multiply(a, ops.mathematical.add(b, 3)).render())
+
+    def test_compare_and_hash(self):
+        a = ops.comparison.eq(Identifier('n.a'), 1)
+        self.assertEqual(a, ops.comparison.eq(Identifier('n.a'), 1))
+        self.assertNotEqual(a, ops.comparison.eq(Identifier('n.a'), 2))
+        self.assertNotEqual(a, ops.comparison.ne(Identifier('n.a'), 1))
+        self.assertNotEqual(Literal(1), Literal(1.0))
+        self.assertEqual(1, len({a, ops.comparison.eq(Identifier('n.a'), 1)}))
+
+    def test_deep_tree(self):
+        expression = Identifier('n.a')
+        for i in range(5000):
+            expression = ops.mathematical.add(expression, i)
+
+        rendered = expression.render()
+        self.assertTrue(rendered.startswith('(' * 4999 + 'n.a+0)'))
+        self.assertTrue(rendered.endswith('+4999'))
+
+    def test_parameters_bound_in_render_order(self):
+        expression = ops.mathematical.subtract(ops.mathematical.add(1, 2), 3)
+        params = Parameters()
+        self.assertEqual('($p0+$p1)-$p2', render(expression, params))
+        self.assertEqual({'p0': 1, 'p1': 2, 'p2': 3}, params.values)
+
+    def test_repr_does_not_bind(self):
+        with Parameters() as params:
+            repr(ops.comparison.eq(Identifier('n.a'), 'x'))
+
+        self.assertEqual(0, len(params))
+
+    def test_render_many(self):
+        params = Parameters()
+        expressions = ops.comparison.eq.many(Identifier('n.a'), [1, 2])
+        self.assertEqual(['n.a=$p0', 'n.a=$p1'], render_many(expressions, params))
+        self.assertEqual({'p0': 1, 'p1': 2}, params.values)
+
+    def test_inline_literals(self):
+        self.assertEqual('n.x IN ["a", "b\\"c\\\\"]', ops.collection.in_(Identifier('n.x'), ['a', 'b"c\\']).render())
+        self.assertEqual(
+            '(n:P {x: null, y: {`a b`: [true, 1.5]}})',
+            Node('n', 'P', {'x': None, 'y': {'a b': [True, 1.5]}}).render(),
+        )
+
+
+class FlyweightTest(unittest.TestCase):
+    def test_literals(self):
+        self.assertIs(as_expression(1), as_expression(1))
+        self.assertIs(as_expression(True), as_expression(True))
+        self.assertIsNot(as_expression(True), as_expression(1))
+        self.assertIsNot(as_expression(1000), as_expression(1000))
+        self.assertEqual(Literal([1]), as_expression([1]))
+
+    def test_identifiers(self):
+        self.assertIs(Identifier('n.age'), Identifier('n.age'))
+        self.assertIs(Node('n')['age'], Node('n', 'Person')['age'])
+        self.assertEqual('n.`odd key`', Node('n')['odd key'].render())
+        self.assertIs(Identifier('n.age'), pickle.loads(pickle.dumps(Identifier('n.age'), 2)))
+
+    def test_parameter_names(self):
+        a, b = Parameters(), Parameters()
+        self.assertIs(a.bind(1), b.bind(2))
+        for value in range(300):
+            a.bind(value)
+        self.assertEqual(299, a.values['p300'])
+        self.assertEqual('{q0}', Parameters('q', Parameters.BRACES).bind(1))
@@ -0,0 +1,94 @@
+# coding=utf-8
+from __future__ import unicode_literals
+
+import importlib
+import unittest
+
+import six
+from django.contrib.auth.models import User
+from django.test import TestCase
+
+from django_neo4j.connection import encode_statement
+from django_neo4j.control import Policies, Principal, Restriction
+from django_neo4j.exception import QueryError
+from django_neo4j.operation import ops
+
+importer = importlib.import_module('django_neo4j.import')
+
+
+class ChunkedTest(unittest.TestCase):
+    def test_chunked(self):
+        self.assertEqual([[0, 1], [2, 3], [4]], list(importer.chunked(iter(range(5)), 2)))
+        self.assertEqual([], list(importer.chunked([], 2)))
+
+
+class ImporterTest(unittest.TestCase):
+    def test_statements(self):
+        self.assertEqual(
+            'UNWIND $rows AS row CREATE (n:Person) SET n = row',
+            importer.Importer('Person').statement,
+        )
+        self.assertEqual(
+            'UNWIND $rows AS row MERGE (n:Person {id: row.id}) SET n += row',
+            importer.Importer('Person', keys='id').statement,
+        )
+        with self.assertRaises(QueryError):
+            importer.Importer('Person', mode=importer.Importer.MERGE)
+
+    def test_run_streams_batches(self):
+        consumed = []
+
+        def source():
+            for i in range(7):
+                consumed.append(i)
+                yield {'id': i}
+
+        executed = []
+
+        def execute(statement, parameters):
+            # the generator is only advanced one batch ahead of execution
+            self.assertLessEqual(len(consumed), (len(executed) + 1) * 3)
+            executed.append((statement, [row['id'] for row in parameters['rows']]))
+
+        batches = []
+        stats = importer.Importer('Person', keys=['id'], batch_size=3).run(source(), execute, batches.append)
+
+        self.assertEqual([[0, 1, 2], [3, 4, 5], [6]], [ids for _, ids in executed])
+        self.assertEqual(1, len(set(statement for statement, _ in executed)))
+        self.assertEqual((3, 7), (stats.batches, stats.rows))
+        self.assertEqual([0, 1, 2], [batch.index for batch in batches])
+        self.assertIs(batches[-1], stats.last)
+
+    def test_queryset_iterator(self):
+        class QuerySet(object):
+            def iterator(self):
+                return iter([{'id': 1}, {'id': 2}])
+
+        batches = list(importer.Importer('Person', batch_size=10).batches(QuerySet()))
+        self.assertEqual([{'rows': [{'id': 1}, {'id': 2}]}], [parameters for _, parameters in batches])
+
+    def test_restricted_statement_parameters(self):
+        policies = Policies()
+        policies.allow('Doc', lambda node, principal: ops.comparison.eq(node['owner'], principal.id))
+        with Restriction(Principal(7), policies):
+            imported = importer.Importer('Doc', keys='id', batch_size=10)
+
+        self.assertEqual(
+            'UNWIND $rows AS row MERGE (n:Doc {id: row.id}) WITH * WHERE n.owner=$p0 SET n += row',
+            imported.statement,
+        )
+        self.assertEqual([{'p0': 7, 'rows': [{'id': 1}]}], [p for _, p in imported.batches([{'id': 1}])])
+
+
+class ModelImportTest(TestCase):
+    def test_model_queryset(self):
+        for name in 'abc':
+            User.objects.create(username=name)
+
+        with self.assertNumQueries(1):
+            (statement, parameters), = importer.Importer('Person', batch_size=10).batches(User.objects.order_by('pk'))
+        rows = parameters['rows']
+        self.assertEqual(['a', 'b', 'c'], [row['username'] for row in rows])
+        self.assertNotIn('groups', rows[0])
+        self.assertIsInstance(rows[0]['date_joined'], six.string_types)
+        encode_statement(statement, parameters)
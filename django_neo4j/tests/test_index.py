@@ -0,0 +1,93 @@
+# coding=utf-8
+from __future__ import unicode_literals
+
+import unittest
+
+from django_neo4j.constraint import UniqueConstraint
+from django_neo4j.index import EQUALITY, PREFIX, RANGE, Index, IndexAdvisor, Schema, SchemaManager
+from django_neo4j.match import Match
+from django_neo4j.operation import ops
+from django_neo4j.pattern import Node
+from django_neo4j.type import Identifier
+
+
+class FakeConnection(object):
+    def __init__(self):
+        self.executed = []
+
+    def execute(self, statement, parameters=None):
+        self.executed.append(statement)
+        if statement == 'CALL db.indexes()':
+            return {
+                'columns': ['description', 'state', 'type'],
+                'data': [
+                    {'row': ['INDEX ON :Person(name)', 'ONLINE', 'node_label_property']},
+                    {'row': ['INDEX ON :Person(email)', 'ONLINE', 'node_unique_property']},
+                    {'row': ['INDEX ON :Stale(old)', 'ONLINE', 'node_label_property']},
+                ],
+            }
+        if statement == 'CALL db.constraints()':
+            return {
+                'columns': ['description'],
+                'data': [{'row': ['CONSTRAINT ON ( person:Person ) ASSERT person.email IS UNIQUE']}],
+            }
+        return {'columns': [], 'data': []}
+
+
+class Person(object):
+    class Neo4jMeta:
+        indexes = ('name', ('first', 'last'))
+        unique = ('email', 'ssn')
+
+
+class SchemaTest(unittest.TestCase):
+    def test_register(self):
+        schema = Schema()
+        schema.register(Person)
+        self.assertEqual({Index('Person', 'name'), Index('Person', 'first', 'last')}, schema.indexes)
+        self.assertEqual({UniqueConstraint('Person', 'email'), UniqueConstraint('Person', 'ssn')}, schema.constraints)
+        self.assertTrue(schema.covers('Person', 'first'))
+        self.assertFalse(schema.covers('Person', 'last'))
+
+    def test_sync(self):
+        schema = Schema()
+        schema.register(Person)
+        connection = FakeConnection()
+        manager = SchemaManager(connection)
+        expected = [
+            'CREATE CONSTRAINT ON (n:Person) ASSERT n.ssn IS UNIQUE',
+            'CREATE INDEX ON :Person(first, last)',
+        ]
+        self.assertEqual(expected, manager.sync(schema, dry_run=True))
+        self.assertEqual(['DROP INDEX ON :Stale(old)'] + expected, manager.diff(schema, drop=True))
+
+        manager.sync(schema)
+        self.assertEqual(expected, connection.executed[-2:])
+
+
+class IndexAdvisorTest(unittest.TestCase):
+    def test_report(self):
+        n, m = Node('n', 'Person', {'id': 1}), Node('m', 'City')
+        advisor = IndexAdvisor()
+        for _ in range(2):
+            advisor.observe(
+                Match(n, m)
+                .where(ops.comparison.gt(n['age'], 18), ops.comparison.starts_with(m['name'], 'A'))
+                .where(ops.comparison.eq(n['name'], 'x'), ops.comparison.contains(n['bio'], 'y'))
+                .return_('n')
+            )
+        advisor.observe(ops.comparison.lte(Identifier('c.age'), 3), labels={'c': 'Person'})
+
+        report = dict(((advice.label, advice.property_name), (advice.kinds, advice.count)) for advice in advisor.report(
+            Schema().index('Person', 'name')
+        ))
+        self.assertEqual(
+            {
+                ('Person', 'id'): ({EQUALITY}, 2),
+                ('Person', 'age'): ({RANGE}, 3),
+                ('City', 'name'): ({PREFIX}, 2),
+            },
+            report,
+        )
+        first = advisor.report(Schema())[0]
+        self.assertEqual(('Person', 'age'), (first.label, first.property_name))
@@ -0,0 +1,95 @@
+# coding=utf-8
+from __future__ import unicode_literals
+
+import logging
+import unittest
+
+from django_neo4j.connection import Connection, ConnectionPool
+from django_neo4j.exception import CypherError
+from django_neo4j.instrumentation import (
+    RENDER, REQUEST, Collector, StatsdExporter, instrumentation, logger, prometheus, shape,
+)
+from django_neo4j.match import Match
+from django_neo4j.operation import ops
+from django_neo4j.panel import Neo4jPanel
+from django_neo4j.pattern import Node
+from django_neo4j.tests.server import StubServer
+
+
+class InstrumentationTest(unittest.TestCase):
+    def setUp(self):
+        self.events = []
+        self.collector = Collector()
+        for subscriber in (self.events.append, self.collector):
+            instrumentation.subscribe(subscriber)
+            self.addCleanup(instrumentation.unsubscribe, subscriber)
+
+    def test_render_and_request(self):
+        n = Node('n', 'Person')
+        text, parameters = Match(n).where(ops.comparison.gt(n['age'], 18)).return_('n').build()
+        with StubServer(chunk_size=7) as server:
+            connection = Connection(ConnectionPool(port=server.port))
+            connection.post([(text, parameters), ('RETURN 1', None)])
+            self.assertEqual([[text]], list(connection.stream(text, parameters)))
+            connection.close()
+
+        self.assertEqual([RENDER, REQUEST, REQUEST, REQUEST], [event.kind for event in self.events])
+        stats = self.collector.snapshot()[shape(text)]
+        self.assertEqual(2, stats['count'])
+        self.assertEqual(2, stats['rows'])
+        self.assertGreater(stats['bytes'], 0)
+        self.assertGreater(stats['render_time'], 0)
+        self.assertGreaterEqual(stats['network_time'], stats['server_time'])
+        self.assertEqual(1, self.collector.snapshot()[shape('RETURN 1')]['count'])
+
+    def test_errors_are_recorded(self):
+        def respond(body):
+            return 200, {'results': [], 'errors': [{'code': 'Neo.ClientError', 'message': 'bad'}]}, False
+
+        with StubServer(respond) as server:
+            with self.assertRaises(CypherError):
+                Connection(ConnectionPool(port=server.port)).execute('RETURN')
+        self.assertEqual(1, self.collector.snapshot()[shape('RETURN')]['errors'])
+
+    def test_failing_subscriber_is_isolated(self):
+        def failing(event):
+            raise RuntimeError()
+
+        records = []
+        handler = logging.Handler()
+        handler.emit = records.append
+        logger.addHandler(handler)
+        self.addCleanup(logger.removeHandler, handler)
+        instrumentation.subscribe(failing)
+        self.addCleanup(instrumentation.unsubscribe, failing)
+        Match(Node('n')).return_('n').build()
+        self.assertEqual(1, len(self.events))
+        self.assertEqual(1, len(records))
+
+    def test_exporters(self):
+        lines = []
+        exporter = StatsdExporter(lines.append, prefix='neo')
+        instrumentation.requested(['RETURN 1'], network_time=0.002, server_time=0.001, rows=[3], size=10)
+        for event in self.events:
+            exporter(event)
+
+        key = shape('RETURN 1')
+        self.assertEqual([
+            'neo.{}.network:2.000|ms'.format(key),
+            'neo.{}.server:1.000|ms'.format(key),
+            'neo.{}.rows:3|c'.format(key),
+            'neo.{}.bytes:10|c'.format(key),
+        ], lines)
+        text = prometheus(self.collector, prefix='neo')
+        self.assertIn('# TYPE neo_rows_total counter', text)
+        self.assertIn('neo_rows_total{{shape="{}"}} 3'.format(key), text)
+        self.assertIn('neo_network_time_seconds_total{{shape="{}"}} 0.002'.format(key), text)
+
+    def test_panel_content(self):
+        panel = Neo4jPanel()
+        panel.get_stats = lambda: {'shapes': {
+            'a': dict(statement='RETURN <1>', count=1, render_time=0, server_time=0, network_time=0.001, rows=1,
+                      bytes=2, errors=0),
+        }}
+        self.assertIn('<code>RETURN &lt;1&gt;</code>', panel.content)
+        self.assertEqual('1 statements in 1.00ms', panel.nav_subtitle)
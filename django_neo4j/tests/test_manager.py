@@ -0,0 +1,118 @@
+# coding=utf-8
+from __future__ import unicode_literals
+
+import unittest
+
+from django_neo4j.exception import QueryError
+from django_neo4j.manager import GraphManager, GraphNode, Prefetch
+from django_neo4j.operation import ops
+
+
+class FakeConnection(object):
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.statements = []
+
+    def execute(self, statement, parameters=None):
+        self.statements.append((statement, parameters))
+        rows = self.responses.pop(0) if self.responses else []
+        return {'columns': [], 'data': [{'row': row} for row in rows]}
+
+
+class GraphQuerySetTest(unittest.TestCase):
+    def test_lazy_and_cached(self):
+        connection = FakeConnection([[1, {'name': 'a'}], [2, {'name': 'b'}]])
+        queryset = GraphManager('Person', connection=connection).filter(age__gte=18).order_by('-age')
+        self.assertEqual([], connection.statements)
+        self.assertEqual(['a', 'b'], [node['name'] for node in queryset])
+        self.assertEqual(2, len(queryset))
+        self.assertEqual(1, len(connection.statements))
+        self.assertEqual(
+            ('MATCH (n:Person) WHERE n.age>=$p0 RETURN id(n), n ORDER BY n.age DESC', {'p0': 18}),
+            connection.statements[0],
+        )
+
+    def test_chaining_does_not_mutate(self):
+        people = GraphManager('Person', connection=FakeConnection()).all()
+        adults = people.filter(ops.comparison.gte(people.node['age'], 18))
+        self.assertEqual('MATCH (n:Person) RETURN id(n), n', people.query().build()[0])
+        self.assertEqual('MATCH (n:Person) WHERE n.age>=$p0 RETURN id(n), n', adults.query().build()[0])
+
+    def test_lookups(self):
+        queryset = GraphManager('P', connection=FakeConnection()).filter(name__in=['a'], nick__isnull=True).exclude(
+            city='x',
+        )
+        self.assertEqual(
+            'MATCH (n:P) WHERE (n.name IN $p0) AND (n.nick IS NULL) AND (NOT (n.city=$p1)) RETURN id(n), n',
+            queryset.query().build()[0],
+        )
+        with self.assertRaises(QueryError):
+            queryset.filter(name__like='a')
+
+    def test_slicing(self):
+        connection = FakeConnection([[3, {}]])
+        queryset = GraphManager('P', connection=connection).all()[10:30][5:10]
+        self.assertEqual([GraphNode(3, {})], list(queryset))
+        self.assertEqual(('MATCH (n:P) RETURN id(n), n SKIP $p0 LIMIT $p1', {'p0': 15, 'p1': 5}),
+                         connection.statements[0])
+        with self.assertRaises(QueryError):
+            queryset[::2]
+
+    def test_count_and_first(self):
+        connection = FakeConnection([[7]], [])
+        manager = GraphManager('P', connection=connection)
+        self.assertEqual(7, manager.count())
+        self.assertIsNone(manager.filter(name='x').first())
+        self.assertEqual('MATCH (n:P) RETURN count(n)', connection.statements[0][0])
+        self.assertTrue(connection.statements[1][0].endswith('LIMIT $p1'))
+
+
+class IteratorTest(unittest.TestCase):
+    def test_offset_chunks(self):
+        connection = FakeConnection([[1, {}], [2, {}]], [[3, {}]])
+        nodes = list(GraphManager('P', connection=connection).iterator(chunk_size=2))
+        self.assertEqual([1, 2, 3], [node.id for node in nodes])
+        self.assertEqual(
+            [('MATCH (n:P) RETURN id(n), n ORDER BY id(n) LIMIT $p0', {'p0': 2}),
+             ('MATCH (n:P) RETURN id(n), n ORDER BY id(n) SKIP $p0 LIMIT $p1', {'p0': 2, 'p1': 2})],
+            connection.statements,
+        )
+
+    def test_keyset_chunks(self):
+        connection = FakeConnection([[1, {'uid': 'a'}], [2, {'uid': 'a'}]], [])
+        nodes = list(GraphManager('P', connection=connection).iterator(chunk_size=2, key='uid'))
+        self.assertEqual(2, len(nodes))
+        self.assertEqual(
+            'MATCH (n:P) WHERE n.uid IS NOT NULL RETURN id(n), n ORDER BY n.uid, id(n) LIMIT $p0',
+            connection.statements[0][0],
+        )
+        self.assertEqual(
+            ('MATCH (n:P) WHERE (n.uid IS NOT NULL) AND (n.uid>=$p0) AND ((n.uid>$p1) OR (id(n)>$p2))'
+             ' RETURN id(n), n ORDER BY n.uid, id(n) LIMIT $p3', {'p0': 'a', 'p1': 'a', 'p2': 2, 'p3': 2}),
+            connection.statements[1],
+        )
+
+    def test_keyset_rejects_ordering(self):
+        with self.assertRaises(QueryError):
+            list(GraphManager('P', connection=FakeConnection()).order_by('age').iterator(key='uid'))
+
+
+class PrefetchTest(unittest.TestCase):
+    def test_prefetch(self):
+        connection = FakeConnection(
+            [[1, {'name': 'a'}], [2, {'name': 'b'}]],
+            [[1, [[3, {'name': 'c'}]]]],
+        )
+        queryset = GraphManager('Person', connection=connection).prefetch_related(
+            Prefetch('KNOWS', label='Person', to_attr='friends'),
+        )
+        a, b = list(queryset)
+        self.assertEqual([GraphNode(3, {})], a.related('friends'))
+        self.assertEqual([], b.related('friends'))
+        self.assertEqual(
+            ('UNWIND $p0 AS id MATCH (n)-[:KNOWS]->(m:Person) WHERE id(n)=id RETURN id, collect([id(m), m])',
+             {'p0': [1, 2]}),
+            connection.statements[1],
+        )
+        with self.assertRaises(QueryError):
+            a.related('missing')
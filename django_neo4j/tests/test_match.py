@@ -0,0 +1,69 @@
+# coding=utf-8
+from __future__ import unicode_literals
+
+import unittest
+
+from django_neo4j.exception import QueryError
+from django_neo4j.expression import Alias
+from django_neo4j.match import Match, Query
+from django_neo4j.operation import ops
+from django_neo4j.pattern import Node
+
+
+class NodeTest(unittest.TestCase):
+    def test_render(self):
+        self.assertEqual('()', Node().render())
+        self.assertEqual('(n:Person)', Node('n', 'Person').render())
+        self.assertEqual(
+            '(n:Person:`Odd Label` {age: 42, name: "x"})',
+            Node('n', ['Person', 'Odd Label'], {'name': 'x', 'age': 42}).render(),
+        )
+        self.assertEqual('n.age', Node('n')['age'].render())
+        with self.assertRaises(QueryError):
+            Node()['age']
+
+
+class QueryTest(unittest.TestCase):
+    def test_build(self):
+        n = Node('n', 'Person')
+        query = Match(n).where(ops.comparison.gt(n['age'], 18)).where(ops.comparison.starts_with(n['name'], 'A'))
+        query.return_('n', (n['name'], 'name')).order_by('-n.age', n['name']).skip(10).limit(5)
+        self.assertEqual(
+            (
+                'MATCH (n:Person) WHERE (n.age>$p0) AND (n.name STARTS WITH $p1) '
+                'RETURN n, n.name AS name ORDER BY n.age DESC, n.name SKIP $p2 LIMIT $p3',
+                {'p0': 18, 'p1': 'A', 'p2': 10, 'p3': 5},
+            ),
+            query.build(),
+        )
+
+    def test_clone_is_copy_on_write(self):
+        n = Node('n', 'Person')
+        base = Match(n)
+        adults = base.clone().where(ops.comparison.gte(n['age'], 18)).return_('n')
+        base.where(ops.comparison.lt(n['age'], 18))
+        children = base.clone().return_(Alias(n['name'], 'name'), distinct=True)
+
+        self.assertEqual('MATCH (n:Person) WHERE n.age>=18 RETURN n', adults.render())
+        self.assertEqual('MATCH (n:Person) WHERE n.age<18 RETURN DISTINCT n.name AS name', children.render())
+        self.assertEqual('MATCH (n:Person) WHERE n.age<18', base.render())
+
+    def test_same_shape_same_text(self):
+        n = Node('n', 'Person')
+        texts = set(
+            Match(Node('n', 'Person', {'id': value})).where(ops.comparison.eq(n['name'], value * 2)).build()[0]
+            for value in (1, 2, 3)
+        )
+        self.assertEqual({'MATCH (n:Person {id: $p0}) WHERE n.name=$p1'}, texts)
+
+    def test_where_placement(self):
+        with self.assertRaises(QueryError):
+            Query().where(ops.comparison.eq(1, 1))
+        with self.assertRaises(QueryError):
+            Match(Node('n')).return_('n').where(ops.comparison.eq(1, 1))
+
+    def test_unwind_with(self):
+        query = Query().unwind([1, 2], 'x').with_('x', distinct=True).return_('x')
+        self.assertEqual(('UNWIND $p0 AS x WITH DISTINCT x RETURN x', {'p0': [1, 2]}), query.build())
+        self.assertEqual(query.statement, query.clone().statement)
+        self.assertEqual(1, len({query.statement, query.clone().statement}))
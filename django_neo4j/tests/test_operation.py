@@ -4,9 +4,20 @@ from __future__ import unicode_literals
 import decimal
 import unittest
 
-from django_neo4j.exception import OperationArgumentTypeError, OperationArityError, OperationArgumentMismatchError
-from django_neo4j.operation import ops, Operation
-from django_neo4j.type import NULL
+import six
+
+try:
+    # noinspection PyUnresolvedReferences
+    import numpy
+except ImportError:
+    numpy = None
+
+from django_neo4j.exception import OperationArgumentTypeError, OperationArityError, OperationArgumentMismatchError, \
+    OperationColumnError
+from django_neo4j.expression import Expression
+from django_neo4j.operation import ops, Operation, INFIX, _Lazy, _OPERATIONS, _TableOperation
+from django_neo4j.parameter import Parameters
+from django_neo4j.type import NULL, Identifier
 from django_neo4j.util import to_long
 
 
@@ -33,7 +44,7 @@ class MathematicalOperationsTest(OperationTest):
             [to_long(-1), to_long(-2)],
             [decimal.Decimal('-1.2'), decimal.Decimal('-2.2')],
         ]:
-            self.assertEquals(u'{}{}{}'.format(args[0], symbol, args[1]), method(*args))
+            self.assertEquals(u'{}{}{}'.format(args[0], symbol, args[1]), method(*args).render())
 
         for args in [
             ['', 1],
@@ -83,10 +94,10 @@ class ComparisonOperation(OperationTest):
             ]:
                 self.assertEquals(
                     u'{}{}'.format(
-                        u'"{}"'.format(a) if isinstance(a, (str, unicode)) else a,
+                        u'"{}"'.format(a) if isinstance(a, six.string_types) else a,
                         symbol,
                     ),
-                    method(a),
+                    method(a).render(),
                 )
 
             for arg in (
@@ -113,11 +124,11 @@ class ComparisonOperation(OperationTest):
                 else:
                     self.assertEquals(
                         u'{}{}{}'.format(
-                            u'"{}"'.format(args[0]) if isinstance(args[0], (str, unicode)) else args[0],
+                            u'"{}"'.format(args[0]) if isinstance(args[0], six.string_types) else args[0],
                             symbol,
-                            u'"{}"'.format(args[1]) if isinstance(args[1], (str, unicode)) else args[1],
+                            u'"{}"'.format(args[1]) if isinstance(args[1], six.string_types) else args[1],
                         ),
-                        method(*args),
+                        method(*args).render(),
                     )
 
             for args in (
@@ -164,3 +175,161 @@ class ComparisonOperation(OperationTest):
 
     def test_is_in(self):
         pass
+
+
+class OperationDispatchTest(OperationTest):
+    def test_repeated_calls(self):
+        for _ in range(3):
+            self.assertEqual('1+2', ops.mathematical.add(1, 2).render())
+            self.assertEqual('1.5+2', ops.mathematical.add(1.5, 2).render())
+
+    def test_invalid_types_not_cached(self):
+        for _ in range(2):
+            with self.assertRaises(OperationArgumentTypeError):
+                ops.mathematical.add('', 1)
+            with self.assertRaises(OperationArgumentMismatchError):
+                ops.comparison.eq(1, '')
+
+        self.assertArity(ops.mathematical.add)
+
+    def test_value_validation_on_cached_types(self):
+        self.assertEqual('1/2', ops.mathematical.divide(1, 2).render())
+        with self.assertRaises(ZeroDivisionError):
+            ops.mathematical.divide(1, 0)
+
+    def test_trusted(self):
+        self.assertEqual('1/0', ops.mathematical.divide.trusted(1, 0).render())
+        self.assertEqual('"a"=1', ops.comparison.eq.trusted('a', 1).render())
+
+
+class OperationBatchTest(OperationTest):
+    def test_many(self):
+        self.assertEqual(
+            ['1+4', '2+5', '3+6'],
+            [e.render() for e in ops.mathematical.add.many([1, 2, 3], (4, 5, 6))],
+        )
+        self.assertEqual(
+            ['n.a=1', 'n.a="x"'],
+            [e.render() for e in ops.comparison.eq.many(Identifier('n.a'), [1, 'x'])],
+        )
+        self.assertEqual([], ops.mathematical.add.many([], []))
+
+    def test_many_validation(self):
+        with self.assertRaises(OperationArgumentTypeError):
+            ops.mathematical.add.many([1, 2], [3, ''])
+        with self.assertRaises(ZeroDivisionError):
+            ops.mathematical.divide.many([1, 2], [1, 0])
+        with self.assertRaises(OperationColumnError):
+            ops.mathematical.add.many([1, 2], [1])
+        with self.assertRaises(OperationColumnError):
+            ops.mathematical.add.many(1, 2)
+        with self.assertRaises(OperationArityError):
+            ops.mathematical.add.many([1])
+
+    def test_unwind(self):
+        expression, rows = ops.comparison.eq.unwind(Identifier('n.id'), [1, 2, 3])
+        self.assertEqual('n.id=row.c1', expression.render())
+        self.assertEqual([{'c1': 1}, {'c1': 2}, {'c1': 3}], rows)
+
+        with self.assertRaises(ZeroDivisionError):
+            ops.mathematical.divide.unwind(Identifier('n.a'), [1, 0])
+
+    @unittest.skipIf(numpy is None, 'numpy not installed')
+    def test_many_numpy(self):
+        self.assertEqual(
+            ['1+1', '2+1'],
+            [e.render() for e in ops.mathematical.add.many(numpy.array([1, 2]), 1)],
+        )
+
+
+class OperationLazyTest(unittest.TestCase):
+    def test_built_once_on_first_access(self):
+        built = []
+
+        class Family(object):
+            operation = _Lazy(lambda: built.append(1) or object())
+
+        self.assertFalse(Family.__dict__['operation'].built)
+        self.assertIs(Family().operation, Family.operation)
+        self.assertEqual([1], built)
+
+    def test_families_share_operations(self):
+        self.assertIs(ops.comparison, ops.c)
+        self.assertIs(ops.comparison.eq, ops.compare.equal_to)
+        self.assertIs(ops.mathematical.add, ops.m.add)
+
+
+class BooleanOperationsTest(OperationTest):
+    def test_and_or_are_flattened(self):
+        a, b, c = Identifier('n.a'), Identifier('n.b'), Identifier('n.c')
+        expression = ops.boolean.and_(ops.boolean.and_(a, ops.comparison.gt(b, 1)), c)
+        self.assertEqual(3, len(expression.operands))
+        self.assertEqual('n.a AND (n.b>1) AND n.c', expression.render())
+        self.assertEqual('n.a OR (n.b AND n.c)', ops.boolean.or_(a, ops.boolean.and_(b, c)).render())
+        self.assertEqual('NOT (n.a XOR n.b)', ops.boolean.not_(ops.boolean.xor(a, b)).render())
+        self.assertEqual('$p0 AND n.a', ops.boolean.all(True, a).render(Parameters()))
+        self.assertEqual('false OR n.a', ops.boolean.any(False, a).render())
+
+    def test_types_and_arity(self):
+        with self.assertRaises(OperationArgumentTypeError):
+            ops.boolean.and_(Identifier('n.a'), 'x')
+        with self.assertRaises(OperationArityError):
+            ops.boolean.or_(Identifier('n.a'))
+        self.assertArity(ops.boolean.not_, Operation.UNARY)
+
+
+class StringOperationsTest(OperationTest):
+    def test_functions(self):
+        name = Identifier('n.name')
+        self.assertEqual('toLower(n.name)', ops.string.lower(name).render())
+        self.assertEqual('substring(n.name, 1)', ops.string.substring(name, 1).render())
+        self.assertEqual('substring(n.name, 1, 2)', ops.string.substring(name, 1, 2).render())
+        self.assertEqual('replace(n.name, "a", "b")', ops.string.replace(name, 'a', 'b').render())
+        self.assertEqual('n.name+$p0+$p1', ops.string.concat(name, 'x', 'y').render(Parameters()))
+        with self.assertRaises(OperationArgumentTypeError):
+            ops.string.left(name, 'x')
+        with self.assertRaises(OperationArityError):
+            ops.string.substring(name)
+
+
+class CollectionOperationsTest(OperationTest):
+    def test_operations(self):
+        tags = Identifier('n.tags')
+        self.assertEqual('n.tags[0]', ops.collection.index(tags, 0).render())
+        self.assertEqual('n.tags[$p0..$p1]', ops.collection.slice(tags, 1, 3).render(Parameters()))
+        self.assertEqual('$p0 IN n.tags', ops.collection.in_('x', tags).render(Parameters()))
+        self.assertEqual('size(n.tags+$p0)', ops.collection.size(ops.collection.concat(tags, [1])).render(Parameters()))
+        self.assertEqual('range(0, 10, 2)', ops.collection.range(0, 10, 2).render())
+        with self.assertRaises(OperationArgumentTypeError):
+            ops.collection.index(tags, 'x')
+
+
+class RegexOperationsTest(OperationTest):
+    def test_matches(self):
+        self.assertEqual('n.name =~ $p0', ops.regex.matches(Identifier('n.name'), '(?i)a.*').render(Parameters()))
+        with self.assertRaises(OperationArgumentTypeError):
+            ops.regex.matches(Identifier('n.name'), 1)
+
+
+class OperationTableTest(unittest.TestCase):
+    def test_every_row_is_reachable(self):
+        families = {'Boolean': ops.boolean, 'String': ops.string, 'Collection': ops.collection, 'Regex': ops.regex}
+        for family, name, _, _, _, _, _, _, attributes in _OPERATIONS:
+            for attribute in attributes:
+                operation = getattr(families[family], attribute)
+                self.assertEqual((family, name), (operation.type, operation.name))
+
+    def test_dispatch_is_precomputed(self):
+        checks = []
+
+        class Counting(_TableOperation):
+            def _type_check(self, *args):
+                checks.append(args)
+                return super(Counting, self)._type_check(*args)
+
+        operation = Counting('and', ' AND ', INFIX, Operation.VARIADIC, 2, ((bool, Expression),), True)
+        operation(True, Identifier('n.a'))
+        operation(NULL, False)
+        self.assertEqual([], checks)
+        operation(True, False, True)
+        self.assertEqual(1, len(checks))
@@ -0,0 +1,87 @@
+# coding=utf-8
+from __future__ import unicode_literals
+
+import base64
+import unittest
+
+from django.core.paginator import EmptyPage, InvalidPage
+
+from django_neo4j.exception import QueryError
+from django_neo4j.manager import GraphManager
+from django_neo4j.pagination import Cursor, KeysetPaginator, Seek
+from django_neo4j.tests.test_manager import FakeConnection
+
+
+def rows(*ids):
+    return [[node_id, {'name': 'n{}'.format(node_id)}] for node_id in ids]
+
+
+class CursorTest(unittest.TestCase):
+    def test_round_trip(self):
+        cursor = Cursor('é', 12, backwards=True)
+        self.assertEqual(cursor, Cursor.decode(cursor.encode()))
+        self.assertNotIn('=', cursor.encode())
+        with self.assertRaises(QueryError):
+            Cursor.decode('not a cursor')
+
+    def test_tampered(self):
+        for data in ('[{"a":1},1,0]', '[[1],1,0]', '["a","1",0]', '["a",true,0]', '["a",1.5,0]', '"abc"'):
+            token = base64.urlsafe_b64encode(data.encode('utf-8')).decode('ascii')
+            with self.assertRaises(QueryError):
+                Cursor.decode(token)
+        self.assertEqual(Cursor(None, 3), Cursor.decode(Cursor(None, 3).encode()))
+
+
+class SeekTest(unittest.TestCase):
+    def test_pages(self):
+        connection = FakeConnection(rows(1, 2, 3), rows(3))
+        seek = Seek(GraphManager('P', connection=connection).all(), 'name', 2)
+        nodes, previous, following = seek.page()
+        self.assertEqual([1, 2], [node.id for node in nodes])
+        self.assertIsNone(previous)
+        self.assertEqual(Cursor('n2', 2), following)
+
+        nodes, previous, following = seek.page(following)
+        self.assertEqual([3], [node.id for node in nodes])
+        self.assertEqual(Cursor('n3', 3, backwards=True), previous)
+        self.assertIsNone(following)
+        self.assertEqual(
+            ('MATCH (n:P) WHERE (n.name IS NOT NULL) AND (n.name>=$p0) AND ((n.name>$p1) OR (id(n)>$p2))'
+             ' RETURN id(n), n ORDER BY n.name, id(n) LIMIT $p3', {'p0': 'n2', 'p1': 'n2', 'p2': 2, 'p3': 3}),
+            connection.statements[1],
+        )
+
+    def test_backwards(self):
+        connection = FakeConnection(rows(4, 3, 2))
+        seek = Seek(GraphManager('P', connection=connection).all(), 'name', 2, descending=True)
+        nodes, previous, following = seek.page(Cursor('n5', 5, backwards=True))
+        self.assertEqual([3, 4], [node.id for node in nodes])
+        self.assertEqual(Cursor('n3', 3, backwards=True), previous)
+        self.assertEqual(Cursor('n4', 4), following)
+        self.assertIn('(n.name>=$p0) AND ((n.name>$p1) OR (id(n)>$p2))', connection.statements[0][0])
+        self.assertIn('ORDER BY n.name, id(n)', connection.statements[0][0])
+
+    def test_page_size(self):
+        with self.assertRaises(QueryError):
+            Seek(GraphManager('P').all(), 'name', 0)
+
+
+class KeysetPaginatorTest(unittest.TestCase):
+    def test_paginator(self):
+        connection = FakeConnection(rows(1, 2, 3), rows(3), [])
+        paginator = KeysetPaginator(GraphManager('P', connection=connection).all(), 2, 'name')
+        page = paginator.page(1)
+        self.assertEqual(2, len(page))
+        self.assertFalse(page.has_previous())
+        self.assertTrue(page.has_next())
+
+        last = paginator.page(page.next_page_number())
+        self.assertEqual(['n3'], [node['name'] for node in last])
+        self.assertEqual(Cursor('n3', 3, backwards=True).encode(), last.previous_page_number())
+        self.assertEqual((1, 1), (last.start_index(), last.end_index()))
+        with self.assertRaises(EmptyPage):
+            last.next_page_number()
+        with self.assertRaises(EmptyPage):
+            paginator.page(Cursor('n9', 9).encode())
+        with self.assertRaises(InvalidPage):
+            paginator.page('%%%')
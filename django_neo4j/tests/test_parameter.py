@@ -0,0 +1,54 @@
+# coding=utf-8
+from __future__ import unicode_literals
+
+import unittest
+
+from django_neo4j.operation import ops
+from django_neo4j.parameter import Parameters
+from django_neo4j.type import NULL, Identifier
+
+
+class ParametersTest(unittest.TestCase):
+    def test_inline_without_context(self):
+        self.assertEqual('n.age>42', ops.comparison.gt(Identifier('n.age'), 42).render())
+        self.assertIsNone(Parameters.current())
+
+    def test_dollar_placeholders(self):
+        with Parameters() as params:
+            self.assertEqual('n.name=$p0', ops.comparison.eq(Identifier('n.name'), 'abc').render())
+            self.assertEqual('$p1+$p2', ops.mathematical.add(1, 2).render())
+
+        self.assertEqual({'p0': 'abc', 'p1': 1, 'p2': 2}, params.values)
+        self.assertIsNone(Parameters.current())
+
+    def test_braces_placeholders(self):
+        with Parameters(style=Parameters.BRACES, prefix='v') as params:
+            self.assertEqual('n.age>={v0}', ops.comparison.gte(Identifier('n.age'), 18).render())
+
+        self.assertEqual({'v0': 18}, params.values)
+
+    def test_identical_structure_renders_identical_text(self):
+        rendered = []
+        for value in (1, 2, 3):
+            with Parameters():
+                rendered.append(ops.comparison.lt(Identifier('n.age'), value).render())
+
+        self.assertEqual(1, len(set(rendered)))
+
+    def test_null_not_bound(self):
+        with Parameters() as params:
+            self.assertEqual('NULL IS NULL', ops.comparison.is_null(NULL).render())
+
+        self.assertEqual(0, len(params))
+
+    def test_nested_contexts(self):
+        with Parameters() as outer:
+            with Parameters(prefix='q') as inner:
+                ops.comparison.eq(Identifier('n.a'), 1).render()
+                self.assertIs(inner, Parameters.current())
+
+            ops.comparison.eq(Identifier('n.b'), 2).render()
+            self.assertIs(outer, Parameters.current())
+
+        self.assertEqual({'q0': 1}, inner.values)
+        self.assertEqual({'p0': 2}, outer.values)
@@ -0,0 +1,128 @@
+# coding=utf-8
+from __future__ import unicode_literals
+
+import copy
+import logging
+import unittest
+
+from django_neo4j.connection import Connection, ConnectionPool
+from django_neo4j.exception import QueryError
+from django_neo4j.plan import CHANGED, DB_HITS, EXPLAIN, NEW_SCAN, PlanMonitor, logger, parse
+from django_neo4j.tests.server import StubServer
+
+STATEMENT = 'MATCH (n:Person) WHERE n.name = $p0 RETURN n'
+
+SEEK = {
+    'root': {
+        'operatorType': 'ProduceResults',
+        'identifiers': ['n'],
+        'EstimatedRows': 1.0,
+        'DbHits': 0,
+        'Rows': 1,
+        'children': [{
+            'operatorType': 'NodeIndexSeek',
+            'identifiers': ['n'],
+            'EstimatedRows': 1.0,
+            'DbHits': 2,
+            'Rows': 1,
+            'Index': ':Person(name)',
+            'children': [],
+        }],
+    },
+}
+
+SCAN = {
+    'root': {
+        'operatorType': 'ProduceResults',
+        'identifiers': ['n'],
+        'EstimatedRows': 1.0,
+        'children': [{
+            'operatorType': 'Filter',
+            'identifiers': ['n'],
+            'EstimatedRows': 1.0,
+            'children': [{
+                'operatorType': 'NodeByLabelScan',
+                'identifiers': ['n'],
+                'EstimatedRows': 100.0,
+                'LabelName': ':Person',
+                'children': [],
+            }],
+        }],
+    },
+}
+
+
+def profiled(db_hits):
+    plan = copy.deepcopy(SEEK)
+    plan['root']['children'][0]['DbHits'] = db_hits
+    return plan
+
+
+class PlanTest(unittest.TestCase):
+    def test_parse(self):
+        plan = parse(SEEK)
+        self.assertTrue(plan.profiled)
+        self.assertEqual(['ProduceResults', 'NodeIndexSeek'], [o.operator_type for o in plan.operators])
+        self.assertEqual(':Person(name)', plan.operators[1].arguments['Index'])
+        self.assertEqual(2, plan.db_hits)
+        self.assertEqual(frozenset(), plan.scans)
+
+        plan = parse(SCAN)
+        self.assertFalse(plan.profiled)
+        self.assertIsNone(plan.db_hits)
+        self.assertEqual(frozenset(['NodeByLabelScan']), plan.scans)
+        with self.assertRaises(QueryError):
+            parse(None)
+
+    def test_fingerprint_ignores_counters(self):
+        self.assertEqual(parse(SEEK).fingerprint, parse(profiled(500)).fingerprint)
+        self.assertNotEqual(parse(SEEK).fingerprint, parse(SCAN).fingerprint)
+
+
+class PlanMonitorTest(unittest.TestCase):
+    def setUp(self):
+        self.records = []
+        handler = logging.Handler()
+        handler.emit = self.records.append
+        logger.addHandler(handler)
+        self.addCleanup(logger.removeHandler, handler)
+
+    def test_regressions(self):
+        monitor = PlanMonitor()
+        self.assertEqual([], monitor.compare(STATEMENT, parse(SEEK)))
+        self.assertEqual([], monitor.compare(STATEMENT, parse(profiled(3))))
+        self.assertEqual([DB_HITS], [r.kind for r in monitor.compare(STATEMENT, parse(profiled(10)))])
+        self.assertEqual([NEW_SCAN], [r.kind for r in monitor.compare(STATEMENT, parse(SCAN))])
+        self.assertEqual([], monitor.compare('RETURN 1', parse(SCAN)))
+        self.assertEqual(2, len(monitor.regressions))
+        self.assertEqual(2, len(self.records))
+
+    def test_changed_plan(self):
+        changed = copy.deepcopy(SEEK)
+        changed['root']['children'][0]['Index'] = ':Person(email)'
+        monitor = PlanMonitor()
+        monitor.compare(STATEMENT, parse(SEEK))
+        self.assertEqual([CHANGED], [r.kind for r in monitor.compare(STATEMENT, parse(changed))])
+
+    def test_execute_samples_with_profile(self):
+        plans = [SEEK, SCAN]
+
+        def respond(body):
+            statement = body['statements'][0]['statement']
+            result = {'columns': ['n'], 'data': [{'row': [1]}]}
+            if statement.startswith(('PROFILE ', 'EXPLAIN ')):
+                result['plan'] = plans.pop(0)
+            return 200, {'results': [result], 'errors': []}, False
+
+        with StubServer(respond) as server:
+            connection = Connection(ConnectionPool(port=server.port))
+            monitor = PlanMonitor(sample_rate=1)
+            self.assertEqual([{'row': [1]}], monitor.execute(STATEMENT, {'p0': 'a'}, connection=connection)['data'])
+            PlanMonitor(sample_rate=0).execute(STATEMENT, {'p0': 'a'}, connection=connection)
+            PlanMonitor(sample_rate=1, mode=EXPLAIN, store=monitor.baselines).execute(
+                STATEMENT, {'p0': 'a'}, connection=connection,
+            )
+
+        statements = [body['statements'][0]['statement'] for _, _, body in server.requests]
+        self.assertEqual(['PROFILE ' + STATEMENT, STATEMENT, 'EXPLAIN ' + STATEMENT, STATEMENT], statements)
+        self.assertEqual(1, len(monitor.baselines))
@@ -0,0 +1,73 @@
+# coding=utf-8
+from __future__ import unicode_literals
+
+import unittest
+import warnings
+
+from django_neo4j.exception import FanOutWarning, QueryError
+from django_neo4j.match import Match
+from django_neo4j.operation import ops
+from django_neo4j.pattern import Node
+from django_neo4j.relationship import (
+    INCOMING, MAX_HOPS, OUTGOING, Path, Relationship, Statistics, all_shortest_paths, shortest_path,
+)
+
+
+class RelationshipTest(unittest.TestCase):
+    def test_render(self):
+        self.assertEqual('--', Relationship().render())
+        self.assertEqual('-->', Relationship(direction=OUTGOING).render())
+        self.assertEqual('<-[r:KNOWS|LIKES]-', Relationship('r', ['KNOWS', 'LIKES'], INCOMING).render())
+        self.assertEqual('-[*2]-', Relationship(hops=2).render())
+        self.assertEqual('-[r*1..3]->', Relationship('r', hops=(1, 3), direction=OUTGOING).render())
+
+    def test_upper_bound_defaults(self):
+        self.assertEqual((1, MAX_HOPS), Relationship(hops=(1, None)).hops)
+        self.assertEqual('-[*1..]-', Relationship(hops=(1, None), unbounded=True).render())
+        with self.assertRaises(QueryError):
+            Relationship(hops=(3, 1))
+
+    def test_predicates_pushed_into_pattern(self):
+        r = Relationship('r', 'KNOWS', OUTGOING)
+        r = r.where(ops.comparison.eq(r['since'], 2010), ops.comparison.gt(r['weight'], 0.5))
+        self.assertEqual('-[r:KNOWS {since: 2010}]->', r.render())
+        self.assertEqual(['r.weight>0.5'], [p.render() for p in r.predicates])
+
+    def test_variable_length_predicates_are_quantified(self):
+        r = Relationship('r', 'KNOWS', hops=(1, 3))
+        r = r.where(ops.comparison.gt(r['weight'], 0.5))
+        self.assertEqual(['ALL(_r IN r WHERE _r.weight>0.5)'], [p.render() for p in r.predicates])
+
+
+class PathTest(unittest.TestCase):
+    def test_match(self):
+        a, b = Node('a', 'Person'), Node('b', 'Person')
+        r = Relationship('r', 'KNOWS', OUTGOING, hops=(1, 2))
+        r = r.where(ops.comparison.lt(r['since'], 2000))
+        text, parameters = Match(Path(a).via(r, b)).return_('b').build()
+        self.assertEqual(
+            'MATCH (a:Person)-[r:KNOWS*1..2]->(b:Person) WHERE ALL(_r IN r WHERE _r.since<$p0) RETURN b',
+            text,
+        )
+        self.assertEqual({'p0': 2000}, parameters)
+
+    def test_shortest_path(self):
+        path = Path(Node('a')).both(Node('b'), 'KNOWS', hops=(None, 6))
+        self.assertEqual('p = shortestPath((a)-[:KNOWS*..6]-(b))', shortest_path(path, 'p').render())
+        self.assertEqual('allShortestPaths((a)-[:KNOWS*..6]-(b))', all_shortest_paths(path).render())
+        with self.assertRaises(QueryError):
+            shortest_path(Path(Node('a')).both(Node('b'), hops=(1, None), unbounded=True))
+        with self.assertRaises(QueryError):
+            shortest_path(Path(Node('a')))
+
+    def test_fan_out_warning(self):
+        statistics = Statistics(default_degree=2)
+        statistics.update('KNOWS', 100)
+        path = Path(Node('a')).outgoing(Node('b'), 'KNOWS', hops=(1, 3))
+        self.assertEqual(100 + 100 ** 2 + 100 ** 3, path.estimate(statistics))
+        self.assertEqual(2, Path(Node('a')).outgoing(Node('b')).estimate(statistics))
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always')
+            path.check(limit=1000, statistics=statistics)
+            Match(Path(Node('a')).outgoing(Node('b'), hops=(1, None), unbounded=True))
+        self.assertEqual([FanOutWarning, FanOutWarning], [w.category for w in caught])
@@ -0,0 +1,78 @@
+# coding=utf-8
+from __future__ import unicode_literals
+
+import json
+import unittest
+
+from django_neo4j.connection import Connection, ConnectionPool
+from django_neo4j.exception import CypherError, TransportError
+from django_neo4j.result import ResultReader
+from django_neo4j.tests.server import StubServer
+from django_neo4j.type import NULL
+
+RESPONSE = {
+    'results': [
+        {
+            'columns': ['name', 'age'],
+            'data': [
+                {'row': ['élève', 12], 'meta': [None, None]},
+                {'row': [None, 1.5e3], 'meta': [None, None]},
+            ],
+            'stats': {'nodes_created': 0},
+        },
+        {'columns': ['n'], 'data': [{'row': [{'tags': ['a', None]}]}]},
+        {'columns': [], 'data': []},
+    ],
+    'errors': [],
+}
+
+
+def chunks(document, size):
+    encoded = json.dumps(document, indent=1, sort_keys=True).encode('utf-8')
+    return [encoded[i:i + size] for i in range(0, len(encoded), size)]
+
+
+class ResultReaderTest(unittest.TestCase):
+    def test_chunk_boundaries(self):
+        expected = [['élève', 12], [None, 1500.0], [{'tags': ['a', None]}]]
+        for size in range(1, 40):
+            self.assertEqual(expected, list(ResultReader(chunks(RESPONSE, size))))
+
+    def test_columns_and_index(self):
+        reader = ResultReader(chunks(RESPONSE, 7))
+        seen = [(reader.index, reader.columns) for _ in reader]
+        self.assertEqual([(0, ('name', 'age')), (0, ('name', 'age')), (1, ('n',))], seen)
+        self.assertEqual(2, reader.index)
+
+    def test_lazy(self):
+        consumed = []
+
+        def source():
+            for chunk in chunks(RESPONSE, 16):
+                consumed.append(chunk)
+                yield chunk
+
+        next(iter(ResultReader(source())))
+        self.assertLess(len(consumed), len(chunks(RESPONSE, 16)) // 2)
+
+    def test_typed(self):
+        reader = ResultReader(chunks(RESPONSE, 5), typed=True, converters={'age': int, 'n': len})
+        self.assertEqual([['élève', 12], [NULL, 1500], [1]], list(reader))
+        self.assertIs(NULL, list(ResultReader(chunks(RESPONSE, 5), typed=True))[2][0]['tags'][1])
+
+    def test_errors(self):
+        document = {'results': [], 'errors': [{'code': 'Neo.ClientError', 'message': 'bad'}]}
+        with self.assertRaises(CypherError):
+            list(ResultReader(chunks(document, 3)))
+        with self.assertRaises(TransportError):
+            list(ResultReader([b'{"results": [{"columns": [], "data": [{"row": [1']))
+
+    def test_connection_stream(self):
+        with StubServer(lambda body: (200, RESPONSE, False)) as server:
+            connection = Connection(ConnectionPool(port=server.port))
+            rows = connection.stream('MATCH (n) RETURN n', chunk_size=4)
+            self.assertEqual(['élève', 12], next(rows))
+            self.assertEqual(1, connection.pool.stats['in_use'])
+            self.assertEqual(2, len(list(rows)))
+            self.assertEqual(0, connection.pool.stats['in_use'])
+            self.assertEqual(1, connection.pool.stats['idle'])
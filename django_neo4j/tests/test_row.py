@@ -0,0 +1,85 @@
+# coding=utf-8
+from __future__ import unicode_literals
+
+import array
+import unittest
+
+try:
+    # noinspection PyUnresolvedReferences
+    import numpy
+except ImportError:
+    numpy = None
+
+from django_neo4j.connection import Connection, ConnectionPool
+from django_neo4j.exception import QueryError
+from django_neo4j.row import ColumnSet, RowSet, row_type
+from django_neo4j.tests.server import StubServer
+
+RESPONSE = (
+    b'{"results": [{"columns": ["name", "age"], "data": [{"row": ["a", 1]}, {"row": ["b", 2]}, {"row": ["c", 3]}]}],'
+    b' "errors": []}'
+)
+
+
+class RowTest(unittest.TestCase):
+    def test_row(self):
+        row = row_type(['name', 'n.age'])(['a', 1])
+        self.assertEqual(('a', 1), row)
+        self.assertEqual(1, row['n.age'])
+        self.assertEqual('a', row[0])
+        self.assertEqual({'name': 'a', 'n.age': 1}, row.as_dict())
+        self.assertIsNone(row.get('missing'))
+        with self.assertRaises(QueryError):
+            row['missing']
+        with self.assertRaises(AttributeError):
+            row.extra = 1
+
+    def test_row_set(self):
+        rows = RowSet(['name', 'age'])
+        rows.extend([['a', 1], ['b', 2]])
+        self.assertEqual(2, len(rows))
+        self.assertEqual('b', rows[1]['name'])
+        self.assertEqual([{'name': 'a', 'age': 1}, {'name': 'b', 'age': 2}], list(rows.dicts()))
+
+
+class ColumnSetTest(unittest.TestCase):
+    def test_columns(self):
+        columns = ColumnSet(['id', 'score', 'name', 'mixed'])
+        columns.extend([[1, 0.5, 'a', 1], [2, 1.5, 'b', 'x'], [3, 2.5, None, 2]])
+        self.assertEqual(array.array(str('l'), [1, 2, 3]), columns.column('id'))
+        self.assertEqual(array.array(str('d'), [0.5, 1.5, 2.5]), columns.column('score'))
+        self.assertEqual(['a', 'b', None], columns.column('name'))
+        self.assertEqual([1, 'x', 2], columns.column('mixed'))
+        self.assertEqual((3, 2.5, None, 2), columns[-1])
+        self.assertEqual(2.5, columns[2]['score'])
+        self.assertEqual([1, 2, 3], [row['id'] for row in columns])
+        with self.assertRaises(IndexError):
+            columns[3]
+        with self.assertRaises(QueryError):
+            columns.append([1])
+
+    def test_overflow_falls_back_to_list(self):
+        columns = ColumnSet(['id'])
+        columns.extend([[1], [2 ** 70], [True]])
+        self.assertEqual([1, 2 ** 70, True], columns.column('id'))
+
+    @unittest.skipIf(numpy is None, 'numpy not installed')
+    def test_to_numpy(self):
+        columns = ColumnSet(['id', 'name'])
+        columns.extend([[1, 'a'], [2, 'b']])
+        arrays = columns.to_numpy()
+        self.assertEqual([1, 2], arrays['id'].tolist())
+        self.assertEqual(['a', 'b'], arrays['name'].tolist())
+
+    def test_connection_fetch(self):
+        with StubServer(lambda body: (200, RESPONSE, False)) as server:
+            connection = Connection(ConnectionPool(port=server.port))
+            rows = connection.fetch('MATCH (n) RETURN n.name AS name, n.age AS age', chunk_size=5)
+            columns = connection.fetch('MATCH (n) RETURN n.name AS name, n.age AS age', columnar=True)
+            empty = Connection(ConnectionPool(port=server.port)).fetch('RETURN 1')
+
+        self.assertIsInstance(rows, RowSet)
+        self.assertEqual(('c', 3), rows[2])
+        self.assertEqual(array.array(str('l'), [1, 2, 3]), columns.column('age'))
+        self.assertEqual(('name', 'age'), empty.columns)
+        self.assertEqual(0, connection.pool.stats['in_use'])
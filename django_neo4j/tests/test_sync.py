@@ -0,0 +1,121 @@
+# coding=utf-8
+from __future__ import unicode_literals
+
+from django.contrib.auth.models import Group, User
+from django.db import transaction
+from django.test import TransactionTestCase
+
+from django_neo4j.sync import Synchronizer
+
+
+class SynchronizerTest(TransactionTestCase):
+    def setUp(self):
+        self.sent = []
+        self.synchronizer = self.create()
+
+    def create(self, **kwargs):
+        synchronizer = Synchronizer(execute=lambda *statement: self.sent.append(statement), **kwargs)
+        synchronizer.register(User, label='Person', fields=['username', 'email'])
+        synchronizer.register(Group)
+        synchronizer.connect()
+        self.addCleanup(synchronizer.disconnect)
+        return synchronizer
+
+    def test_save_and_delete(self):
+        user = User.objects.create(username='a', email='a@example.com')
+        self.assertEqual([(
+            'UNWIND $rows AS row MERGE (n:Person {id: row.id}) SET n += row',
+            {'rows': [{'id': user.pk, 'username': 'a', 'email': 'a@example.com'}]},
+        )], self.sent)
+
+        pk = user.pk
+        user.delete()
+        self.assertEqual(
+            ('UNWIND $keys AS key MATCH (n:Person {id: key}) DETACH DELETE n', {'keys': [pk]}),
+            self.sent[-1],
+        )
+
+    def test_deferred_changes_are_coalesced(self):
+        with self.synchronizer.deferred():
+            first = User.objects.create(username='a')
+            first.email = 'a@example.com'
+            first.save()
+            second = User.objects.create(username='b')
+            second.delete()
+            group = Group.objects.create(name='g')
+            first.groups.add(group)
+            self.assertEqual([], self.sent)
+
+        statements = [statement for statement, _ in self.sent]
+        self.assertEqual([
+            'UNWIND $rows AS row MERGE (n:Person {id: row.id}) SET n += row',
+            'UNWIND $rows AS row MERGE (n:Group {id: row.id}) SET n += row',
+            'UNWIND $pairs AS pair MATCH (a:Person {id: pair.a}), (b:Group {id: pair.b}) MERGE (a)-[:GROUPS]->(b)',
+            'UNWIND $keys AS key MATCH (n:Person {id: key}) DETACH DELETE n',
+        ], statements)
+        self.assertEqual([{'id': first.pk, 'username': 'a', 'email': 'a@example.com'}], self.sent[0][1]['rows'])
+        self.assertEqual({'pairs': [{'a': first.pk, 'b': group.pk}]}, self.sent[2][1])
+
+    def test_m2m_remove_and_clear(self):
+        user = User.objects.create(username='a')
+        group = Group.objects.create(name='g')
+        del self.sent[:]
+        user.groups.add(group)
+        user.groups.remove(group)
+        group.user_set.clear()
+        self.assertEqual([
+            'UNWIND $pairs AS pair MATCH (a:Person {id: pair.a}), (b:Group {id: pair.b}) MERGE (a)-[:GROUPS]->(b)',
+            'UNWIND $pairs AS pair MATCH (a:Person {id: pair.a}), (b:Group {id: pair.b}) '
+            'MATCH (a)-[r:GROUPS]->(b) DELETE r',
+            'MATCH ()-[r:GROUPS]->(n:Group {id: $key}) DELETE r',
+        ], [statement for statement, _ in self.sent])
+
+    def test_transaction_is_coalesced_until_commit(self):
+        with transaction.atomic():
+            User.objects.create(username='a')
+            with transaction.atomic():
+                User.objects.create(username='b')
+            self.assertEqual([], self.sent)
+
+        self.assertEqual(1, len(self.sent))
+        self.assertEqual(['a', 'b'], [row['username'] for row in self.sent[0][1]['rows']])
+
+    def test_rollback_discards_changes(self):
+        with self.assertRaises(ValueError):
+            with transaction.atomic():
+                User.objects.create(username='a')
+                raise ValueError
+
+        User.objects.create(username='b')
+        self.assertEqual([['b']], [[row['username'] for row in parameters['rows']] for _, parameters in self.sent])
+
+    def test_rolled_back_savepoint_is_dropped(self):
+        with transaction.atomic():
+            User.objects.create(username='a')
+            with self.assertRaises(ValueError):
+                with transaction.atomic():
+                    User.objects.create(username='ghost')
+                    with transaction.atomic():
+                        User.objects.create(username='deeper')
+                    raise ValueError
+            with transaction.atomic():
+                group = Group.objects.create(name='g')
+                with transaction.atomic():
+                    User.objects.get(username='a').groups.add(group)
+
+        self.assertEqual(['a'], list(User.objects.values_list('username', flat=True)))
+        self.assertEqual([
+            'UNWIND $rows AS row MERGE (n:Person {id: row.id}) SET n += row',
+            'UNWIND $rows AS row MERGE (n:Group {id: row.id}) SET n += row',
+            'UNWIND $pairs AS pair MATCH (a:Person {id: pair.a}), (b:Group {id: pair.b}) MERGE (a)-[:GROUPS]->(b)',
+        ], [statement for statement, _ in self.sent])
+        self.assertEqual(['a'], [row['username'] for row in self.sent[0][1]['rows']])
+
+    def test_background_worker(self):
+        self.synchronizer.disconnect()
+        synchronizer = self.create(background=True, queue_size=2)
+        for name in 'abc':
+            User.objects.create(username=name)
+        synchronizer.join()
+        synchronizer.stop()
+        self.assertEqual(['a', 'b', 'c'], [parameters['rows'][0]['username'] for _, parameters in self.sent])
@@ -1,7 +1,52 @@
 # coding=utf-8
+import six
 
-class _Null(object):
-    pass
+from django_neo4j.expression import Expression
+
+
+class _Null(Expression):
+    __slots__ = ()
+
+    def _tokens(self, parameters):
+        return u'NULL',
+
+    def _key(self):
+        return ()
 
 
 NULL = _Null()
+
+
+class Identifier(Expression):
+    """
+    A variable or property reference (e.g. ``n.age``) rendered verbatim, never bound as a parameter.
+    """
+
+    __slots__ = ('__name',)
+
+    _INTERN_SIZE = 4096
+    __interned = {}
+
+    def __new__(cls, name):
+        name = six.text_type(name)
+        identifier = Identifier.__interned.get(name) if cls is Identifier else None
+        if identifier is None:
+            identifier = super(Identifier, cls).__new__(cls)
+            identifier.__name = name
+            if cls is Identifier and len(Identifier.__interned) < cls._INTERN_SIZE:
+                identifier = Identifier.__interned.setdefault(name, identifier)
+
+        return identifier
+
+    def __getnewargs__(self):
+        return self.__name,
+
+    @property
+    def name(self):
+        return self.__name
+
+    def _tokens(self, parameters):
+        return self.__name,
+
+    def _key(self):
+        return self.__name,
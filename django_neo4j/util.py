@@ -1,5 +1,9 @@
 # coding=utf-8
+import datetime
 import sys
+import uuid
+
+import six
 
 IS_PYTHON_3 = sys.version_info > (3,)
 
@@ -10,3 +14,27 @@ def to_long(o):
 
     # noinspection PyCompatibility
     return long(o)
+
+
+def to_value(value):
+    """
+    Converts a model field value to a JSON-encodable Neo4j property value.
+    """
+    if isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+        return value.isoformat()
+
+    if isinstance(value, uuid.UUID):
+        return six.text_type(value)
+
+    return value
+
+
+def model_row(instance, fields=None):
+    """
+    Property map of ``instance``'s concrete fields (optionally limited to ``fields``), without extra queries.
+    """
+    return dict(
+        (field.name, to_value(field.value_from_object(instance)))
+        for field in instance._meta.concrete_fields
+        if fields is None or field.name in fields
+    )
@@ -56,4 +56,8 @@ def run_tests(*test_args):
 
 
 if __name__ == u'__main__':
+    if sys.argv[1:2] == [u'--benchmark']:
+        from django_neo4j.benchmark import main
+        sys.exit(main(sys.argv[2:]))
+
     run_tests(*sys.argv[1:])